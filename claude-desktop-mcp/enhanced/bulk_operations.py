@@ -5,23 +5,97 @@ Safe bulk processing with preview, rollback, and progress tracking
 
 import logging
 import json
+import gzip
+import os
 import time
-from typing import Dict, List, Any, Optional, Callable
-from datetime import datetime
-from dataclasses import dataclass, asdict
+import threading
+from typing import Dict, List, Any, Optional, Callable, Iterator
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 import uuid
-import copy
 import asyncio
+import numpy as np
+import pandas as pd
+
+from shared.woocommerce_api import (
+    iter_items, BatchWriter, BatchResult, MAX_BATCH_SIZE, PageFetchError, store_key
+)
+
+try:
+    from .operation_store import OperationStore
+except ImportError:
+    from operation_store import OperationStore
 
 logger = logging.getLogger(__name__)
 
+# Batch collection each operation writes to (bulk_delete picks by changes["type"])
+OPERATION_ENDPOINTS = {
+    "update_products": "products",
+    "update_prices": "products",
+    "update_categories": "products/categories"
+}
+DELETE_ENDPOINTS = {
+    "product": "products",
+    "category": "products/categories"
+}
+
+# Batch deletes are permanent, so a deletion snapshot keeps what recreating needs
+RECREATE_FIELDS = {
+    "products": [
+        "name", "type", "status", "featured", "catalog_visibility", "description",
+        "short_description", "sku", "regular_price", "sale_price", "tax_status",
+        "tax_class", "manage_stock", "stock_quantity", "stock_status", "weight",
+        "dimensions", "categories", "tags", "images", "attributes", "meta_data"
+    ],
+    "products/categories": ["name", "slug", "parent", "description", "display", "image", "menu_order"]
+}
+# Variations of a deleted variable product go with it and are snapshotted too
+VARIATION_RECREATE_FIELDS = [
+    "description", "sku", "regular_price", "sale_price", "status", "tax_status",
+    "tax_class", "manage_stock", "stock_quantity", "stock_status", "weight",
+    "dimensions", "image", "attributes", "menu_order", "meta_data"
+]
+
+DEFAULT_BACKUP_DIR = os.getenv("WOOCOMMERCE_BULK_BACKUP_DIR", "./bulk_backups")
+
+DEFAULT_MAX_CONCURRENT_OPERATIONS = 2
+
+# Targets shown item by item in a preview; stats cover all of them
+PREVIEW_SAMPLE_SIZE = 5
+PREVIEW_FETCH_WORKERS = 4
+
+# Fields compared as numbers (WooCommerce returns prices as strings)
+PRICE_FIELDS = ("regular_price", "sale_price")
+
+# Percent price change buckets of the preview stats
+PRICE_DELTA_BINS = [-np.inf, -50, -20, -5, 0, 5, 20, 50, np.inf]
+PRICE_DELTA_LABELS = ["<= -50%", "-50% to -20%", "-20% to -5%", "-5% to 0%",
+                      "0% to 5%", "5% to 20%", "20% to 50%", "> 50%"]
+
+# Retention is applied on preview, at most this often
+PRUNE_INTERVAL = timedelta(hours=1)
+
+# Operations that stopped part way and can continue from their checkpoint
+RESUMABLE_STATUSES = ("cancelled", "failed")
+
+# Operations no worker is writing to any more ("failed" includes those
+# interrupted by a restart); anything else is still running or was never
+# started, or was already rolled back
+ROLLBACK_STATUSES = ("completed", "cancelled", "failed")
+
+
+class OperationCancelled(Exception):
+    """Raised inside a running operation once cancel_operation was called"""
+
 
 @dataclass
 class SafetyConfig:
     """Bulk operation safety configuration"""
     dry_run: bool = True
     batch_size: int = 50
-    delay_between_batches: float = 1.0
+    delay_between_batches: float = 0.0  # extra pause per batch; the store limiter already paces requests
+    max_concurrent_batches: int = 4
     backup_before: bool = True
     rollback_on_error: bool = True
     max_failures: int = 5
@@ -33,7 +107,7 @@ class SafetyConfig:
 class OperationResult:
     """Result of a bulk operation"""
     operation_id: str
-    status: str  # pending, running, completed, failed, rolled_back
+    status: str  # preview, queued, running, cancelling, cancelled, completed, failed, rolled_back
     started: str
     completed: Optional[str] = None
     total_items: int = 0
@@ -43,6 +117,9 @@ class OperationResult:
     errors: List[str] = None
     preview_data: Optional[Dict[str, Any]] = None
     backup_id: Optional[str] = None
+    phase: Optional[str] = None  # backup, writing or rollback while running
+    operation: Optional[str] = None
+    store: Optional[str] = None  # store_key of the API the operation was previewed against
     
     def __post_init__(self):
         if self.errors is None:
@@ -52,17 +129,60 @@ class OperationResult:
 class BulkOperationManager:
     """Manage safe bulk operations with preview and rollback capabilities"""
     
-    def __init__(self):
-        self.operations = {}  # Store operation results
-        self.backups = {}     # Store backup data for rollback
+    def __init__(self, backup_dir: str = DEFAULT_BACKUP_DIR,
+                 max_concurrent_operations: int = DEFAULT_MAX_CONCURRENT_OPERATIONS,
+                 store: OperationStore = None,
+                 api_resolver: Callable[[str], Any] = None):
+        """
+        Args:
+            backup_dir: Directory of backup snapshots and checkpoints
+            max_concurrent_operations: Background jobs running at once
+            store: Operation store, defaults to OperationStore()
+            api_resolver: Returns the API client of a store_key, so operations
+                          of an earlier run can be resumed or rolled back
+        """
+        self.backup_dir = backup_dir
+        self.store = store or OperationStore()  # Operations, payloads and backups on disk
         self.active_operations = set()
+        self.api_resolver = api_resolver
+        self._apis = {}  # store_key -> API client operations were previewed against
+        self._live = {}  # operation_id -> OperationResult of queued and running operations
+        self._last_prune = None
+        
+        # Background jobs (see submit_operation)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrent_operations), thread_name_prefix="bulk-operation"
+        )
+        self._jobs = {}           # operation_id -> Future of a submitted operation
+        self._cancel_events = {}  # operation_id -> set by cancel_operation
+        self._job_apis = {}       # Background-priority clients of submitted operations
+        self._progress = {}       # operation_id -> write phase timing for throughput/ETA
+        
+        self.store.mark_interrupted()
+        self._prune()
     
     def preview_changes(self, api, operation: str, targets: List[Any], 
                        changes: Dict[str, Any]) -> Dict[str, Any]:
-        """Preview bulk operation changes before execution"""
+        """
+        Preview bulk operation changes before execution
+        
+        Every target is read (100 per request, only the fields involved)
+        and old/new values are compared column-wise in a DataFrame, so the
+        stats and warnings cover the whole set rather than a sample.
+        changes_preview lists the first few changing items in detail.
+        """
         
         operation_id = str(uuid.uuid4())
         
+        if operation not in OPERATION_ENDPOINTS and operation != "bulk_delete":
+            return {"error": f"Unknown operation: {operation}"}
+        
+        try:
+            targets = self._target_ids(targets)
+        except (TypeError, ValueError):
+            return {"error": "Targets must be numeric ids"}
+        
         try:
             preview_result = {
                 "operation_id": operation_id,
@@ -71,25 +191,14 @@ class BulkOperationManager:
                 "estimated_time": self._estimate_operation_time(operation, len(targets)),
                 "changes_preview": [],
                 "potential_conflicts": [],
-                "warnings": []
+                "warnings": [],
+                "stats": {}
             }
             
-            # Sample preview for first few items
-            preview_count = min(5, len(targets))
-            
-            for i, target in enumerate(targets[:preview_count]):
-                if operation == "update_products":
-                    preview_item = self._preview_product_update(api, target, changes)
-                elif operation == "update_prices":
-                    preview_item = self._preview_price_update(api, target, changes)
-                elif operation == "update_categories":
-                    preview_item = self._preview_category_update(api, target, changes)
-                elif operation == "bulk_delete":
-                    preview_item = self._preview_deletion(api, target, changes)
-                else:
-                    preview_item = {"target": target, "error": "Unknown operation"}
-                
-                preview_result["changes_preview"].append(preview_item)
+            if operation == "bulk_delete":
+                self._preview_deletion(api, targets, changes, preview_result)
+            else:
+                self._preview_updates(api, operation, targets, changes, preview_result)
             
             # Store preview for potential execution
             operation_data = OperationResult(
@@ -101,10 +210,15 @@ class BulkOperationManager:
                     "operation": operation,
                     "targets": targets,
                     "changes": changes
-                }
+                },
+                operation=operation,
+                store=store_key(api)
             )
             
-            self.operations[operation_id] = operation_data
+            self._apis[operation_data.store] = api
+            self._save(operation_data)
+            self.store.save_payload(operation_id, operation_data.preview_data)
+            self._prune()
             
             return preview_result
         
@@ -112,63 +226,169 @@ class BulkOperationManager:
             logger.error(f"Preview generation failed: {e}")
             return {"error": str(e)}
     
-    def execute_operation(self, operation_id: str, safety_config: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute a previewed bulk operation"""
-        
-        if operation_id not in self.operations:
-            return {"error": "Operation not found"}
+    def execute_operation(self, operation_id: str, safety_config: Dict[str, Any] = None,
+                          resume: bool = False) -> Dict[str, Any]:
+        """Execute a previewed bulk operation and wait for the result"""
         
-        operation_data = self.operations[operation_id]
+        # Parse safety config
+        config = SafetyConfig(**(safety_config or {}))
         
-        if operation_data.status != "preview":
-            return {"error": f"Operation is not in preview state: {operation_data.status}"}
+        error = self._claim(operation_id, resume)
+        if error:
+            return error
         
-        if operation_id in self.active_operations:
-            return {"error": "Operation is already running"}
+        return self._run_operation(operation_id, config, resume)
+    
+    def submit_operation(self, operation_id: str, safety_config: Dict[str, Any] = None,
+                         resume: bool = False) -> Dict[str, Any]:
+        """
+        Run a previewed bulk operation as a background job
+        
+        Returns at once; poll get_operation_status for progress and stop
+        the job with cancel_operation. The job takes background limiter
+        slots when the client supports them, so interactive calls to the
+        store keep priority.
+        
+        Args:
+            operation_id: Previewed operation
+            safety_config: SafetyConfig fields
+            resume: Continue a cancelled or failed operation from its
+                    checkpoint instead of starting a previewed one
+        """
         
-        # Parse safety config
         config = SafetyConfig(**(safety_config or {}))
         
-        # Start operation
-        self.active_operations.add(operation_id)
-        operation_data.status = "running"
-        operation_data.started = datetime.now().isoformat()
+        error = self._claim(operation_id, resume)
+        if error:
+            return error
+        
+        operation_data = self._live[operation_id]
+        api = self._store_api(operation_data.store)
+        if api is not None and hasattr(api, "as_background"):
+            self._job_apis[operation_id] = api.as_background()
+        
+        operation_data.status = "queued"
+        self._save(operation_data)
+        # Registered under the lock: a job that ends at once releases itself
+        # under it too, so it cannot be forgotten before its future is recorded
+        with self._lock:
+            self._jobs[operation_id] = self._executor.submit(
+                self._run_operation, operation_id, config, resume
+            )
+        
+        return {
+            "operation_id": operation_id,
+            "status": "queued",
+            "total_items": operation_data.total_items
+        }
+    
+    @staticmethod
+    def _target_ids(targets: List[Any]) -> List[int]:
+        """
+        Target ids as ints, the form the store returns them in
+        
+        Tool callers may pass "123"; lookups by response id, checkpoints
+        and the preview merge all compare against ints.
+        """
+        return [int(target) for target in targets]
+    
+    def _claim(self, operation_id: str, resume: bool) -> Optional[Dict[str, Any]]:
+        """Check an operation can start and mark it active; an error dict when not"""
+        
+        operation_data = self._load(operation_id, with_payload=True)
+        if operation_data is None:
+            return {"error": "Operation not found"}
+        if operation_data.preview_data:
+            preview = operation_data.preview_data
+            preview["targets"] = self._target_ids(preview["targets"])
+        
+        with self._lock:
+            if operation_id in self.active_operations:
+                return {"error": "Operation is already running"}
+            
+            if resume:
+                if operation_data.status not in RESUMABLE_STATUSES:
+                    return {"error": f"Only cancelled or failed operations can be resumed: {operation_data.status}"}
+            elif operation_data.status != "preview":
+                return {"error": f"Operation is not in preview state: {operation_data.status}"}
+            
+            self.active_operations.add(operation_id)
+            self._cancel_events[operation_id] = threading.Event()
+            self._live[operation_id] = operation_data
+        
+        return None
+    
+    def _run_operation(self, operation_id: str, config: SafetyConfig, resume: bool) -> Dict[str, Any]:
+        """Backup, write and (on error) roll back a claimed operation"""
+        
+        operation_data = self._live[operation_id]
         
         try:
-            # Create backup if required
-            if config.backup_before:
-                backup_id = self._create_backup(operation_data.preview_data)
+            if self._cancel_requested(operation_id):
+                raise OperationCancelled()
+            
+            # Start operation
+            operation_data.status = "running"
+            operation_data.started = datetime.now().isoformat()
+            self._save(operation_data)
+            
+            # Create backup if required - a resumed operation keeps its
+            # original snapshot, the store now holds partly changed values
+            if config.backup_before and not (resume and operation_data.backup_id):
+                operation_data.phase = "backup"
+                backup_id = self._create_backup(operation_data)
                 operation_data.backup_id = backup_id
+                self._save(operation_data)
             
             # Execute the operation
+            operation_data.phase = "writing"
             if config.dry_run:
                 result = self._execute_dry_run(operation_data, config)
             else:
-                result = self._execute_actual_operation(operation_data, config)
+                result = self._execute_actual_operation(operation_data, config, resume)
             
-            operation_data.status = "completed"
-            operation_data.completed = datetime.now().isoformat()
             operation_data.successful_items = result.get("successful", 0)
             operation_data.failed_items = result.get("failed", 0)
             operation_data.errors = result.get("errors", [])
             
-            self.active_operations.remove(operation_id)
+            if result.get("cancelled"):
+                raise OperationCancelled()
+            
+            if result.get("aborted"):
+                raise RuntimeError(
+                    f"Stopped after {operation_data.failed_items} failed items "
+                    f"(max_failures {config.max_failures})"
+                )
+            
+            operation_data.status = "completed"
+            operation_data.completed = datetime.now().isoformat()
             
             return {
                 "operation_id": operation_id,
                 "status": "completed",
-                "results": asdict(operation_data)
+                "results": self._summary(operation_data)
+            }
+        
+        except OperationCancelled:
+            logger.info(f"Operation cancelled: {operation_id}")
+            operation_data.status = "cancelled"
+            operation_data.completed = datetime.now().isoformat()
+            
+            return {
+                "operation_id": operation_id,
+                "status": "cancelled",
+                "results": self._summary(operation_data)
             }
         
         except Exception as e:
             logger.error(f"Operation execution failed: {e}")
             operation_data.status = "failed"
             operation_data.errors.append(str(e))
-            self.active_operations.discard(operation_id)
             
             # Rollback if configured
             if config.rollback_on_error and operation_data.backup_id:
-                rollback_result = self.rollback_operation(operation_id)
+                operation_data.phase = "rollback"
+                rollback_result = self._rollback(operation_data)
                 return {
                     "operation_id": operation_id,
                     "status": "failed_and_rolled_back",
@@ -181,27 +401,138 @@ class BulkOperationManager:
                 "status": "failed",
                 "error": str(e)
             }
+        
+        finally:
+            operation_data.phase = None
+            timing = self._progress.get(operation_id)
+            if timing is not None and timing["finished"] is None:
+                timing["finished"] = time.monotonic()
+            self._save(operation_data, progress=self._progress_stats(operation_data))
+            with self._lock:
+                self._release(operation_id)
+    
+    def _release(self, operation_id: str):
+        """Forget a finished operation's in-memory state (caller holds _lock)"""
+        self.active_operations.discard(operation_id)
+        self._cancel_events.pop(operation_id, None)
+        self._job_apis.pop(operation_id, None)
+        self._jobs.pop(operation_id, None)
+        self._live.pop(operation_id, None)
+        self._progress.pop(operation_id, None)
+    
+    def _cancel_requested(self, operation_id: str) -> bool:
+        event = self._cancel_events.get(operation_id)
+        return event is not None and event.is_set()
+    
+    def _api_for(self, operation_data: OperationResult):
+        """Client an operation's own requests go through (background priority for jobs)"""
+        api = self._job_apis.get(operation_data.operation_id)
+        if api is None:
+            api = self._store_api(operation_data.store)
+        return api
+    
+    def _store_api(self, store: Optional[str]):
+        api = self._apis.get(store)
+        if api is None and store and self.api_resolver is not None:
+            api = self.api_resolver(store)
+            if api is not None:
+                self._apis[store] = api
+        return api
+    
+    # Persistence
+    
+    @staticmethod
+    def _summary(operation_data: OperationResult) -> Dict[str, Any]:
+        """Operation fields without the preview payload"""
+        return {
+            field.name: getattr(operation_data, field.name)
+            for field in fields(OperationResult) if field.name != "preview_data"
+        }
+    
+    @staticmethod
+    def _from_row(row: Dict[str, Any]) -> OperationResult:
+        names = {field.name for field in fields(OperationResult)}
+        return OperationResult(**{key: value for key, value in row.items() if key in names})
+    
+    def _save(self, operation_data: OperationResult, progress: Dict[str, Any] = None):
+        self.store.save(self._summary(operation_data), progress)
+    
+    def _load(self, operation_id: str, with_payload: bool = False) -> Optional[OperationResult]:
+        """Live operation, else the stored one (preview payload only when asked for)"""
+        operation_data = self._live.get(operation_id)
+        if operation_data is not None:
+            return operation_data
+        
+        row = self.store.get(operation_id)
+        if row is None:
+            return None
+        operation_data = self._from_row(row)
+        if with_payload:
+            operation_data.preview_data = self.store.load_payload(operation_id)
+        return operation_data
+    
+    def _prune(self):
+        """Apply the store's retention policy, at most once per PRUNE_INTERVAL"""
+        now = datetime.now()
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        
+        pruned = self.store.prune()
+        paths = pruned["backup_paths"] + [
+            self._checkpoint_path(operation_id) for operation_id in pruned["operations"]
+        ]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
     
     def rollback_operation(self, operation_id: str) -> Dict[str, Any]:
-        """Rollback a completed or failed operation"""
+        """Rollback a completed, cancelled, failed or interrupted operation"""
         
-        if operation_id not in self.operations:
+        operation_data = self._load(operation_id)
+        if operation_data is None:
             return {"error": "Operation not found"}
         
-        operation_data = self.operations[operation_id]
+        with self._lock:
+            if operation_id in self.active_operations:
+                return {"error": "Operation is still running - cancel it and wait for it to stop first"}
+            if operation_data.status not in ROLLBACK_STATUSES:
+                return {"error": f"Operation cannot be rolled back: {operation_data.status}"}
+            
+            # Keeps a resume or second rollback out while restoring
+            self.active_operations.add(operation_id)
+        
+        try:
+            return self._rollback(operation_data)
+        finally:
+            with self._lock:
+                self.active_operations.discard(operation_id)
+    
+    def _rollback(self, operation_data: OperationResult) -> Dict[str, Any]:
+        """Restore an operation's backup; the caller makes sure nothing else writes it"""
         
+        operation_id = operation_data.operation_id
         if not operation_data.backup_id:
             return {"error": "No backup available for rollback"}
         
-        if operation_data.backup_id not in self.backups:
+        backup_data = self.store.get_backup(operation_data.backup_id)
+        if backup_data is None:
             return {"error": "Backup data not found"}
         
         try:
-            backup_data = self.backups[operation_data.backup_id]
-            rollback_result = self._restore_from_backup(backup_data)
+            api = self._api_for(operation_data)
+            if api is None:
+                return {"error": "No store connection for this operation"}
+            
+            # Only what the operation wrote - a stopped deletion left the rest in place
+            written = self._load_checkpoint(operation_id)
+            rollback_result = self._restore_from_backup(api, backup_data, written)
             
             operation_data.status = "rolled_back"
             operation_data.completed = datetime.now().isoformat()
+            self._save(operation_data)
             
             return {
                 "operation_id": operation_id,
@@ -214,51 +545,122 @@ class BulkOperationManager:
             logger.error(f"Rollback failed: {e}")
             return {"error": str(e)}
     
-    def get_operation_status(self, operation_id: str) -> Dict[str, Any]:
-        """Get the status of a bulk operation"""
-        
-        if operation_id not in self.operations:
-            return {"error": "Operation not found"}
-        
-        return asdict(self.operations[operation_id])
+    def get_operation_status(self, operation_id: str, include_payload: bool = False) -> Dict[str, Any]:
+        """
+        Get the status of a bulk operation, with throughput and ETA once writing started
+        
+        The preview payload (target ids and changes) is only loaded with
+        include_payload.
+        """
+        
+        operation_data = self._live.get(operation_id)
+        if operation_data is not None:
+            status = self._summary(operation_data)
+            status["error_count"] = len(operation_data.errors)
+            status["progress"] = self._progress_stats(operation_data)
+        else:
+            status = self.store.get(operation_id)
+            if status is None:
+                return {"error": "Operation not found"}
+            if status["progress"] is None:
+                status["progress"] = self._progress_stats(self._from_row(status))
+        
+        if include_payload:
+            status["preview_data"] = (
+                operation_data.preview_data if operation_data is not None
+                else self.store.load_payload(operation_id)
+            )
+        return status
     
-    def list_operations(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """List recent bulk operations"""
-        
-        operations = list(self.operations.values())
+    def _progress_stats(self, operation_data: OperationResult) -> Dict[str, Any]:
+        total = operation_data.total_items
+        processed = operation_data.processed_items
+        stats = {
+            "percent": round(100 * processed / total, 1) if total else 100.0,
+            "elapsed_seconds": None,
+            "items_per_second": None,
+            "eta_seconds": None
+        }
         
-        # Sort by start time (most recent first)
-        operations.sort(key=lambda x: x.started, reverse=True)
+        timing = self._progress.get(operation_data.operation_id)
+        if timing is None:
+            return stats
+        
+        elapsed = (timing["finished"] or time.monotonic()) - timing["started"]
+        rate = (processed - timing["baseline"]) / elapsed if elapsed > 0 else 0.0
+        stats["elapsed_seconds"] = round(elapsed, 1)
+        stats["items_per_second"] = round(rate, 1)
+        if timing["finished"] is None and rate > 0:
+            stats["eta_seconds"] = round((total - processed) / rate)
+        return stats
+    
+    def _start_progress(self, operation_data: OperationResult):
+        """Start timing the write phase from the current processed_items"""
+        self._progress[operation_data.operation_id] = {
+            "started": time.monotonic(),
+            "baseline": operation_data.processed_items,
+            "finished": None
+        }
+    
+    def list_operations(self, limit: int = 50, offset: int = 0, status: str = None) -> Dict[str, Any]:
+        """List bulk operations, most recent first, a page at a time"""
         
-        return [asdict(op) for op in operations[:limit]]
+        return self.store.list(limit=limit, offset=offset, status=status)
     
     def cancel_operation(self, operation_id: str) -> Dict[str, Any]:
-        """Cancel a running operation"""
-        
-        if operation_id not in self.operations:
-            return {"error": "Operation not found"}
-        
-        if operation_id not in self.active_operations:
-            return {"error": "Operation is not running"}
-        
-        # Mark operation as cancelled
-        operation_data = self.operations[operation_id]
-        operation_data.status = "cancelled"
-        operation_data.completed = datetime.now().isoformat()
-        
-        self.active_operations.remove(operation_id)
+        """
+        Cancel a running operation
+        
+        A queued job never starts. A running one stops after the batches
+        already sent; items written so far stay written and are kept in
+        the checkpoint, so the operation can be resumed or rolled back.
+        """
+        
+        with self._lock:
+            operation_data = self._live.get(operation_id)
+            if operation_data is None:
+                if self.store.get(operation_id) is None:
+                    return {"error": "Operation not found"}
+                return {"error": "Operation is not running"}
+            
+            job = self._jobs.get(operation_id)
+            if job is not None and job.cancel():
+                operation_data.status = "cancelled"
+                operation_data.completed = datetime.now().isoformat()
+                self._save(operation_data)
+                self._release(operation_id)
+                return {
+                    "operation_id": operation_id,
+                    "status": "cancelled"
+                }
+            
+            self._cancel_events[operation_id].set()
+            operation_data.status = "cancelling"
         
         return {
             "operation_id": operation_id,
-            "status": "cancelled"
+            "status": "cancelling",
+            "processed_items": operation_data.processed_items
         }
     
+    def shutdown(self):
+        """Cancel queued jobs and ask running ones to stop"""
+        
+        with self._lock:
+            for event in self._cancel_events.values():
+                event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
     def bulk_product_operation(self, api, operation: str, filters: Dict[str, Any], 
                               changes: Dict[str, Any], dry_run: bool = True) -> Dict[str, Any]:
         """Convenient method for bulk product operations"""
         
-        # Get products matching filters
-        targets = self._get_products_by_filters(api, filters)
+        # Get products matching filters - a partial listing would silently
+        # leave some of them out of the operation
+        try:
+            targets = self._get_products_by_filters(api, filters)
+        except PageFetchError as e:
+            return {"error": f"Could not list products matching filters: {e}"}
         
         if not targets:
             return {"error": "No products found matching filters"}
@@ -270,9 +672,9 @@ class BulkOperationManager:
             return preview_result
         
         if not dry_run:
-            # Execute immediately if not dry run
+            # Start right away as a background job if not dry run
             safety_config = {"dry_run": False, "confirmation_required": False}
-            return self.execute_operation(preview_result["operation_id"], safety_config)
+            return self.submit_operation(preview_result["operation_id"], safety_config)
         
         return preview_result
     
@@ -300,121 +702,313 @@ class BulkOperationManager:
             minutes = (total_seconds % 3600) // 60
             return f"{hours} hours {minutes} minutes"
     
-    def _preview_product_update(self, api, product_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
-        """Preview product update changes"""
-        
-        try:
-            # Get current product
-            response = api.get(f"products/{product_id}")
-            if response.status_code != 200:
-                return {"product_id": product_id, "error": "Product not found"}
-            
-            current = response.json()
-            preview = {
-                "product_id": product_id,
-                "name": current.get("name"),
-                "sku": current.get("sku"),
-                "changes": {},
-                "warnings": []
-            }
-            
-            # Show what will change
-            for field, new_value in changes.items():
-                old_value = current.get(field)
-                if old_value != new_value:
-                    preview["changes"][field] = {
-                        "from": old_value,
-                        "to": new_value
-                    }
-            
-            # Check for potential issues
-            if "regular_price" in changes:
-                old_price = float(current.get("regular_price", 0))
-                new_price = float(changes["regular_price"])
-                if new_price < old_price * 0.5:  # More than 50% decrease
-                    preview["warnings"].append("Large price decrease detected")
-            
-            return preview
-        
-        except Exception as e:
-            return {"product_id": product_id, "error": str(e)}
+    def _current_frame(self, api, endpoint: str, targets: List[Any],
+                       fields: List[str]) -> pd.DataFrame:
+        """
+        One row per target with its current fields
+        
+        found is False for targets the store did not return.
+        """
+        
+        current = self._fetch_current(api, endpoint, targets, fields)
+        frame = pd.DataFrame({"id": pd.Series(targets, dtype="int64")})
+        found = pd.DataFrame.from_records(list(current.values()), columns=fields)
+        found["id"] = found["id"].astype("int64")
+        
+        frame = frame.merge(found, on="id", how="left", indicator=True)
+        frame["found"] = frame["_merge"] == "both"
+        return frame.drop(columns="_merge")
     
-    def _preview_price_update(self, api, product_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
-        """Preview price update changes"""
+    def _preview_updates(self, api, operation: str, targets: List[Any],
+                         changes: Dict[str, Any], preview_result: Dict[str, Any]):
+        """Diff an update operation over all targets into preview_result"""
+        
+        endpoint = OPERATION_ENDPOINTS[operation]
+        is_product = endpoint == "products"
+        
+        new_values = {key: value for key, value in changes.items() if key != "percentage_increase"}
+        fields = list(new_values)
+        if "percentage_increase" in changes and "regular_price" not in fields:
+            fields.append("regular_price")
+        
+        columns = ["id", "name"] + (["sku"] if is_product else [])
+        frame = self._current_frame(api, endpoint, targets, columns + [f for f in fields if f not in columns])
+        found = frame["found"]
+        
+        no_warning = pd.Series(False, index=frame.index)
+        changed = {}
+        warnings = {}
+        price_stats = {}
+        for field in fields:
+            old = frame[field]
+            if field in PRICE_FIELDS:
+                old_price = pd.to_numeric(old, errors="coerce")
+                if field == "regular_price" and "percentage_increase" in changes:
+                    new_price = (old_price * (1 + float(changes["percentage_increase"]) / 100)).round(2)
+                else:
+                    new_price = pd.Series(self._price_value(field, new_values[field]),
+                                          index=frame.index, dtype="float64")
+                frame[f"{field}_new"] = new_price
+                if self._clears_price(changes, field):
+                    field_changed = found & (old.fillna("") != "")
+                else:
+                    # Items without a price keep none under a percentage change
+                    field_changed = found & new_price.notna() & (old_price.isna() | (old_price != new_price))
+                
+                delta = new_price - old_price
+                percent = delta / old_price.where(old_price > 0) * 100
+                valid = found & delta.notna()
+                price_stats[field] = self._delta_stats(delta[valid], percent[valid & percent.notna()])
+                
+                for name, mask in (
+                    ("Large price decrease detected", valid & (new_price < old_price * 0.5)),
+                    ("Price set to zero or below", found & (new_price <= 0))
+                ):
+                    warnings[name] = warnings.get(name, no_warning) | mask
+            else:
+                value = new_values[field]
+                frame[f"{field}_new"] = [value] * len(frame)
+                if isinstance(value, (dict, list)):
+                    differs = old.map(lambda current: current != value)
+                else:
+                    differs = old != value
+                field_changed = found & differs.astype(bool)
+            changed[field] = field_changed
+        
+        any_changed = pd.concat(changed, axis=1).any(axis=1) if changed else no_warning
+        
+        missing = frame.loc[~found, "id"].tolist()
+        if missing:
+            preview_result["potential_conflicts"].append({
+                "issue": f"{len(missing)} targets not found",
+                "ids": missing[:20]
+            })
+        
+        warning_counts = {name: int(mask.sum()) for name, mask in warnings.items()}
+        preview_result["warnings"] = [
+            f"{name}: {count} items" for name, count in warning_counts.items() if count
+        ]
+        preview_result["stats"] = {
+            "found": int(found.sum()),
+            "not_found": len(missing),
+            "changed": int(any_changed.sum()),
+            "unchanged": int((found & ~any_changed).sum()),
+            "changed_by_field": {field: int(mask.sum()) for field, mask in changed.items()},
+            "price_changes": price_stats,
+            "warnings": warning_counts
+        }
         
-        # Similar to product update but focused on pricing
-        return self._preview_product_update(api, product_id, changes)
+        id_key = "product_id" if is_product else "category_id"
+        for index in frame.index[any_changed][:PREVIEW_SAMPLE_SIZE]:
+            row = frame.loc[index]
+            item = {id_key: row["id"], "name": row["name"]}
+            if is_product:
+                item["sku"] = row["sku"]
+            item["changes"] = {}
+            for field, mask in changed.items():
+                if mask[index]:
+                    new_value = row[f"{field}_new"]
+                    if self._clears_price(changes, field):
+                        new_value = "price cleared"
+                    elif field in PRICE_FIELDS:
+                        new_value = str(new_value)
+                    item["changes"][field] = {"from": row[field], "to": new_value}
+            item["warnings"] = [name for name, mask in warnings.items() if mask[index]]
+            preview_result["changes_preview"].append(self._plain(item))
     
-    def _preview_category_update(self, api, category_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
-        """Preview category update changes"""
+    @staticmethod
+    def _clears_price(changes: Dict[str, Any], field: str) -> bool:
+        """True when a change sets a price field to "" (WooCommerce's way to clear it)"""
+        return field in PRICE_FIELDS and field in changes and changes[field] in ("", None)
+
+    @staticmethod
+    def _price_value(field: str, value: Any) -> float:
+        """A requested price as a float; NaN when it clears the price"""
+
+        if value in ("", None):
+            return float("nan")
+        price = pd.to_numeric(pd.Series([value]), errors="coerce").iloc[0]
+        if pd.isna(price):
+            raise ValueError(f"Invalid {field}: {value!r} is not a number")
+        return float(price)
+
+    @staticmethod
+    def _delta_stats(delta: pd.Series, percent: pd.Series) -> Dict[str, Any]:
+        """Distribution of absolute and percent price changes"""
         
-        try:
-            response = api.get(f"products/categories/{category_id}")
-            if response.status_code != 200:
-                return {"category_id": category_id, "error": "Category not found"}
-            
-            current = response.json()
-            preview = {
-                "category_id": category_id,
-                "name": current.get("name"),
-                "changes": {}
-            }
-            
-            for field, new_value in changes.items():
-                old_value = current.get(field)
-                if old_value != new_value:
-                    preview["changes"][field] = {
-                        "from": old_value,
-                        "to": new_value
-                    }
-            
-            return preview
+        if delta.empty:
+            return {"count": 0}
         
-        except Exception as e:
-            return {"category_id": category_id, "error": str(e)}
+        buckets = pd.cut(percent, bins=PRICE_DELTA_BINS, labels=PRICE_DELTA_LABELS, right=True)
+        return {
+            "count": int(delta.size),
+            "increased": int((delta > 0).sum()),
+            "decreased": int((delta < 0).sum()),
+            "delta": {
+                "min": round(float(delta.min()), 2),
+                "max": round(float(delta.max()), 2),
+                "mean": round(float(delta.mean()), 2),
+                "median": round(float(delta.median()), 2),
+                "total": round(float(delta.sum()), 2)
+            },
+            "percent": {
+                "min": round(float(percent.min()), 1),
+                "max": round(float(percent.max()), 1),
+                "mean": round(float(percent.mean()), 1),
+                "median": round(float(percent.median()), 1)
+            } if not percent.empty else None,
+            "percent_buckets": {
+                label: int(count) for label, count in buckets.value_counts(sort=False).items()
+            }
+        }
     
-    def _preview_deletion(self, api, item_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
-        """Preview deletion operation"""
+    def _preview_deletion(self, api, targets: List[Any], changes: Dict[str, Any],
+                          preview_result: Dict[str, Any]):
+        """Summarize a deletion over all targets into preview_result"""
         
         item_type = changes.get("type", "product")
+        if item_type not in DELETE_ENDPOINTS:
+            raise ValueError(f"Unknown item type: {item_type}")
         
-        try:
-            if item_type == "product":
-                response = api.get(f"products/{item_id}")
-            elif item_type == "category":
-                response = api.get(f"products/categories/{item_id}")
-            else:
-                return {"item_id": item_id, "error": "Unknown item type"}
-            
-            if response.status_code != 200:
-                return {"item_id": item_id, "error": f"{item_type} not found"}
-            
-            current = response.json()
-            return {
-                "item_id": item_id,
+        endpoint = DELETE_ENDPOINTS[item_type]
+        columns = ["id", "name", "status"] if item_type == "product" else ["id", "name", "count"]
+        frame = self._current_frame(api, endpoint, targets, columns)
+        found = frame["found"]
+        
+        warnings = {"Item will be permanently deleted": found}
+        if item_type == "product":
+            warnings["Published product will be deleted"] = found & (frame["status"] == "publish")
+        else:
+            counts = pd.to_numeric(frame["count"], errors="coerce").fillna(0)
+            warnings["Category still has products"] = found & (counts > 0)
+        
+        missing = frame.loc[~found, "id"].tolist()
+        if missing:
+            preview_result["potential_conflicts"].append({
+                "issue": f"{len(missing)} targets not found",
+                "ids": missing[:20]
+            })
+        
+        warning_counts = {name: int(mask.sum()) for name, mask in warnings.items()}
+        preview_result["warnings"] = [
+            f"{name}: {count} items" for name, count in warning_counts.items() if count
+        ]
+        preview_result["stats"] = {
+            "found": int(found.sum()),
+            "not_found": len(missing),
+            "changed": int(found.sum()),
+            "warnings": warning_counts
+        }
+        
+        for index in frame.index[found][:PREVIEW_SAMPLE_SIZE]:
+            row = frame.loc[index]
+            preview_result["changes_preview"].append(self._plain({
+                "item_id": row["id"],
                 "type": item_type,
-                "name": current.get("name"),
+                "name": row["name"],
                 "action": "DELETE",
                 "warning": "This item will be permanently deleted"
-            }
-        
-        except Exception as e:
-            return {"item_id": item_id, "error": str(e)}
+            }))
+    
+    @staticmethod
+    def _plain(value: Any) -> Any:
+        """numpy scalars and NaN of a DataFrame row as JSON-friendly values"""
+        if isinstance(value, dict):
+            return {key: BulkOperationManager._plain(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [BulkOperationManager._plain(item) for item in value]
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and np.isnan(value):
+            return None
+        return value
     
-    def _create_backup(self, operation_data: Dict[str, Any]) -> str:
-        """Create backup before operation"""
+    @staticmethod
+    def _increase_price(price: Any, percentage: Any) -> str:
+        """Price raised by a percentage (negative lowers it), as WooCommerce's price string"""
+        return str(round(float(price) * (1 + float(percentage) / 100), 2))
+    
+    def _create_backup(self, operation_data: OperationResult) -> str:
+        """
+        Snapshot the pre-change state of the fields an operation touches
+        
+        Targets are read 100 per request with include= and _fields=, and
+        each record is written as one line of a gzipped JSON lines file in
+        backup_dir, so cost follows the number of targets and changed
+        fields rather than whole objects. A deletion keeps the fields
+        needed to recreate the item, and a deleted variable product keeps
+        its variations, which the store deletes along with it; those are
+        listed for PREVIEW_FETCH_WORKERS products at a time.
+        """
         
         backup_id = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
         
-        # Store operation data for potential rollback
-        self.backups[backup_id] = {
+        operation_id = operation_data.operation_id
+        api = self._api_for(operation_data)
+        if api is None:
+            raise ValueError("No store connection for this operation")
+        
+        preview = operation_data.preview_data
+        operation = preview["operation"]
+        targets = preview["targets"]
+        changes = preview["changes"]
+        
+        if operation == "bulk_delete":
+            endpoint = DELETE_ENDPOINTS.get(changes.get("type", "product"))
+            if endpoint is None:
+                raise ValueError(f"Unknown item type: {changes.get('type')}")
+            fields = RECREATE_FIELDS[endpoint]
+        else:
+            endpoint = OPERATION_ENDPOINTS[operation]
+            fields = [key for key in changes if key != "percentage_increase"]
+            if "percentage_increase" in changes and "regular_price" not in fields:
+                fields.append("regular_price")
+        
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = os.path.join(self.backup_dir, f"{backup_id}.jsonl.gz")
+        
+        with_variations = operation == "bulk_delete" and endpoint == "products"
+        count = variations = 0
+        
+        def fetch_variations(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return list(iter_items(
+                api, f"products/{item['id']}/variations", fields=["id"] + VARIATION_RECREATE_FIELDS
+            ))
+        
+        try:
+            with gzip.open(path, "wt", encoding="utf-8") as backup_file, \
+                    ThreadPoolExecutor(max_workers=PREVIEW_FETCH_WORKERS) as pool:
+                for i in range(0, len(targets), MAX_BATCH_SIZE):
+                    if self._cancel_requested(operation_id):
+                        raise OperationCancelled()
+                    include = ",".join(str(target) for target in targets[i:i + MAX_BATCH_SIZE])
+                    items = list(iter_items(api, endpoint, {"include": include}, fields=["id"] + fields))
+                    if with_variations:
+                        # Variations of the chunk's variable products, a few products at a time
+                        variable = [item for item in items if item.get("type") == "variable"]
+                        for item, saved in zip(variable, pool.map(fetch_variations, variable)):
+                            item["variations"] = saved
+                            variations += len(saved)
+                    for item in items:
+                        backup_file.write(json.dumps(item, separators=(",", ":")) + "\n")
+                        count += 1
+        except OperationCancelled:
+            os.remove(path)
+            raise
+        
+        self.store.save_backup({
             "backup_id": backup_id,
             "created": datetime.now().isoformat(),
-            "operation_data": copy.deepcopy(operation_data),
-            "original_state": {}  # Would store actual data before changes
-        }
-        
-        logger.info(f"Backup created: {backup_id}")
+            "operation_id": operation_id,
+            "operation": operation,
+            "endpoint": endpoint,
+            "fields": fields,
+            "items": count,
+            "variations": variations,
+            "path": path
+        })
+        
+        logger.info(f"Backup created: {backup_id} ({count} {endpoint}, {variations} variations)")
         return backup_id
     
     def _execute_dry_run(self, operation_data: OperationResult, config: SafetyConfig) -> Dict[str, Any]:
@@ -425,14 +1019,17 @@ class BulkOperationManager:
         # Simulate the operation without making actual changes
         preview = operation_data.preview_data
         targets = preview["targets"]
-        changes = preview["changes"]
         
         successful = 0
         failed = 0
         errors = []
         
+        self._start_progress(operation_data)
+        
         # Process in batches
         for i in range(0, len(targets), config.batch_size):
+            if self._cancel_requested(operation_data.operation_id):
+                break
             batch = targets[i:i + config.batch_size]
             
             # Simulate processing each item in batch
@@ -445,63 +1042,287 @@ class BulkOperationManager:
                     errors.append(f"Invalid target: {target}")
             
             operation_data.processed_items += len(batch)
-            
-            # Add delay between batches
-            if i + config.batch_size < len(targets):
-                time.sleep(config.delay_between_batches)
         
         return {
             "successful": successful,
             "failed": failed,
             "errors": errors,
+            "cancelled": self._cancel_requested(operation_data.operation_id),
             "mode": "dry_run"
         }
     
-    def _execute_actual_operation(self, operation_data: OperationResult, config: SafetyConfig) -> Dict[str, Any]:
-        """Execute the actual operation with real API calls"""
-        
-        logger.info(f"Executing actual operation: {operation_data.operation_id}")
+    def _execute_actual_operation(self, operation_data: OperationResult, config: SafetyConfig,
+                                  resume: bool = False) -> Dict[str, Any]:
+        """
+        Execute the actual operation with real API calls
+        
+        Changes go through the collection's batch endpoint in batch_size
+        chunks, max_concurrent_batches at a time. processed_items and the
+        success/failure counters are updated as each chunk completes, and
+        no further chunks are sent once more than max_failures items failed
+        or the operation was cancelled. Ids written successfully are
+        appended to the operation's checkpoint after every chunk; a resumed
+        operation skips them. A percentage price change saves the prices it
+        computes with the operation, so a resume writes the same ones.
+        """
+        
+        operation_id = operation_data.operation_id
+        logger.info(f"Executing actual operation: {operation_id}")
+        
+        api = self._api_for(operation_data)
+        if api is None:
+            raise ValueError("No store connection for this operation")
         
         preview = operation_data.preview_data
         operation = preview["operation"]
         targets = preview["targets"]
         changes = preview["changes"]
         
-        successful = 0
-        failed = 0
-        errors = []
+        if operation == "update_prices" and "percentage_increase" in changes and "prices" not in preview:
+            # Saved before anything is written: a resume sends these same
+            # prices instead of raising prices it already raised again
+            preview["prices"] = self._increased_prices(
+                api, OPERATION_ENDPOINTS[operation], targets, changes["percentage_increase"]
+            )
+            self.store.save_payload(operation_id, preview)
+        
+        done = self._load_checkpoint(operation_id) if resume else set()
+        if done:
+            targets = [target for target in targets if target not in done]
+        
+        endpoint, writes, errors = self._plan_writes(operation, targets, changes, preview.get("prices"))
+        
+        operation_data.processed_items = len(done) + len(errors)
+        operation_data.successful_items = len(done)
+        operation_data.failed_items = len(errors)
+        self._start_progress(operation_data)
         
-        # This would need the actual API client
-        # For now, this is a placeholder implementation
+        os.makedirs(self.backup_dir, exist_ok=True)
+        checkpoint = open(self._checkpoint_path(operation_id), "a", encoding="utf-8")
+        
+        def on_chunk(chunk: BatchResult) -> bool:
+            operation_data.processed_items += chunk.succeeded + chunk.failed
+            operation_data.successful_items += chunk.succeeded
+            operation_data.failed_items += chunk.failed
+            for error in chunk.errors:
+                item_id = self._item_id(writes[error["action"]][error["index"]])
+                errors.append(f"{endpoint} {item_id}: {error['message']}")
+            
+            written = [
+                self._item_id(writes[action][index])
+                for action, responses in chunk.responses.items() for index in responses
+            ]
+            checkpoint.write(json.dumps(written) + "\n")
+            checkpoint.flush()
+            self._save(operation_data)
+            
+            if self._cancel_requested(operation_id):
+                return False
+            if operation_data.failed_items > config.max_failures:
+                return False
+            if config.delay_between_batches:
+                time.sleep(config.delay_between_batches)
+            return True
+        
+        result = BatchResult()
+        try:
+            if operation_data.failed_items <= config.max_failures:
+                writer = BatchWriter(
+                    api, endpoint, batch_size=config.batch_size,
+                    max_workers=config.max_concurrent_batches, on_chunk=on_chunk
+                )
+                result = writer.write(update=writes.get("update"), delete=writes.get("delete"))
+        finally:
+            checkpoint.close()
         
         return {
-            "successful": successful,
-            "failed": failed,
+            "successful": operation_data.successful_items,
+            "failed": operation_data.failed_items,
             "errors": errors,
+            "batch_requests": result.requests,
+            "cancelled": result.aborted and self._cancel_requested(operation_id),
+            "aborted": result.aborted or operation_data.failed_items > config.max_failures,
             "mode": "actual"
         }
     
-    def _restore_from_backup(self, backup_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Restore data from backup"""
+    @staticmethod
+    def _item_id(item: Any) -> Any:
+        return item.get("id") if isinstance(item, dict) else item
+    
+    def _checkpoint_path(self, operation_id: str) -> str:
+        return os.path.join(self.backup_dir, f"{operation_id}.checkpoint.jsonl")
+    
+    def _load_checkpoint(self, operation_id: str) -> set:
+        """Ids an operation already wrote successfully"""
+        
+        done = set()
+        path = self._checkpoint_path(operation_id)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as checkpoint:
+                for line in checkpoint:
+                    done.update(int(item_id) for item_id in json.loads(line))
+        return done
+    
+    def _increased_prices(self, api, endpoint: str, targets: List[Any],
+                          percentage: Any) -> Dict[str, Optional[str]]:
+        """
+        New regular price of each target under a percentage change
+        
+        Keyed by the id as a string (the form it takes in the saved
+        payload); None for a product without a regular price, missing for
+        one that was not found.
+        """
+        current = self._fetch_current(api, endpoint, targets, ["id", "regular_price"])
+        return {
+            str(product_id): (self._increase_price(product["regular_price"], percentage)
+                              if product.get("regular_price") else None)
+            for product_id, product in current.items()
+        }
+    
+    def _plan_writes(self, operation: str, targets: List[Any], changes: Dict[str, Any],
+                     prices: Dict[str, Optional[str]] = None) -> tuple:
+        """
+        Build the batch payloads of an operation
+        
+        Args:
+            operation: Operation name
+            targets: Ids still to write
+            changes: Operation changes
+            prices: _increased_prices of a percentage change
+        
+        Returns:
+            (endpoint, {"update": [...]} or {"delete": [...]}, errors for
+            targets that cannot be written)
+        """
+        
+        errors = []
+        
+        if operation == "bulk_delete":
+            item_type = changes.get("type", "product")
+            if item_type not in DELETE_ENDPOINTS:
+                raise ValueError(f"Unknown item type: {item_type}")
+            return DELETE_ENDPOINTS[item_type], {"delete": list(targets)}, errors
+        
+        if operation not in OPERATION_ENDPOINTS:
+            raise ValueError(f"Unknown operation: {operation}")
+        endpoint = OPERATION_ENDPOINTS[operation]
+        
+        fields = {key: value for key, value in changes.items() if key != "percentage_increase"}
+        updates = [{**fields, "id": target} for target in targets]
+        
+        if operation == "update_prices" and "percentage_increase" in changes:
+            # Relative change - write the prices computed at first execution
+            priced = []
+            for update in updates:
+                key = str(update["id"])
+                if key not in prices:
+                    errors.append(f"{endpoint} {update['id']}: Product not found")
+                    continue
+                if not prices[key]:
+                    # Nothing to raise; writing the bare id would count as a success
+                    errors.append(f"{endpoint} {update['id']}: No regular price to increase")
+                    continue
+                update["regular_price"] = prices[key]
+                priced.append(update)
+            updates = priced
+        
+        return endpoint, {"update": updates}, errors
+    
+    def _fetch_current(self, api, endpoint: str, ids: List[Any],
+                       fields: List[str] = None) -> Dict[Any, Dict[str, Any]]:
+        """Current records of ids, 100 per request via include, a few requests at a time"""
+        
+        def fetch(chunk: List[Any]) -> List[Dict[str, Any]]:
+            include = ",".join(str(item_id) for item_id in chunk)
+            return list(iter_items(api, endpoint, {"include": include}, fields=fields))
+        
+        chunks = [ids[i:i + MAX_BATCH_SIZE] for i in range(0, len(ids), MAX_BATCH_SIZE)]
+        records = {}
+        with ThreadPoolExecutor(max_workers=PREVIEW_FETCH_WORKERS) as pool:
+            for items in pool.map(fetch, chunks):
+                for item in items:
+                    records[int(item["id"])] = item
+        return records
+    
+    def _restore_from_backup(self, api, backup_data: Dict[str, Any], written: set) -> Dict[str, Any]:
+        """
+        Write the snapshot back as a batched inverse of the operation
+        
+        Updates are reverted by updating each item to its saved field
+        values; deleted items are recreated (under new ids), variable
+        products together with their saved variations. Only items whose
+        id is in written (the operation's checkpoint) are restored, so an
+        operation that stopped part way neither duplicates the items it
+        did not delete nor rewrites the ones it did not update.
+        """
         
         logger.info(f"Restoring from backup: {backup_data['backup_id']}")
         
-        # This would implement the actual restore logic
-        # For now, this is a placeholder
+        endpoint = backup_data["endpoint"]
+        recreate = backup_data["operation"] == "bulk_delete"
+        # Saved variations by the input index of their parent, created
+        # once the parent has its new id
+        variations: Dict[int, List[Dict[str, Any]]] = {}
+        
+        def recreatable(item: Dict[str, Any]) -> Dict[str, Any]:
+            item.pop("id", None)
+            # Point at the existing media instead of uploading it again
+            if item.get("images"):
+                item["images"] = [{"id": image["id"]} for image in item["images"] if image.get("id")]
+            if isinstance(item.get("image"), dict) and item["image"].get("id"):
+                item["image"] = {"id": item["image"]["id"]}
+            return item
+        
+        def saved_items() -> Iterator[Dict[str, Any]]:
+            index = 0
+            with gzip.open(backup_data["path"], "rt", encoding="utf-8") as backup_file:
+                for line in backup_file:
+                    item = json.loads(line)
+                    if int(item["id"]) not in written:
+                        continue
+                    if recreate:
+                        item = recreatable(item)
+                        if item.get("variations"):
+                            variations[index] = item.pop("variations")
+                    index += 1
+                    yield item
+        
+        writer = BatchWriter(api, endpoint)
+        if recreate:
+            result = writer.write(create=saved_items())
+        else:
+            result = writer.write(update=saved_items())
+        
+        restored = result.succeeded
+        errors = [f"{endpoint} {error.get('id', error['index'])}: {error['message']}"
+                  for error in result.errors]
+        
+        for index, saved in variations.items():
+            parent = result.responses["create"].get(index)
+            if parent is None:
+                continue
+            variation_endpoint = f"products/{parent['id']}/variations"
+            variation_result = BatchWriter(api, variation_endpoint).write(
+                create=[recreatable(variation) for variation in saved]
+            )
+            restored += variation_result.succeeded
+            errors.extend(
+                f"{variation_endpoint} {error.get('sku', error['index'])}: {error['message']}"
+                for error in variation_result.errors
+            )
         
         return {
-            "restored": 0,
-            "errors": []
+            "restored": restored,
+            "errors": errors
         }
     
     def _get_products_by_filters(self, api, filters: Dict[str, Any]) -> List[int]:
         """Get product IDs matching filters"""
         
         products = []
-        page = 1
         
         # Build API parameters from filters
-        params = {"per_page": 100, "page": page}
+        params = {}
         
         if "category" in filters:
             params["category"] = filters["category"]
@@ -518,29 +1339,14 @@ class BulkOperationManager:
         if "search" in filters:
             params["search"] = filters["search"]
         
-        try:
-            while True:
-                response = api.get("products", params=params)
-                if response.status_code != 200:
-                    break
-                
-                page_products = response.json()
-                if not page_products:
-                    break
-                
-                # Extract product IDs
-                for product in page_products:
-                    if product.get("id"):
-                        products.append(product["id"])
-                
-                params["page"] += 1
-                
-                # Safety limit
-                if len(products) > 10000:
-                    logger.warning("Product limit reached, stopping at 10000")
-                    break
-        
-        except Exception as e:
-            logger.error(f"Error fetching products: {e}")
+        for product in iter_items(api, "products", params, fields=["id"]):
+            # Extract product IDs
+            if product.get("id"):
+                products.append(product["id"])
+            
+            # Safety limit
+            if len(products) >= 10000:
+                logger.warning("Product limit reached, stopping at 10000")
+                break
         
         return products
\ No newline at end of file
@@ -11,11 +11,21 @@ import subprocess
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timedelta
 from functools import wraps
+from pathlib import Path
 import asyncio
 
+# Make the repository-level shared package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
 from mcp.server.fastmcp import FastMCP
 from woocommerce import API as WooCommerceAPI
 
+from shared.woocommerce_api import (
+    ManagedAPI, RetryPolicy, ResponseCache, ConnectionMonitor, ConnectionState,
+    ResourceIndex, SyncStateStore, SyncJournal, get_store_limiter, payload_hash,
+    probe_store, store_key
+)
+
 # Import enhanced tool modules
 try:
     # Try relative imports first (when run as module)
@@ -39,6 +49,7 @@ try:
     from .multi_store import MultiStoreManager
     from .store_cloner import StoreCloner
     from .bulk_operations import BulkOperationManager
+    from .scheduler import JobScheduler, SCHEDULE_INTERVALS
 except ImportError:
     # Fall back to absolute imports (when run directly)
     from tools import (
@@ -61,9 +72,14 @@ except ImportError:
     from multi_store import MultiStoreManager
     from store_cloner import StoreCloner
     from bulk_operations import BulkOperationManager
+    from scheduler import JobScheduler, SCHEDULE_INTERVALS
 
 logger = logging.getLogger(__name__)
 
+# Cached store SKU listings are refreshed with modified_after; a full rebuild
+# this often drops products deleted on the store
+SKU_LISTING_REBUILD_INTERVAL = timedelta(hours=1)
+
 
 class EnhancedMCPServer:
     """Enhanced MCP Server with full WooCommerce REST API coverage"""
@@ -74,11 +90,18 @@ class EnhancedMCPServer:
         self.active_store_id = None
         self.multi_store_manager = MultiStoreManager()
         self.store_cloner = StoreCloner()
-        self.bulk_manager = BulkOperationManager()
+        self.bulk_manager = BulkOperationManager(api_resolver=self._api_for_store_key)
+        self.sync_state = SyncStateStore()
+        self.sync_journal = SyncJournal()
+        self._running_syncs = set()
+        self._sku_listings: Dict[str, ResourceIndex] = {}
+        self.scheduler = JobScheduler()
         
         # Initialize from environment or config
         self._initialize_default_store()
         self._register_all_tools()
+        self._register_job_runners()
+        self.scheduler.start()
     
     def _initialize_default_store(self):
         """Initialize default store from environment variables"""
@@ -95,7 +118,12 @@ class EnhancedMCPServer:
                 'consumer_secret': consumer_secret,
                 'language': os.getenv('STORE_LANGUAGE', 'en'),
                 'currency': os.getenv('STORE_CURRENCY', 'EUR'),
-                'timezone': os.getenv('STORE_TIMEZONE', 'Europe/Helsinki')
+                'timezone': os.getenv('STORE_TIMEZONE', 'Europe/Helsinki'),
+                'rate_limit_per_minute': int(os.getenv('WOOCOMMERCE_RATE_LIMIT_PER_MINUTE', 60)),
+                'concurrent_requests': int(os.getenv('WOOCOMMERCE_CONCURRENT_REQUESTS', 5)),
+                'retry_count': int(os.getenv('WOOCOMMERCE_RETRY_COUNT', 3)),
+                'retry_delay': float(os.getenv('WOOCOMMERCE_RETRY_DELAY', 2)),
+                'cache_ttl_seconds': int(os.getenv('WOOCOMMERCE_CACHE_TTL', 300))
             })
     
     def add_store(self, store_config: Dict[str, Any]) -> bool:
@@ -103,30 +131,51 @@ class EnhancedMCPServer:
         store_id = store_config.get('id')
         
         try:
-            api_client = WooCommerceAPI(
+            limiter = get_store_limiter(
+                store_config['url'],
+                rate_limit_per_minute=store_config.get('rate_limit_per_minute', 60),
+                concurrent_requests=store_config.get('concurrent_requests', 5)
+            )
+            retry_policy = RetryPolicy(
+                max_retries=store_config.get('retry_count', 3),
+                base_delay=store_config.get('retry_delay', 2)
+            )
+            cache = ResponseCache(ttl=store_config.get('cache_ttl_seconds', 300))
+            api_client = ManagedAPI(WooCommerceAPI(
                 url=store_config['url'],
                 consumer_key=store_config['consumer_key'],
                 consumer_secret=store_config['consumer_secret'],
                 wp_api=True,
                 version="wc/v3",
                 timeout=30
-            )
+            ), limiter=limiter, retry_policy=retry_policy, cache=cache)
             
-            # Test connection
-            response = api_client.get("system_status")
-            if response.status_code == 200:
-                self.stores[store_id] = {
-                    'config': store_config,
-                    'api': api_client,
-                    'connected': True,
-                    'last_sync': datetime.now().isoformat()
-                }
-                
-                if not self.active_store_id:
-                    self.active_store_id = store_id
-                
-                logger.info(f"Successfully connected to store: {store_config['name']}")
-                return True
+            store_entry = {
+                'config': store_config,
+                'api': api_client,
+                'connected': False,
+                'state': ConnectionState.CONNECTING,
+                'last_sync': datetime.now().isoformat()
+            }
+            
+            def on_state_change(state: str):
+                store_entry['state'] = state
+                store_entry['connected'] = state == ConnectionState.HEALTHY
+            
+            # Validate in the background so startup does not wait on the store
+            store_entry['monitor'] = ConnectionMonitor(
+                lambda: probe_store(api_client),
+                name=store_config.get('name', store_id),
+                on_change=on_state_change
+            ).start()
+            
+            self.stores[store_id] = store_entry
+            
+            if not self.active_store_id:
+                self.active_store_id = store_id
+            
+            logger.info(f"Added store {store_config.get('name', store_id)}, validating connection")
+            return True
         except Exception as e:
             logger.error(f"Failed to connect to store {store_id}: {e}")
             return False
@@ -137,6 +186,55 @@ class EnhancedMCPServer:
             return self.stores[self.active_store_id]['api']
         return None
     
+    def _api_for_store_key(self, key: str):
+        """API client of the configured store with this store_key"""
+        for entry in self.stores.values():
+            if store_key(entry['api']) == key:
+                return entry['api']
+        return None
+    
+    def _background_stores(self, store_ids: List[str]) -> Dict[str, Any]:
+        """
+        Store entries whose API clients run at background limiter priority
+        
+        Scheduled jobs use these so they share each store's rate limits with
+        interactive tool calls without starving them.
+        """
+        background = {}
+        for store_id in store_ids:
+            entry = self.stores.get(store_id)
+            if entry is None:
+                continue
+            api = entry['api']
+            if hasattr(api, 'as_background'):
+                api = api.as_background()
+            background[store_id] = {**entry, 'api': api}
+        return background
+    
+    def _register_job_runners(self):
+        """Connect scheduler job kinds to the work they run"""
+        
+        def run_store_sync(params: Dict[str, Any]) -> Dict[str, Any]:
+            store_ids = [params['source'], *params['targets']]
+            missing = [store_id for store_id in store_ids if store_id not in self.stores]
+            if missing:
+                return {"error": f"Stores not connected: {', '.join(missing)}"}
+            return self.multi_store_manager.sync_stores(
+                self._background_stores(store_ids),
+                params['source'], params['targets'], params['config']
+            )
+        
+        self.scheduler.register_runner("multi_store_sync", run_store_sync)
+        
+        for kind, task in monitoring.MONITORING_TASKS.items():
+            def run_monitoring_task(params: Dict[str, Any], task=task) -> Dict[str, Any]:
+                stores = self._background_stores([params['store_id']])
+                if not stores:
+                    return {"error": f"Store {params['store_id']} not connected"}
+                return task(stores[params['store_id']]['api'])
+            
+            self.scheduler.register_runner(kind, run_monitoring_task)
+    
     def switch_store(self, store_id: str) -> bool:
         """Switch active store"""
         if store_id in self.stores:
@@ -181,6 +279,9 @@ class EnhancedMCPServer:
         # Monitoring & Health
         self._register_monitoring_tools()
         
+        # Scheduled Jobs
+        self._register_scheduler_tools()
+        
         # VPS Management & Deployment
         self._register_vps_tools()
         
@@ -335,7 +436,12 @@ class EnhancedMCPServer:
         def add_store(store_config: Dict[str, Any]) -> str:
             """Add a new store connection"""
             success = self.add_store(store_config)
-            return json.dumps({"success": success, "store_id": store_config.get('id')})
+            store_data = self.stores.get(store_config.get('id'), {})
+            return json.dumps({
+                "success": success,
+                "store_id": store_config.get('id'),
+                "state": store_data.get('state')
+            })
         
         @self.mcp.tool()
         def list_stores() -> str:
@@ -350,6 +456,8 @@ class EnhancedMCPServer:
                     'currency': store_data['config'].get('currency', 'EUR'),
                     'timezone': store_data['config'].get('timezone'),
                     'connected': store_data['connected'],
+                    'state': store_data['monitor'].state,
+                    'last_error': store_data['monitor'].last_error,
                     'last_sync': store_data['last_sync'],
                     'is_active': store_id == self.active_store_id
                 })
@@ -364,10 +472,26 @@ class EnhancedMCPServer:
         @self.mcp.tool()
         def sync_stores(source_store: str, target_stores: List[str], 
                        sync_config: Dict[str, Any]) -> str:
-            """Synchronize data between stores"""
+            """Synchronize data between stores; an hourly/daily/real-time schedule
+            in sync_config also registers a recurring job for this store pair"""
             result = self.multi_store_manager.sync_stores(
                 self.stores, source_store, target_stores, sync_config
             )
+            
+            schedule = sync_config.get('schedule', 'manual')
+            if schedule in SCHEDULE_INTERVALS and "error" not in result:
+                job = self.scheduler.add_job(
+                    f"sync:{source_store}->{','.join(sorted(target_stores))}",
+                    "multi_store_sync",
+                    {"source": source_store, "targets": target_stores, "config": sync_config},
+                    SCHEDULE_INTERVALS[schedule]
+                )
+                result["scheduled"] = {"job_id": job["job_id"], "next_run": job["next_run"]}
+            elif schedule != 'manual':
+                result["scheduled"] = {
+                    "error": f"Unknown schedule {schedule}, expected one of "
+                             f"{', '.join(SCHEDULE_INTERVALS)} or manual"
+                }
             return json.dumps(result, indent=2)
     
     def _register_cloning_tools(self):
@@ -415,17 +539,44 @@ class EnhancedMCPServer:
             return json.dumps(result, indent=2)
         
         @self.mcp.tool()
-        def execute_bulk_operation(operation_id: str, confirmed: bool = False) -> str:
-            """Execute a previewed bulk operation"""
+        def execute_bulk_operation(operation_id: str, confirmed: bool = False,
+                                   safety_config: Dict[str, Any] = None,
+                                   resume: bool = False) -> str:
+            """
+            Start a previewed bulk operation as a background job
+            
+            Returns at once; poll get_bulk_operation_status. safety_config
+            overrides SafetyConfig fields, resume continues a cancelled or
+            failed operation from its checkpoint.
+            """
             if not confirmed:
                 return json.dumps({"error": "Operation must be confirmed"})
             
-            result = self.bulk_manager.execute_operation(operation_id)
+            config = {"dry_run": False, **(safety_config or {})}
+            result = self.bulk_manager.submit_operation(operation_id, config, resume=resume)
+            return json.dumps(result, indent=2)
+        
+        @self.mcp.tool()
+        def get_bulk_operation_status(operation_id: str) -> str:
+            """Progress of a bulk operation with throughput and ETA"""
+            result = self.bulk_manager.get_operation_status(operation_id)
+            return json.dumps(result, indent=2)
+        
+        @self.mcp.tool()
+        def list_bulk_operations(limit: int = 20, offset: int = 0, status: str = None) -> str:
+            """List bulk operations, most recent first"""
+            result = self.bulk_manager.list_operations(limit=limit, offset=offset, status=status)
+            return json.dumps(result, indent=2)
+        
+        @self.mcp.tool()
+        def cancel_bulk_operation(operation_id: str) -> str:
+            """Stop a bulk operation after the batches in progress"""
+            result = self.bulk_manager.cancel_operation(operation_id)
             return json.dumps(result, indent=2)
         
         @self.mcp.tool()
         def rollback_bulk_operation(operation_id: str) -> str:
-            """Rollback a bulk operation"""
+            """Rollback a finished, cancelled or interrupted bulk operation"""
             result = self.bulk_manager.rollback_operation(operation_id)
             return json.dumps(result, indent=2)
     
@@ -530,6 +681,18 @@ class EnhancedMCPServer:
             result = monitoring.monitor_store_health(api)
             return json.dumps(result, indent=2)
         
+        @self.mcp.tool()
+        def get_api_client_stats(store_id: str = None) -> str:
+            """Get rate limiter, retry and cache counters for a store's API client"""
+            if not store_id:
+                store_id = self.active_store_id
+            
+            api = self.stores.get(store_id, {}).get('api')
+            if not api:
+                return json.dumps({"error": "Store not found"})
+            
+            return json.dumps(api.stats(), indent=2)
+        
         @self.mcp.tool()
         def manage_store_backups(store_id: str, backup_config: Dict[str, Any]) -> str:
             """Manage store backup configuration"""
@@ -540,6 +703,50 @@ class EnhancedMCPServer:
             result = monitoring.manage_store_backups(api, backup_config)
             return json.dumps(result, indent=2)
     
+    def _register_scheduler_tools(self):
+        """Register scheduled job tools"""
+        
+        @self.mcp.tool()
+        def list_scheduled_jobs(kind: str = None) -> str:
+            """List scheduled syncs and monitoring jobs with next run and last outcome"""
+            return json.dumps(self.scheduler.list_jobs(kind), indent=2)
+        
+        @self.mcp.tool()
+        def pause_scheduled_job(job_id: str) -> str:
+            """Pause a scheduled job"""
+            job = self.scheduler.pause(job_id)
+            if not job:
+                return json.dumps({"error": f"Job {job_id} not found"})
+            return json.dumps(job, indent=2)
+        
+        @self.mcp.tool()
+        def resume_scheduled_job(job_id: str) -> str:
+            """Resume a paused scheduled job"""
+            job = self.scheduler.resume(job_id)
+            if not job:
+                return json.dumps({"error": f"Job {job_id} not found"})
+            return json.dumps(job, indent=2)
+        
+        @self.mcp.tool()
+        def remove_scheduled_job(job_id: str) -> str:
+            """Remove a scheduled job"""
+            return json.dumps({"success": self.scheduler.remove_job(job_id), "job_id": job_id})
+        
+        @self.mcp.tool()
+        def setup_monitoring_schedule(store_id: str = None,
+                                      schedule_config: Dict[str, Any] = None) -> str:
+            """Schedule monitoring, backups and health checks for a store"""
+            if not store_id:
+                store_id = self.active_store_id
+            
+            if store_id not in self.stores:
+                return json.dumps({"error": "Store not found"})
+            
+            result = monitoring.setup_monitoring_schedule(
+                self.scheduler, store_id, schedule_config or {}
+            )
+            return json.dumps(result, indent=2)
+    
     def _register_store_config_tools(self):
         """Register store configuration tools"""
         
@@ -1013,15 +1220,77 @@ class EnhancedMCPServer:
             return json.dumps(result, indent=2)
         
         @self.mcp.tool()
-        def get_woocommerce_sync_status() -> str:
-            """Check sync status between database and WooCommerce"""
+        def get_woocommerce_sync_status(check_database_changes: bool = False) -> str:
+            """Check sync status between database and WooCommerce
+            
+            Args:
+                check_database_changes: Also consolidate every synced SKU to find
+                                        products changed in the database since
+                                        their last push (slow on large catalogs)
+            """
             api = self.get_active_api()
             if not api:
                 return json.dumps({"error": "No active WooCommerce store"})
             
-            result = self._get_woocommerce_sync_status_internal(api)
+            result = self._get_woocommerce_sync_status_internal(api, check_database_changes)
             return json.dumps(result, indent=2)
         
+        @self.mcp.tool()
+        def resume_sync(sync_id: str) -> str:
+            """Resume an interrupted sync run from its last committed chunk
+            
+            Args:
+                sync_id: ID returned by sync_to_woocommerce or sync_stores
+            """
+            run = self.sync_journal.get_run(sync_id)
+            if not run:
+                return json.dumps({"error": f"Sync {sync_id} not found"})
+            
+            if run["kind"] == "multi_store":
+                result = self.multi_store_manager.resume_sync(self.stores, sync_id)
+            elif run["status"] == "completed":
+                result = {"sync_id": sync_id, "status": "completed", "message": "Nothing to resume"}
+            elif sync_id in self._running_syncs:
+                result = {"error": f"Sync {sync_id} is still running"}
+            else:
+                result = self._resume_woocommerce_sync(run)
+            return json.dumps(result, indent=2)
+        
+        @self.mcp.tool()
+        def list_sync_runs(status: str = None, limit: int = 20) -> str:
+            """List journaled sync runs, most recent first
+            
+            Args:
+                status: Filter by status (running, completed, failed)
+                limit: Maximum runs to return
+            """
+            runs = self.sync_journal.list_runs(status=status, limit=limit)
+            in_process = self._running_syncs | set(self.multi_store_manager.active_syncs)
+            for run in runs:
+                if run["status"] == "running" and run["sync_id"] not in in_process:
+                    # Running in the journal but not in this process: crashed mid-sync
+                    run["status"] = "interrupted"
+            return json.dumps(runs, indent=2, default=str)
+        
+        @self.mcp.tool()
+        def get_sync_drift() -> str:
+            """Report synced products that were edited or deleted on the store since the last push"""
+            api = self.get_active_api()
+            if not api:
+                return json.dumps({"error": "No active WooCommerce store"})
+            
+            try:
+                sku_index = ResourceIndex.build(api, "products", key="sku")
+                drift = self.sync_state.drift(store_key(api), sku_index)
+                return json.dumps({
+                    "success": True,
+                    "drifted": drift["drifted"],
+                    "missing": drift["missing"],
+                    "store_products": len(sku_index)
+                }, indent=2)
+            except Exception as e:
+                return json.dumps({"error": str(e)})
+        
         # NEW: Database Schema Management Tools
         @self.mcp.tool()
         def alter_database_schema(operation: str, table: str, changes: Dict[str, Any]) -> str:
@@ -1088,138 +1357,347 @@ class EnhancedMCPServer:
     def _sync_to_woocommerce_internal(self, api, sku_list: List[str] = None, update_type: str = "all") -> Dict[str, Any]:
         """Internal WooCommerce sync implementation"""
         
+        sync_id = None
         try:
             from datetime import datetime
             
             # Get products to sync
-            if sku_list:
-                products_to_sync = sku_list
-            else:
-                # Get all SKUs from database
-                db_result = database_integration.query_database("list_skus", {})
-                if "error" in db_result:
-                    return {"error": "Could not retrieve SKUs from database"}
-                products_to_sync = db_result.get("results", [])[:20]  # Limit to 20 for safety
-            
-            sync_results = {
-                "requested_skus": len(products_to_sync),
-                "processed": 0,
-                "updated": 0,
-                "created": 0,
-                "errors": [],
-                "details": []
-            }
-            
-            for sku in products_to_sync:
-                try:
-                    # Get consolidated product data
-                    product_data = data_consolidator.consolidate_product_data(sku)
-                    if "error" in product_data:
-                        sync_results["errors"].append(f"{sku}: {product_data['error']}")
-                        continue
-                    
-                    # Check if product exists in WooCommerce (by SKU)
-                    wc_products = api.get("products", params={"sku": sku})
-                    
-                    consolidated_data = product_data.get("consolidated_data", {})
-                    
-                    # Prepare WooCommerce product data
-                    wc_product_data = {
-                        "sku": sku,
-                        "name": consolidated_data.get("name", f"Product {sku}"),
-                        "regular_price": str(consolidated_data.get("price", 0)),
-                        "description": consolidated_data.get("description", ""),
-                        "short_description": consolidated_data.get("short_description", ""),
-                        "manage_stock": True,
-                        "stock_quantity": consolidated_data.get("stock_quantity", 0),
-                        "status": "publish"
-                    }
-                    
-                    # Update or create product
-                    if wc_products.json() and len(wc_products.json()) > 0:
-                        # Update existing product
-                        wc_product_id = wc_products.json()[0]["id"]
-                        response = api.put(f"products/{wc_product_id}", wc_product_data)
-                        if response.status_code == 200:
-                            sync_results["updated"] += 1
-                            sync_results["details"].append(f"{sku}: Updated WC product #{wc_product_id}")
-                        else:
-                            sync_results["errors"].append(f"{sku}: Update failed - {response.status_code}")
-                    else:
-                        # Create new product
-                        response = api.post("products", wc_product_data)
-                        if response.status_code == 201:
-                            new_id = response.json().get("id")
-                            sync_results["created"] += 1
-                            sync_results["details"].append(f"{sku}: Created new WC product #{new_id}")
-                        else:
-                            sync_results["errors"].append(f"{sku}: Creation failed - {response.status_code}")
-                    
-                    sync_results["processed"] += 1
-                    
-                except Exception as e:
-                    sync_results["errors"].append(f"{sku}: Exception - {str(e)}")
+            products_to_sync = self._skus_to_sync(sku_list)
+            if products_to_sync is None:
+                return {"error": "Could not retrieve SKUs from database"}
             
-            return {
-                "success": True,
-                "sync_results": sync_results,
-                "timestamp": datetime.now().isoformat()
-            }
+            # Journal the run before anything is sent so resume_sync can finish it
+            sync_id = f"wc_sync_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+            self.sync_journal.start_run(sync_id, "woocommerce", {
+                "store": store_key(api),
+                "store_id": self.active_store_id,
+                "sku_list": sku_list,
+                "update_type": update_type
+            }, ["products"])
             
+            self._plan_woocommerce_sync(api, sync_id, products_to_sync)
+            return self._run_woocommerce_sync(api, sync_id)
+        
         except Exception as e:
             logger.error(f"WooCommerce sync error: {e}")
+            if sync_id:
+                self.sync_journal.finish_run(sync_id, "failed", error=str(e))
+                return {"error": str(e), "sync_id": sync_id, "resumable": True}
             return {"error": str(e)}
     
-    def _get_woocommerce_sync_status_internal(self, api) -> Dict[str, Any]:
-        """Internal WooCommerce sync status check"""
+    def _skus_to_sync(self, sku_list: List[str] = None) -> Optional[List[str]]:
+        """Requested SKUs, or every SKU in the database (None when it cannot be read)"""
+        if sku_list:
+            return sku_list
+        
+        # Get all SKUs from database
+        db_result = database_integration.query_database("list_skus", {})
+        if "error" in db_result:
+            return None
+        return db_result.get("results", [])
+    
+    def _woocommerce_product_data(self, sku: str) -> Dict[str, Any]:
+        """WooCommerce product payload for a database SKU, or an error dict"""
+        
+        # Get consolidated product data
+        product_data = data_consolidator.consolidate_product_data(sku)
+        if "error" in product_data:
+            return {"error": product_data["error"]}
+        
+        consolidated_data = product_data.get("consolidated_data", {})
+        
+        # Prepare WooCommerce product data
+        return {
+            "sku": sku,
+            "name": consolidated_data.get("name", f"Product {sku}"),
+            "regular_price": str(consolidated_data.get("price", 0)),
+            "description": consolidated_data.get("description", ""),
+            "short_description": consolidated_data.get("short_description", ""),
+            "manage_stock": True,
+            "stock_quantity": consolidated_data.get("stock_quantity", 0),
+            "status": "publish"
+        }
+    
+    def _plan_woocommerce_sync(self, api, sync_id: str, products_to_sync: List[str]):
+        """Consolidate SKUs and journal the products/batch chunks to send"""
         
-        try:
-            from datetime import datetime
+        unchanged = 0
+        drifted = []
+        errors = []
+        
+        # One projected listing instead of a GET per SKU
+        sku_index = ResourceIndex.build(api, "products", key="sku")
+        
+        # What was pushed last time, to skip products that did not change
+        states = self.sync_state.load(store_key(api))
+        
+        creates, updates = [], []
+        # A SKU listed twice would otherwise be created twice in one batch
+        for sku in dict.fromkeys(products_to_sync):
+            try:
+                wc_product_data = self._woocommerce_product_data(sku)
+                if "error" in wc_product_data:
+                    errors.append(f"{sku}: {wc_product_data['error']}")
+                    continue
+                
+                remote = sku_index.get(sku)
+                status = SyncStateStore.classify(states.get(sku), remote, payload_hash(wc_product_data))
+                if status == "unchanged":
+                    unchanged += 1
+                    continue
+                if status == "drifted":
+                    # Edited on the store since our last push - push again
+                    drifted.append(sku)
+                
+                # Update existing product or create a new one
+                wc_product_id = remote.get("id") if remote else None
+                if wc_product_id:
+                    updates.append({"id": wc_product_id, **wc_product_data})
+                else:
+                    creates.append(wc_product_data)
             
-            # Get database product count
+            except Exception as e:
+                errors.append(f"{sku}: Exception - {str(e)}")
+        
+        # 100 products per products/batch chunk
+        self.sync_journal.plan(sync_id, "products", "products", create=creates, update=updates)
+        self.sync_journal.update_summary(
+            sync_id,
+            requested_skus=len(products_to_sync),
+            unchanged=unchanged,
+            drifted=drifted,
+            errors=errors
+        )
+    
+    def _run_woocommerce_sync(self, api, sync_id: str, resuming: bool = False) -> Dict[str, Any]:
+        """Send the open chunks of a journaled sync and report the whole run"""
+        from datetime import datetime
+        
+        store = store_key(api)
+        
+        def remember(body: Dict[str, Any], result) -> None:
+            # Remember what the store now holds for the next delta
+            self.sync_state.record(store, [
+                {
+                    "sku": body[action][index]["sku"],
+                    "payload_hash": payload_hash(
+                        {k: v for k, v in body[action][index].items() if k != "id"}
+                    ),
+                    "product_id": product.get("id"),
+                    "remote_modified": product.get("date_modified")
+                }
+                for action in ("create", "update")
+                for index, product in result.responses[action].items()
+            ])
+        
+        existing = None
+        if resuming and any(
+                chunk["body"].get("create") for chunk in self.sync_journal.open_chunks(sync_id, "products")):
+            # An interrupted chunk may already have created some of its products
+            sku_index = ResourceIndex.build(api, "products", key="sku")
+            existing = lambda payload: sku_index.id_for(payload.get("sku"))
+        
+        self._running_syncs.add(sync_id)
+        try:
+            step = self.sync_journal.execute(api, sync_id, "products", existing=existing, on_commit=remember)
+        finally:
+            self._running_syncs.discard(sync_id)
+        
+        summary = self.sync_journal.get_run(sync_id)["summary"]
+        sync_results = {
+            "sync_id": sync_id,
+            "requested_skus": summary.get("requested_skus", 0),
+            "processed": step["created"] + step["updated"] + step["failed"],
+            "updated": step["updated"],
+            "created": step["created"],
+            "unchanged": summary.get("unchanged", 0),
+            "drifted": summary.get("drifted", []),
+            "errors": list(summary.get("errors", [])),
+            "details": []
+        }
+        
+        for item in step["items"]:
+            label = "Updated" if item["action"] == "update" else "Created new"
+            sync_results["details"].append(
+                f"{item['payload']['sku']}: {label} WC product #{item['result'].get('id')}"
+            )
+        
+        for error in step["errors"]:
+            label = "Update failed" if error["action"] == "update" else "Creation failed"
+            sync_results["errors"].append(f"{error['payload'].get('sku')}: {label} - {error['message']}")
+        
+        # Chunks whose request failed stay open for resume_sync
+        if step["open_chunks"]:
+            self.sync_journal.finish_run(sync_id, "failed", error=f"{step['open_chunks']} chunks not sent")
+            sync_results["resumable"] = True
+        else:
+            self.sync_journal.finish_run(sync_id, "completed")
+        
+        return {
+            "success": True,
+            "sync_results": sync_results,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _resume_woocommerce_sync(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """Continue a journaled sync_to_woocommerce run"""
+        
+        params = run["params"]
+        sync_id = run["sync_id"]
+        
+        # The run's store, by id if it still points at the same URL, else by URL
+        api = None
+        store_data = self.stores.get(params.get("store_id"))
+        if store_data and store_key(store_data['api']) == params["store"]:
+            api = store_data['api']
+        else:
+            for store_data in self.stores.values():
+                if store_key(store_data['api']) == params["store"]:
+                    api = store_data['api']
+                    break
+        if api is None:
+            return {"error": f"Store {params['store']} of sync {sync_id} is not connected"}
+        
+        try:
+            self.sync_journal.reopen_run(sync_id)
+            if self.sync_journal.step_info(sync_id, "products") is None:
+                # Interrupted while planning - nothing was sent yet
+                products_to_sync = self._skus_to_sync(params.get("sku_list"))
+                if products_to_sync is None:
+                    return {"error": "Could not retrieve SKUs from database"}
+                self._plan_woocommerce_sync(api, sync_id, products_to_sync)
+            return self._run_woocommerce_sync(api, sync_id, resuming=True)
+        
+        except Exception as e:
+            logger.error(f"WooCommerce sync resume error: {e}")
+            self.sync_journal.finish_run(sync_id, "failed", error=str(e))
+            return {"error": str(e), "sync_id": sync_id, "resumable": True}
+    
+    def _store_sku_listing(self, api) -> ResourceIndex:
+        """Cached SKU/date_modified listing of a store, refreshed incrementally"""
+        key = store_key(api)
+        listing = self._sku_listings.get(key)
+        if (listing is None or listing.watermark is None
+                or datetime.now() - listing.built_at > SKU_LISTING_REBUILD_INTERVAL):
+            listing = ResourceIndex.build(api, "products", key="sku")
+            self._sku_listings[key] = listing
+        else:
+            listing.refresh(api)
+        return listing
+    
+    def _get_woocommerce_sync_status_internal(self, api,
+                                              check_database_changes: bool = False) -> Dict[str, Any]:
+        """
+        Internal WooCommerce sync status check
+        
+        By default only the sync state and the cached store listing are
+        compared, so the check costs a database SKU list and usually one
+        store request. Consolidating a SKU reads the database and every
+        import file, so comparing the database side against the pushed
+        payload hash is only done with check_database_changes.
+        """
+        
+        try:
+            # Get database SKUs
             db_result = database_integration.query_database("list_skus", {})
-            db_count = len(db_result.get("results", [])) if "error" not in db_result else 0
+            if "error" in db_result:
+                return {"error": "Could not retrieve SKUs from database"}
+            db_skus = {str(sku).strip() for sku in db_result.get("results", []) if str(sku).strip()}
             
-            # Get WooCommerce product count
-            wc_response = api.get("products", params={"per_page": 1})
-            if wc_response.status_code == 200:
-                wc_total = int(wc_response.headers.get("X-WP-Total", 0))
-                
-                # Sample check - get a few products with SKUs
-                wc_with_skus = api.get("products", params={"per_page": 10})
-                if wc_with_skus.status_code == 200:
-                    wc_products = wc_with_skus.json()
-                    products_with_skus = [p for p in wc_products if p.get("sku")]
-                    
-                    sync_status = {
-                        "database_products": db_count,
-                        "woocommerce_products": wc_total,
-                        "wc_products_with_skus": len(products_with_skus),
-                        "sync_ratio": f"{len(products_with_skus)}/{db_count}",
-                        "recommendations": []
-                    }
-                    
-                    if len(products_with_skus) < db_count * 0.8:
-                        sync_status["recommendations"].append("Many database products may not be synced to WooCommerce")
-                    
-                    if wc_total > db_count * 1.5:
-                        sync_status["recommendations"].append("WooCommerce has more products than database - manual review needed")
-                    
-                    return {
-                        "success": True,
-                        "sync_status": sync_status,
-                        "timestamp": datetime.now().isoformat()
-                    }
-            
-            return {"error": "Could not retrieve WooCommerce product data"}
+            # Store side: cached listing, usually one modified_after request
+            listing = self._store_sku_listing(api)
+            store_products = listing.snapshot()
+            states = self.sync_state.load(store_key(api))
+            
+            missing_in_store = sorted(db_skus - store_products.keys())
+            missing_in_database = sorted(store_products.keys() - db_skus)
+            
+            # In both: in sync when the store still holds what the last sync
+            # pushed (and, when checked, the database still consolidates to
+            # it); stale when never pushed, edited on the store or changed
+            # in the database
+            stale, in_sync = [], []
+            stale_reasons = {"new": 0, "changed": 0, "drifted": 0, "unreadable": 0}
+            for sku in sorted(db_skus & store_products.keys()):
+                state = states.get(sku)
+                if state is None:
+                    status = "new"
+                elif not check_database_changes:
+                    status = SyncStateStore.classify(state, store_products[sku], state["payload_hash"])
+                else:
+                    wc_product_data = self._woocommerce_product_data(sku)
+                    if "error" in wc_product_data:
+                        status = "unreadable"
+                    else:
+                        status = SyncStateStore.classify(
+                            state, store_products[sku], payload_hash(wc_product_data)
+                        )
+                if status == "unchanged":
+                    in_sync.append(sku)
+                else:
+                    stale.append(sku)
+                    stale_reasons[status] += 1
+            
+            sync_status = {
+                "database_products": len(db_skus),
+                "woocommerce_products": len(store_products),
+                "in_sync": len(in_sync),
+                "stale": len(stale),
+                "stale_reasons": stale_reasons,
+                "database_changes_checked": check_database_changes,
+                "missing_in_store": len(missing_in_store),
+                "missing_in_database": len(missing_in_database),
+                "sync_ratio": f"{len(in_sync)}/{len(db_skus)}",
+                "samples": {
+                    "stale": stale[:20],
+                    "missing_in_store": missing_in_store[:20],
+                    "missing_in_database": missing_in_database[:20]
+                },
+                "listing": {
+                    "built_at": listing.built_at.isoformat(),
+                    "refreshed_at": listing.refreshed_at.isoformat()
+                },
+                "recommendations": []
+            }
+            
+            if missing_in_store:
+                sync_status["recommendations"].append(
+                    f"{len(missing_in_store)} database products are not in WooCommerce - run sync_to_woocommerce"
+                )
             
+            if stale:
+                sync_status["recommendations"].append(
+                    f"{len(stale)} products differ from the last sync - run sync_to_woocommerce for them"
+                )
+            
+            if missing_in_database:
+                sync_status["recommendations"].append(
+                    f"{len(missing_in_database)} WooCommerce products are not in the database - manual review needed"
+                )
+            
+            if in_sync and not check_database_changes:
+                sync_status["recommendations"].append(
+                    "Database edits since the last push were not compared - "
+                    "use check_database_changes=True for a full comparison"
+                )
+            
+            return {
+                "success": True,
+                "sync_status": sync_status,
+                "timestamp": datetime.now().isoformat()
+            }
+        
         except Exception as e:
             logger.error(f"WooCommerce sync status error: {e}")
             return {"error": str(e)}
     
     def run(self):
         """Run the enhanced MCP server"""
-        self.mcp.run()
+        try:
+            self.mcp.run()
+        finally:
+            self.scheduler.stop()
+            self.bulk_manager.shutdown()
 
 
 if __name__ == "__main__":
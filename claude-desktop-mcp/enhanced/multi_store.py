@@ -4,14 +4,37 @@ Handle connections, synchronization, and operations across multiple WooCommerce
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Callable
 from datetime import datetime, timedelta
 import asyncio
 import json
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 
+from shared.woocommerce_api import (
+    iter_items, iter_pages, ResourceIndex, SyncJournal, SyncStateStore, payload_hash, store_key
+)
+from shared.woocommerce_api.batch import MAX_BATCH_SIZE
+from shared.woocommerce_api.index import SKU_INDEX_FIELDS
+from shared.woocommerce_api.journal import RUN_COMPLETED, RUN_FAILED
+
 logger = logging.getLogger(__name__)
 
+# Persisted target indexes older than this are rebuilt instead of refreshed,
+# which drops records deleted on the store
+INDEX_REBUILD_INTERVAL = timedelta(hours=24)
+
+# Source field an incremental sync's watermark is taken from
+WATERMARK_FIELD = "date_modified_gmt"
+
+
+def _modified_after(watermark: str) -> str:
+    """modified_after bound for a watermark - one second back, as the filter is exclusive"""
+    return (datetime.fromisoformat(watermark) - timedelta(seconds=1)).isoformat()
+
 
 @dataclass
 class StoreConfig:
@@ -49,6 +72,13 @@ class SyncConfig:
     translation_rules: Dict[str, Any] = None
     currency_conversion: Dict[str, float] = None
     schedule: str = "manual"  # real-time, hourly, daily, manual
+    max_parallel_targets: int = 5  # target stores synced at the same time
+    target_concurrency: int = 4    # concurrent batch requests per target
+    persist_indexes: bool = False  # keep target sku/slug indexes between runs
+    incremental: bool = True       # only products modified since the last successful sync
+    deletion_scan_hours: int = 24  # how often an incremental sync diffs source SKUs
+    sync_deletions: bool = False   # delete products removed from the source on the target
+    pipeline_depth: int = 4        # source pages buffered per target while it writes
     
     def __post_init__(self):
         if self.translation_rules is None:
@@ -57,6 +87,188 @@ class SyncConfig:
             self.currency_conversion = {}
 
 
+class ProductFeed:
+    """
+    One listing of the source products, broadcast page by page to targets
+    
+    Each subscriber reads from its own bounded queue, so the listing runs
+    ahead of the slowest subscriber by at most depth pages and memory stays
+    bounded whatever the catalog size. Subscribers that stop early must
+    release() so the listing does not wait for them.
+    """
+    
+    _END = object()
+    
+    def __init__(self, pages: Callable[[], Iterable[List[Dict[str, Any]]]],
+                 subscribers: Iterable[str], since: Optional[str] = None, depth: int = 4):
+        """
+        Args:
+            pages: Returns the listing's pages, called once on the producer thread
+            subscribers: Names that read the listing through products()
+            since: Watermark the listing was made from, if any
+            depth: Pages queued per subscriber
+        """
+        self.pages = pages
+        self.since = since
+        self._queues = {name: queue.Queue(maxsize=max(1, depth)) for name in subscribers}
+        self._released = set()
+        self._lock = threading.Lock()
+        self._producer: Optional[threading.Thread] = None
+    
+    def products(self, subscriber: str, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Products modified after since (every listed product when None)"""
+        with self._lock:
+            if self._producer is None:
+                self._producer = threading.Thread(
+                    target=self._produce, name="source-products", daemon=True
+                )
+                self._producer.start()
+        
+        cutoff = _modified_after(since) if since and since != self.since else None
+        pages = self._queues[subscriber]
+        while True:
+            page = pages.get()
+            if page is self._END:
+                return
+            if isinstance(page, Exception):
+                raise page
+            for product in page:
+                if cutoff is None or (product.get(WATERMARK_FIELD) or "") > cutoff:
+                    yield product
+    
+    def release(self, subscriber: str):
+        """Stop feeding a subscriber and drop what was queued for it"""
+        with self._lock:
+            self._released.add(subscriber)
+        pages = self._queues.get(subscriber)
+        while pages is not None:
+            try:
+                pages.get_nowait()
+            except queue.Empty:
+                break
+    
+    def wait(self):
+        """Wait until the listing has been read to the end (or failed)"""
+        with self._lock:
+            producer = self._producer
+        if producer is not None:
+            producer.join()
+    
+    def _produce(self):
+        try:
+            for page in self.pages():
+                self._publish(page)
+        except Exception as e:
+            logger.error(f"Listing source products failed: {e}")
+            self._publish(e)
+            return
+        self._publish(self._END)
+    
+    def _publish(self, page):
+        for name, pages in self._queues.items():
+            while True:
+                with self._lock:
+                    if name in self._released:
+                        break
+                try:
+                    pages.put(page, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+
+class SourceSnapshot:
+    """
+    Source store data shared by every target of a sync
+    
+    Products are streamed through a ProductFeed per wave of targets rather
+    than held in memory. With spool, the first complete listing is also
+    written to a temporary file and later waves replay it, so the source is
+    paginated once however many waves there are. With since (the lowest
+    product watermark among the targets) only products modified after it
+    are listed; each target then filters the listing down to its own
+    watermark.
+    """
+    
+    def __init__(self, api, since: Optional[str] = None, spool: bool = False):
+        self.api = api
+        self.since = since
+        self.spool = spool
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, ProductFeed] = {}
+        self._feed: Optional[ProductFeed] = None
+        self._spooled = None  # temporary file of a complete listing, one page per line
+        self._categories: Optional[List[Dict[str, Any]]] = None
+        self._skus: Optional[List[str]] = None
+    
+    def subscribe(self, subscribers: List[str], depth: int = 4):
+        """Start a product listing shared by these subscribers"""
+        with self._lock:
+            previous = self._feed
+        if previous is not None:
+            # Its listing may still be filling the spool
+            previous.wait()
+        feed = ProductFeed(self._pages, subscribers, self.since, depth)
+        with self._lock:
+            self._feed = feed
+            for name in subscribers:
+                self._feeds[name] = feed
+    
+    def _pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """Replay the spooled listing, or list the source (spooling it)"""
+        if self._spooled is not None:
+            self._spooled.seek(0)
+            for line in self._spooled:
+                yield json.loads(line)
+            return
+        
+        params = None
+        if self.since:
+            params = {"modified_after": _modified_after(self.since), "dates_are_gmt": "true"}
+        spool = tempfile.TemporaryFile("w+", encoding="utf-8") if self.spool else None
+        try:
+            for page in iter_pages(self.api, "products", params):
+                if spool is not None:
+                    spool.write(json.dumps(page, default=str) + "\n")
+                yield page
+        except BaseException:
+            if spool is not None:
+                spool.close()
+            raise
+        self._spooled = spool
+    
+    def close(self):
+        """Remove the spooled listing"""
+        if self._spooled is not None:
+            self._spooled.close()
+            self._spooled = None
+    
+    def products(self, subscriber: str, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            feed = self._feeds[subscriber]
+        return feed.products(subscriber, since)
+    
+    def release(self, subscriber: str):
+        with self._lock:
+            feed = self._feeds.pop(subscriber, None)
+        if feed is not None:
+            feed.release(subscriber)
+    
+    def skus(self) -> List[str]:
+        """Every source SKU, from an id/sku projection (cheap next to full records)"""
+        with self._lock:
+            if self._skus is None:
+                items = iter_items(self.api, "products", fields=["id", "sku"])
+                self._skus = [item["sku"] for item in items if item.get("sku")]
+            return self._skus
+    
+    def categories(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._categories is None:
+                self._categories = list(iter_items(self.api, "products/categories"))
+            return self._categories
+
+
 class MultiStoreManager:
     """Manage multiple WooCommerce store connections and operations"""
     
@@ -64,12 +276,16 @@ class MultiStoreManager:
         self.sync_history = []
         self.sync_conflicts = []
         self.active_syncs = {}
+        self.journal = SyncJournal()
+        self.sync_state = SyncStateStore()
+        # sync_id -> (store, endpoint, key) -> ResourceIndex, per running sync
+        self._target_indexes: Dict[str, Dict[tuple, ResourceIndex]] = {}
     
     def sync_stores(self, stores: Dict[str, Any], source_store: str, 
                    target_stores: List[str], sync_config: Dict[str, Any]) -> Dict[str, Any]:
         """Synchronize data between stores"""
         
-        sync_id = f"sync_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        sync_id = f"sync_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
         config = SyncConfig(**sync_config)
         
         # Validate stores
@@ -80,8 +296,57 @@ class MultiStoreManager:
             if target not in stores:
                 return {"error": f"Target store {target} not found"}
         
+        # Journal the run before touching any store so it can be resumed
+        self.journal.start_run(sync_id, "multi_store", {
+            "source": source_store,
+            "targets": target_stores,
+            "config": sync_config
+        }, self._sync_steps(target_stores, config))
+        
+        return self._run_sync(stores, sync_id, source_store, target_stores, config)
+    
+    def resume_sync(self, stores: Dict[str, Any], sync_id: str) -> Dict[str, Any]:
+        """Continue an interrupted sync from its last committed chunk"""
+        
+        run = self.journal.get_run(sync_id)
+        if not run or run["kind"] != "multi_store":
+            return {"error": f"Sync {sync_id} not found"}
+        if run["status"] == RUN_COMPLETED:
+            return {"sync_id": sync_id, "status": "completed", "message": "Nothing to resume"}
+        if sync_id in self.active_syncs and self.active_syncs[sync_id]["status"] == "running":
+            return {"error": f"Sync {sync_id} is still running"}
+        
+        params = run["params"]
+        for store_id in [params["source"], *params["targets"]]:
+            if store_id not in stores:
+                return {"error": f"Store {store_id} not found"}
+        
+        self.journal.reopen_run(sync_id)
+        return self._run_sync(
+            stores, sync_id, params["source"], params["targets"],
+            SyncConfig(**params["config"]), resuming=True
+        )
+    
+    def _sync_steps(self, target_stores: List[str], config: SyncConfig) -> List[str]:
+        """Ordered journal steps of a sync"""
+        steps = []
+        for target_store in target_stores:
+            if config.products:
+                steps.append(f"{target_store}:products")
+            if config.categories:
+                steps.append(f"{target_store}:categories")
+            if config.translations:
+                steps.append(f"{target_store}:translations")
+        return steps
+    
+    def _run_sync(self, stores: Dict[str, Any], sync_id: str, source_store: str,
+                  target_stores: List[str], config: SyncConfig,
+                  resuming: bool = False) -> Dict[str, Any]:
+        """Run (or resume) a journaled sync and track it"""
+        
         # Initialize sync operation
         self.active_syncs[sync_id] = {
+            "sync_id": sync_id,
             "source": source_store,
             "targets": target_stores,
             "config": config,
@@ -90,11 +355,25 @@ class MultiStoreManager:
             "progress": {}
         }
         
+        self._target_indexes[sync_id] = {}
         try:
-            results = self._perform_sync(stores, source_store, target_stores, config)
+            results = self._perform_sync(
+                stores, sync_id, source_store, target_stores, config, resuming
+            )
+            
+            # Failed chunks and targets stay open for resume_sync
+            failures = [f"{error['target']}: {error['error']}" for error in results["errors"]]
+            open_chunks = self.journal.progress(sync_id)["failed"]
+            if open_chunks:
+                failures.append(f"{open_chunks} chunks failed")
+            status = "failed" if failures else "completed"
+            self.journal.finish_run(
+                sync_id, RUN_FAILED if failures else RUN_COMPLETED,
+                error="; ".join(failures) or None
+            )
             
             # Update sync status
-            self.active_syncs[sync_id]["status"] = "completed"
+            self.active_syncs[sync_id]["status"] = status
             self.active_syncs[sync_id]["completed"] = datetime.now().isoformat()
             self.active_syncs[sync_id]["results"] = results
             
@@ -103,170 +382,455 @@ class MultiStoreManager:
             
             return {
                 "sync_id": sync_id,
-                "status": "completed",
+                "status": status,
+                "resumed": resuming,
                 "results": results
             }
-            
+        
         except Exception as e:
             logger.error(f"Sync operation failed: {e}")
+            self.journal.finish_run(sync_id, RUN_FAILED, error=str(e))
             self.active_syncs[sync_id]["status"] = "failed"
             self.active_syncs[sync_id]["error"] = str(e)
             
             return {
                 "sync_id": sync_id,
                 "status": "failed",
-                "error": str(e)
+                "error": str(e),
+                "resumable": True
             }
+        
+        finally:
+            self._release_indexes(sync_id, config)
     
-    def _perform_sync(self, stores: Dict[str, Any], source_store: str, 
-                     target_stores: List[str], config: SyncConfig) -> Dict[str, Any]:
-        """Perform the actual synchronization"""
+    def _perform_sync(self, stores: Dict[str, Any], sync_id: str, source_store: str, 
+                     target_stores: List[str], config: SyncConfig,
+                     resuming: bool = False) -> Dict[str, Any]:
+        """Perform the actual synchronization, all targets concurrently"""
         
+        # Listed once, on first use, for all targets - only what changed
+        # since the oldest target watermark when every target has one
         source_api = stores[source_store]['api']
+        since = None
+        if config.incremental and config.products:
+            watermarks = [
+                (self.sync_state.get_watermark(
+                    store_key(source_api), store_key(stores[target]['api']), "products"
+                ) or {}).get("watermark")
+                for target in target_stores
+            ]
+            if all(watermarks):
+                since = min(watermarks)
+        # Targets run in waves sharing one streamed product listing; a
+        # target queued behind a full pool could never drain its feed.
+        # Later waves replay the first wave's listing from a spool file
+        wave_size = max(1, config.max_parallel_targets)
+        source = SourceSnapshot(source_api, since, spool=len(target_stores) > wave_size)
         results = {
             "synced_items": {},
             "conflicts": [],
             "errors": []
         }
         
-        for target_store in target_stores:
-            target_api = stores[target_store]['api']
-            target_config = stores[target_store]['config']
-            
-            # Sync products
-            if config.products:
-                product_results = self._sync_products(
-                    source_api, target_api, target_config, config
-                )
-                results["synced_items"][f"{target_store}_products"] = product_results
-            
-            # Sync categories
-            if config.categories:
-                category_results = self._sync_categories(
-                    source_api, target_api, target_config, config
-                )
-                results["synced_items"][f"{target_store}_categories"] = category_results
-            
-            # Sync translations
-            if config.translations:
-                translation_results = self._sync_translations(
-                    source_api, target_api, target_config, config
-                )
-                results["synced_items"][f"{target_store}_translations"] = translation_results
-            
-            # Handle currency conversions
-            if config.currencies and config.currency_conversion:
-                currency_results = self._apply_currency_conversions(
-                    target_api, target_config, config
-                )
-                results["synced_items"][f"{target_store}_currencies"] = currency_results
+        try:
+            for start in range(0, len(target_stores), wave_size):
+                wave = target_stores[start:start + wave_size]
+                if config.products:
+                    source.subscribe([
+                        target_store for target_store in wave
+                        if not (self.journal.step_info(sync_id, f"{target_store}:products")
+                                or {}).get("complete")
+                    ], config.pipeline_depth)
+                
+                with ThreadPoolExecutor(max_workers=len(wave),
+                                        thread_name_prefix=f"{sync_id}-target") as pool:
+                    futures = {
+                        pool.submit(
+                            self._sync_target, stores, sync_id, source, target_store, config, resuming
+                        ): target_store
+                        for target_store in wave
+                    }
+                    for future in as_completed(futures):
+                        target_store = futures[future]
+                        try:
+                            synced_items = future.result()
+                        except Exception as e:
+                            # One failing target does not stop the others; its
+                            # uncommitted chunks stay open for resume_sync
+                            logger.error(f"Sync to {target_store} failed: {e}")
+                            results["errors"].append({"target": target_store, "error": str(e)})
+                            continue
+                        
+                        results["synced_items"].update(synced_items)
+                        for conflict in synced_items.get(f"{target_store}_products", {}).get("conflicts", []):
+                            results["conflicts"].append({"target_store": target_store, **conflict})
+                        self.active_syncs[sync_id]["progress"] = self.journal.progress(sync_id)
+        finally:
+            source.close()
         
         return results
     
-    def _sync_products(self, source_api, target_api, target_config, config) -> Dict[str, Any]:
-        """Synchronize products between stores"""
+    def _sync_target(self, stores: Dict[str, Any], sync_id: str, source: SourceSnapshot,
+                     target_store: str, config: SyncConfig, resuming: bool) -> Dict[str, Any]:
+        """Run one target's steps in order"""
         
-        synced = 0
-        failed = 0
-        conflicts = []
+        target_api = stores[target_store]['api']
+        target_config = stores[target_store]['config']
+        synced_items = {}
         
-        try:
-            # Get all products from source
-            page = 1
-            while True:
-                response = source_api.get("products", params={"page": page, "per_page": 100})
-                if response.status_code != 200:
-                    break
-                
-                products = response.json()
-                if not products:
-                    break
-                
-                for product in products:
-                    try:
-                        # Apply transformations
-                        transformed = self._transform_product(product, target_config, config)
-                        
-                        # Check if product exists in target
-                        existing = self._find_product_by_sku(target_api, product.get('sku'))
-                        
-                        if existing:
-                            # Handle conflict resolution
-                            if config.conflict_resolution == "source-wins":
-                                response = target_api.put(f"products/{existing['id']}", transformed)
-                                if response.status_code in [200, 201]:
-                                    synced += 1
-                                else:
-                                    failed += 1
-                            elif config.conflict_resolution == "manual":
-                                conflicts.append({
-                                    "sku": product.get('sku'),
-                                    "source": product,
-                                    "target": existing
-                                })
-                        else:
-                            # Create new product
-                            response = target_api.post("products", transformed)
-                            if response.status_code in [200, 201]:
-                                synced += 1
-                            else:
-                                failed += 1
-                    
-                    except Exception as e:
-                        logger.error(f"Failed to sync product {product.get('id')}: {e}")
-                        failed += 1
-                
-                page += 1
+        # Sync products
+        if config.products:
+            try:
+                synced_items[f"{target_store}_products"] = self._sync_products(
+                    source, target_store, target_api, target_config, config,
+                    sync_id, f"{target_store}:products", resuming
+                )
+            finally:
+                source.release(target_store)
+        
+        # Sync categories
+        if config.categories:
+            synced_items[f"{target_store}_categories"] = self._sync_categories(
+                source, target_api, target_config, config,
+                sync_id, f"{target_store}:categories", resuming
+            )
+        
+        # Sync translations
+        if config.translations:
+            synced_items[f"{target_store}_translations"] = self._sync_translations(
+                source, target_api, target_config, config
+            )
+        
+        # Currency conversions are applied to source prices as products are pushed
+        if config.currencies and config.currency_conversion:
+            synced_items[f"{target_store}_currencies"] = self._currency_summary(
+                target_config, config, synced_items.get(f"{target_store}_products")
+            )
+        
+        return synced_items
+    
+    def _run_step(self, sync_id: str, step: str, target_api, endpoint: str,
+                  planner, config: SyncConfig, resuming: bool,
+                  key: str = None, streaming: bool = False) -> Dict[str, Any]:
+        """
+        Plan a journaled step once, then send its open chunks
+        
+        The planner returns (creates, updates, deletes, info) and only runs
+        when the step has no journal record; a resumed step reuses the recorded plan.
+        A streaming planner returns ((action, payload) iterator, info) instead,
+        and its chunks are sent while it is still producing; a stream cut
+        short is resumed by sending its open chunks and streaming again,
+        skipping writes (by key) its committed chunks already applied.
+        With a key (sku/slug), the target's index for it is kept current from
+        each committed chunk, and on resume creates whose key now exists on
+        the target are sent as updates, since their chunk may have been
+        applied before the interruption.
+        """
+        planned = self.journal.step_info(sync_id, step)
+        if planned is None and not streaming:
+            creates, updates, deletes, info = planner()
+            self.journal.plan(
+                sync_id, step, endpoint,
+                create=creates, update=updates, delete=deletes, info=info
+            )
+        
+        existing = None
+        on_commit = None
+        if key:
+            if resuming and any(
+                    chunk["body"].get("create") for chunk in self.journal.open_chunks(sync_id, step)):
+                index = self._target_index(sync_id, target_api, endpoint, key, config)
+                existing = lambda payload: index.id_for(payload.get(key))
+            on_commit = lambda body, result: self._record_written(
+                sync_id, target_api, endpoint, key, result
+            )
+        
+        if streaming and not (planned or {}).get("complete"):
+            if planned is not None:
+                self.journal.execute(
+                    target_api, sync_id, step, max_workers=config.target_concurrency,
+                    existing=existing, on_commit=on_commit
+                )
+            items, info = planner()
+            if planned is not None and key:
+                items = self._unsent(items, self.journal.committed_payloads(sync_id, step, key), key)
+            return self.journal.stream(
+                target_api, sync_id, step, endpoint, items, info=info,
+                max_workers=config.target_concurrency, on_commit=on_commit
+            )
+        
+        return self.journal.execute(
+            target_api, sync_id, step, max_workers=config.target_concurrency,
+            existing=existing, on_commit=on_commit
+        )
+    
+    @staticmethod
+    def _unsent(items: Iterable[Tuple[str, Any]], committed: Dict[Any, Dict[str, Any]],
+                key: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Writes of a resumed stream that were not committed before
+        
+        A create or update is dropped when the interrupted run committed the
+        same payload for its key; one whose payload changed since (the
+        source was edited meanwhile) is still sent.
+        """
+        def digest(payload: Dict[str, Any]) -> str:
+            return payload_hash({field: value for field, value in payload.items() if field != "id"})
+        
+        for action, payload in items:
+            if action != "delete" and isinstance(payload, dict):
+                done = committed.get(payload.get(key))
+                if done is not None and digest(done) == digest(payload):
+                    continue
+            yield action, payload
+    
+    def _target_index(self, sync_id: str, target_api, endpoint: str, key: str,
+                      config: SyncConfig) -> ResourceIndex:
+        """
+        Index of a target collection by key, built once per sync
+        
+        With persist_indexes, the index saved by the previous run is
+        refreshed (only records modified since) instead of listing the whole
+        collection, unless it is older than INDEX_REBUILD_INTERVAL or has no
+        date_modified_gmt watermark (categories).
+        """
+        indexes = self._target_indexes.setdefault(sync_id, {})
+        cache_key = (store_key(target_api), endpoint, key)
+        index = indexes.get(cache_key)
+        if index is not None:
+            return index
+        
+        if config.persist_indexes:
+            index = self.sync_state.load_index(store_key(target_api), endpoint, key)
+            if (index is not None and index.watermark and index.built_at
+                    and datetime.now() - index.built_at < INDEX_REBUILD_INTERVAL):
+                index.refresh(target_api)
+            else:
+                index = None
+        
+        if index is None:
+            fields = SKU_INDEX_FIELDS if key == "sku" else ("id", key)
+            index = ResourceIndex.build(target_api, endpoint, key=key, fields=fields)
+        
+        indexes[cache_key] = index
+        return index
+    
+    def _record_written(self, sync_id: str, target_api, endpoint: str, key: str, result):
+        """Apply a committed chunk's responses to the target's index, if built"""
+        index = self._target_indexes.get(sync_id, {}).get((store_key(target_api), endpoint, key))
+        if index is None:
+            return
+        for action, items in result.responses.items():
+            for item in items.values():
+                if action == "delete":
+                    index.discard(item.get(key))
+                else:
+                    index.record(item)
+    
+    def _release_indexes(self, sync_id: str, config: SyncConfig):
+        """Drop a finished sync's indexes, saving them first with persist_indexes"""
+        indexes = self._target_indexes.pop(sync_id, {})
+        if not config.persist_indexes:
+            return
+        for (store, endpoint, key), index in indexes.items():
+            try:
+                self.sync_state.save_index(store, index)
+            except Exception as e:
+                logger.warning(f"Could not save {endpoint} index of {store}: {e}")
+    
+    def _sync_products(self, source: SourceSnapshot, target_store: str, target_api,
+                       target_config, config, sync_id: str, step: str,
+                       resuming: bool = False) -> Dict[str, Any]:
+        """
+        Synchronize products between stores
+        
+        Source pages, transformation and target batch writes run as a
+        pipeline: the source listing is streamed through a bounded queue,
+        each product is transformed and matched against the target's SKU
+        index as it arrives, and full chunks are queued to the batch writers
+        while later pages are still being read.
+        
+        Incremental syncs only push products modified since the target's
+        watermark, which advances once the step completes without failures.
+        Products deleted from the source are found by diffing the source SKU
+        set against the previous scan every deletion_scan_hours (and on
+        every full sync). The scan is recorded once the step's chunks are
+        committed, and removed SKUs still on the target stay in it, so a
+        removal is reported (and its delete retried) until it is applied.
+        """
+        source_id, target_id = store_key(source.api), store_key(target_api)
+        scan: Dict[str, Any] = {}
+        
+        def plan():
+            index = self._target_index(sync_id, target_api, "products", "sku", config)
+            state = self.sync_state.get_watermark(source_id, target_id, "products") or {}
+            since = state.get("watermark") if config.incremental else None
+            info = {
+                "conflicts": [],
+                "incremental": since is not None,
+                "since": since,
+                "watermark": since,
+                "removed_in_source": [],
+                "unsynced": []
+            }
+            return self._product_writes(
+                source, target_store, target_api, target_config, config, index, state, info, scan
+            ), info
         
-        except Exception as e:
-            logger.error(f"Product sync failed: {e}")
+        step_result = self._run_step(
+            sync_id, step, target_api, "products", plan, config, resuming,
+            key="sku", streaming=True
+        )
+        info = step_result["info"]
+        
+        if info.get("watermark") and not step_result["failed"] and not step_result["open_chunks"]:
+            self.sync_state.set_watermark(source_id, target_id, "products", info["watermark"])
+        
+        if scan and not step_result["open_chunks"]:
+            # The index follows committed deletes; what it still holds was not removed
+            index = self._target_index(sync_id, target_api, "products", "sku", config)
+            pending = [sku for sku in scan["removed"] if sku in index]
+            self.sync_state.record_scan(source_id, target_id, "products", scan["skus"] + pending)
         
         return {
-            "synced": synced,
-            "failed": failed,
-            "conflicts": conflicts
+            "synced": step_result["created"] + step_result["updated"],
+            "deleted": step_result["deleted"],
+            "failed": step_result["failed"] + len(info.get("unsynced", [])),
+            "unsynced": info.get("unsynced", []),
+            "incremental": info.get("incremental", False),
+            "since": info.get("since"),
+            "removed_in_source": info.get("removed_in_source", []),
+            "conflicts": info.get("conflicts", [])
         }
     
-    def _sync_categories(self, source_api, target_api, target_config, config) -> Dict[str, Any]:
+    def _product_writes(self, source: SourceSnapshot, target_store: str, target_api,
+                        target_config, config, index: ResourceIndex,
+                        state: Dict[str, Any], info: Dict[str, Any],
+                        scan: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        Transform stage of the product pipeline, filling info as it goes
+        
+        Products that are not pushed - failed transforms and unresolved
+        manual conflicts - are listed in info["unsynced"] and hold the
+        watermark at the oldest of them, so the next incremental run lists
+        them again. A deletion scan leaves the source SKUs and the removed
+        ones in scan for the caller to record once they are written.
+        """
+        since = info["since"]
+        conflicts = info["conflicts"]
+        skus = []
+        held = []  # date_modified_gmt of products that were not pushed
+        
+        def hold(product: Dict[str, Any], reason: str):
+            info["unsynced"].append({"sku": product.get('sku'), "reason": reason})
+            held.append(product.get(WATERMARK_FIELD))
+        
+        for product in source.products(target_store, since):
+            if since is None and product.get('sku'):
+                skus.append(product['sku'])
+            modified = product.get(WATERMARK_FIELD)
+            if modified and (info["watermark"] is None or modified > info["watermark"]):
+                info["watermark"] = modified
+            
+            try:
+                # Apply transformations
+                transformed = self._transform_product(product, target_config, config)
+                transformed.pop('id', None)
+                transformed.pop('_links', None)
+                
+                # Check if product exists in target
+                existing = index.get(product.get('sku'))
+                
+                if existing:
+                    # Handle conflict resolution
+                    if config.conflict_resolution == "source-wins":
+                        yield "update", {**transformed, 'id': existing['id']}
+                    elif config.conflict_resolution == "manual":
+                        conflicts.append({
+                            "sku": product.get('sku'),
+                            "source": product,
+                            "target": existing
+                        })
+                        hold(product, "conflict")
+                else:
+                    # Create new product
+                    yield "create", transformed
+            
+            except Exception as e:
+                logger.error(f"Failed to prepare product {product.get('id')}: {e}")
+                hold(product, str(e))
+        
+        if held:
+            # modified_after steps back from the watermark, so the oldest held
+            # product is listed again; one without a date keeps the old watermark
+            info["watermark"] = since if None in held else min(held)
+        
+        if conflicts:
+            # The index only holds ids - fetch the conflicting target products
+            targets = self._fetch_by_ids(
+                target_api, "products", [conflict["target"]["id"] for conflict in conflicts]
+            )
+            for conflict in conflicts:
+                conflict["target"] = targets.get(conflict["target"]["id"], conflict["target"])
+        
+        # Deletion scan - a full sync has just seen every SKU
+        scanned_at = state.get("scanned_at")
+        if since is None or scanned_at is None or (
+                datetime.now() - datetime.fromisoformat(scanned_at)
+                >= timedelta(hours=config.deletion_scan_hours)):
+            if since is not None:
+                skus = source.skus()
+            if state.get("keys") is not None:
+                info["removed_in_source"] = sorted(state["keys"].difference(skus))
+                if config.sync_deletions:
+                    for sku in info["removed_in_source"]:
+                        if sku in index:
+                            yield "delete", index.id_for(sku)
+            scan["skus"] = list(skus)
+            scan["removed"] = info["removed_in_source"]
+    
+    def _sync_categories(self, source: SourceSnapshot, target_api, target_config, config,
+                         sync_id: str, step: str, resuming: bool = False) -> Dict[str, Any]:
         """Synchronize categories between stores"""
         
-        synced = 0
-        failed = 0
-        
-        try:
-            response = source_api.get("products/categories", params={"per_page": 100})
-            if response.status_code == 200:
-                categories = response.json()
-                
-                for category in categories:
-                    try:
-                        # Apply translations if needed
-                        if config.translations and target_config.get('language') != 'en':
-                            category = self._translate_category(category, target_config['language'])
-                        
-                        # Check if category exists
-                        existing = self._find_category_by_slug(target_api, category.get('slug'))
-                        
-                        if existing:
-                            response = target_api.put(f"products/categories/{existing['id']}", category)
-                        else:
-                            response = target_api.post("products/categories", category)
-                        
-                        if response.status_code in [200, 201]:
-                            synced += 1
-                        else:
-                            failed += 1
+        def plan():
+            creates, updates = [], []
+            index = self._target_index(
+                sync_id, target_api, "products/categories", "slug", config
+            )
+            
+            for category in source.categories():
+                try:
+                    # Apply translations if needed
+                    if config.translations and target_config.get('language') != 'en':
+                        category = self._translate_category(category, target_config['language'])
+                    
+                    category = {k: v for k, v in category.items() if k not in ('id', '_links')}
+                    
+                    # Check if category exists
+                    existing = index.get(category.get('slug'))
                     
-                    except Exception as e:
-                        logger.error(f"Failed to sync category {category.get('id')}: {e}")
-                        failed += 1
+                    if existing:
+                        updates.append({**category, 'id': existing['id']})
+                    else:
+                        creates.append(category)
+                
+                except Exception as e:
+                    logger.error(f"Failed to prepare category {category.get('slug')}: {e}")
+            
+            return creates, updates, [], {}
         
-        except Exception as e:
-            logger.error(f"Category sync failed: {e}")
+        step_result = self._run_step(
+            sync_id, step, target_api, "products/categories", plan, config, resuming,
+            key="slug"
+        )
         
-        return {"synced": synced, "failed": failed}
+        return {
+            "synced": step_result["created"] + step_result["updated"],
+            "failed": step_result["failed"]
+        }
     
-    def _sync_translations(self, source_api, target_api, target_config, config) -> Dict[str, Any]:
+    def _sync_translations(self, source: SourceSnapshot, target_api, target_config, config) -> Dict[str, Any]:
         """Synchronize translations between stores"""
         
         if not config.translation_rules:
@@ -287,57 +851,29 @@ class MultiStoreManager:
         
         return {"status": "no_translation_needed", "language": target_language}
     
-    def _apply_currency_conversions(self, target_api, target_config, config) -> Dict[str, Any]:
-        """Apply currency conversions to product prices"""
+    def _currency_summary(self, target_config, config,
+                          products: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Report the currency conversion of a target
+        
+        _transform_product converts each pushed product from its source
+        price. Target prices are never converted in place - with incremental
+        syncs unchanged products are not re-pushed, so converting the stored
+        price again on every run would compound the rate.
+        """
         
         target_currency = target_config.get('currency', 'EUR')
         
         if target_currency not in config.currency_conversion:
             return {"status": "skipped", "reason": f"No conversion rate for {target_currency}"}
         
-        conversion_rate = config.currency_conversion[target_currency]
-        converted_count = 0
-        
-        try:
-            # Get all products and update prices
-            page = 1
-            while True:
-                response = target_api.get("products", params={"page": page, "per_page": 100})
-                if response.status_code != 200:
-                    break
-                
-                products = response.json()
-                if not products:
-                    break
-                
-                for product in products:
-                    try:
-                        # Convert prices
-                        if product.get('regular_price'):
-                            new_price = float(product['regular_price']) * conversion_rate
-                            product['regular_price'] = str(round(new_price, 2))
-                        
-                        if product.get('sale_price'):
-                            new_price = float(product['sale_price']) * conversion_rate
-                            product['sale_price'] = str(round(new_price, 2))
-                        
-                        # Update product
-                        response = target_api.put(f"products/{product['id']}", product)
-                        if response.status_code in [200, 201]:
-                            converted_count += 1
-                    
-                    except Exception as e:
-                        logger.error(f"Failed to convert currency for product {product.get('id')}: {e}")
-                
-                page += 1
-        
-        except Exception as e:
-            logger.error(f"Currency conversion failed: {e}")
+        if products is None:
+            return {"status": "skipped", "reason": "Prices are converted during product sync"}
         
         return {
-            "converted": converted_count,
+            "converted": products["synced"],
             "currency": target_currency,
-            "rate": conversion_rate
+            "rate": config.currency_conversion[target_currency]
         }
     
     def _transform_product(self, product: Dict[str, Any], target_config: Dict[str, Any], 
@@ -372,37 +908,15 @@ class MultiStoreManager:
         
         return transformed
     
-    def _find_product_by_sku(self, api, sku: str) -> Optional[Dict[str, Any]]:
-        """Find product by SKU"""
-        if not sku:
-            return None
-        
-        try:
-            response = api.get("products", params={"sku": sku})
-            if response.status_code == 200:
-                products = response.json()
-                if products and len(products) > 0:
-                    return products[0]
-        except Exception as e:
-            logger.error(f"Error finding product by SKU {sku}: {e}")
-        
-        return None
-    
-    def _find_category_by_slug(self, api, slug: str) -> Optional[Dict[str, Any]]:
-        """Find category by slug"""
-        if not slug:
-            return None
-        
-        try:
-            response = api.get("products/categories", params={"slug": slug})
-            if response.status_code == 200:
-                categories = response.json()
-                if categories and len(categories) > 0:
-                    return categories[0]
-        except Exception as e:
-            logger.error(f"Error finding category by slug {slug}: {e}")
-        
-        return None
+    def _fetch_by_ids(self, api, endpoint: str, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Full records for ids, 100 per request via include"""
+        records = {}
+        for start in range(0, len(ids), MAX_BATCH_SIZE):
+            chunk = ids[start:start + MAX_BATCH_SIZE]
+            params = {"include": ",".join(str(i) for i in chunk)}
+            for item in iter_items(api, endpoint, params):
+                records[item["id"]] = item
+        return records
     
     def _translate_category(self, category: Dict[str, Any], target_language: str) -> Dict[str, Any]:
         """Translate category (placeholder for actual translation logic)"""
@@ -413,17 +927,25 @@ class MultiStoreManager:
     def get_sync_status(self, store_id: str) -> Dict[str, Any]:
         """Get synchronization status for a store"""
         
-        # Find recent syncs involving this store
+        # Find recent syncs involving this store (journaled, so they survive restarts)
         recent_syncs = []
-        for sync in self.sync_history[-10:]:  # Last 10 syncs
-            if sync['source'] == store_id or store_id in sync.get('targets', []):
+        for run in self.journal.list_runs(kind="multi_store", limit=50):
+            params = run["params"]
+            if params['source'] == store_id or store_id in params.get('targets', []):
+                status = run["status"]
+                if status == "running" and run["sync_id"] not in self.active_syncs:
+                    # Running in the journal but not in this process: crashed mid-sync
+                    status = "interrupted"
                 recent_syncs.append({
-                    "sync_id": sync.get('sync_id'),
-                    "role": "source" if sync['source'] == store_id else "target",
-                    "status": sync.get('status'),
-                    "started": sync.get('started'),
-                    "completed": sync.get('completed')
+                    "sync_id": run["sync_id"],
+                    "role": "source" if params['source'] == store_id else "target",
+                    "status": status,
+                    "started": run["started"],
+                    "completed": run["completed"],
+                    "progress": run["progress"]
                 })
+            if len(recent_syncs) >= 10:  # Last 10 syncs
+                break
         
         # Find active syncs
         active = []
@@ -0,0 +1,257 @@
+"""
+Operation Store
+SQLite record of bulk operations and their backups, with retention
+"""
+
+import logging
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Any, Optional, Iterator
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPERATIONS_DB = os.getenv("WOOCOMMERCE_BULK_OPERATIONS_DB", "./bulk_operations.db")
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_MAX_OPERATIONS = 500
+
+# Operations a worker may still be writing; never pruned
+ACTIVE_STATUSES = ("queued", "running", "cancelling")
+
+# Error messages kept per operation; error_count has the full number
+MAX_STORED_ERRORS = 100
+
+OPERATION_COLUMNS = (
+    "operation_id", "operation", "store", "status", "phase", "started", "completed",
+    "total_items", "processed_items", "successful_items", "failed_items", "backup_id"
+)
+
+
+class OperationStore:
+    """
+    Bulk operations, their payloads and backups in one SQLite file
+    
+    Operation rows are small (status, counters, capped errors) and indexed
+    by start time for paging. The preview payload - target ids and
+    changes - is kept compressed in its own table and only read when an
+    operation runs or a caller asks for it. Backup rows point at the
+    snapshot files written by BulkOperationManager. prune() applies the
+    retention policy so the file stays bounded on a long-lived server.
+    """
+    
+    def __init__(self, path: str = DEFAULT_OPERATIONS_DB,
+                 retention_days: int = DEFAULT_RETENTION_DAYS,
+                 max_operations: int = DEFAULT_MAX_OPERATIONS):
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        self.max_operations = max_operations
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS operations (
+                    operation_id TEXT PRIMARY KEY,
+                    operation TEXT,
+                    store TEXT,
+                    status TEXT NOT NULL,
+                    phase TEXT,
+                    started TEXT NOT NULL,
+                    completed TEXT,
+                    total_items INTEGER NOT NULL DEFAULT 0,
+                    processed_items INTEGER NOT NULL DEFAULT 0,
+                    successful_items INTEGER NOT NULL DEFAULT 0,
+                    failed_items INTEGER NOT NULL DEFAULT 0,
+                    backup_id TEXT,
+                    errors TEXT,
+                    error_count INTEGER NOT NULL DEFAULT 0,
+                    progress TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS operations_started ON operations (started)")
+            conn.execute("CREATE INDEX IF NOT EXISTS operations_status ON operations (status, started)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS operation_payloads (
+                    operation_id TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS operation_backups (
+                    backup_id TEXT PRIMARY KEY,
+                    operation_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS operation_backups_operation ON operation_backups (operation_id)"
+            )
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    # Operations
+    
+    def save(self, operation: Dict[str, Any], progress: Dict[str, Any] = None):
+        """
+        Insert or update an operation row
+        
+        Args:
+            operation: OperationResult fields (preview_data is ignored, see save_payload)
+            progress: Final throughput figures, kept for finished operations
+        """
+        errors = operation.get("errors") or []
+        values = [operation.get(column) for column in OPERATION_COLUMNS]
+        values += [json.dumps(errors[:MAX_STORED_ERRORS]), len(errors),
+                   json.dumps(progress) if progress is not None else None]
+        
+        columns = OPERATION_COLUMNS + ("errors", "error_count", "progress")
+        updates = ", ".join(
+            f"{column} = excluded.{column}" for column in columns[1:] if column != "progress"
+        )
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO operations ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT (operation_id) DO UPDATE SET {updates}, "
+                "progress = COALESCE(excluded.progress, operations.progress)",
+                values
+            )
+    
+    @staticmethod
+    def _operation_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        operation = dict(row)
+        operation["errors"] = json.loads(operation["errors"] or "[]")
+        operation["progress"] = json.loads(operation["progress"]) if operation["progress"] else None
+        return operation
+    
+    def get(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM operations WHERE operation_id = ?", (operation_id,)
+            ).fetchone()
+        return self._operation_dict(row) if row else None
+    
+    def list(self, limit: int = 50, offset: int = 0, status: str = None) -> Dict[str, Any]:
+        """Page of operations, most recent first"""
+        where, args = "", []
+        if status:
+            where = " WHERE status = ?"
+            args.append(status)
+        with self._lock, self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM operations{where}", args).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM operations{where} ORDER BY started DESC LIMIT ? OFFSET ?",
+                args + [limit, offset]
+            ).fetchall()
+        return {
+            "operations": [self._operation_dict(row) for row in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset
+        }
+    
+    def mark_interrupted(self) -> int:
+        """Fail operations left active by a previous process; they can be resumed"""
+        now = datetime.now().isoformat()
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT operation_id, errors, error_count FROM operations "
+                f"WHERE status IN ({placeholders})", ACTIVE_STATUSES
+            ).fetchall()
+            for row in rows:
+                errors = json.loads(row["errors"] or "[]")[:MAX_STORED_ERRORS - 1]
+                errors.append("Interrupted by a server restart")
+                conn.execute(
+                    "UPDATE operations SET status = 'failed', phase = NULL, completed = ?, "
+                    "errors = ?, error_count = ? WHERE operation_id = ?",
+                    (now, json.dumps(errors), row["error_count"] + 1, row["operation_id"])
+                )
+        if rows:
+            logger.warning(f"Marked {len(rows)} interrupted bulk operations as failed")
+        return len(rows)
+    
+    # Payloads
+    
+    def save_payload(self, operation_id: str, payload: Dict[str, Any]):
+        data = zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO operation_payloads (operation_id, data) VALUES (?, ?)",
+                (operation_id, data)
+            )
+    
+    def load_payload(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM operation_payloads WHERE operation_id = ?", (operation_id,)
+            ).fetchone()
+        return json.loads(zlib.decompress(row["data"]).decode("utf-8")) if row else None
+    
+    # Backups
+    
+    def save_backup(self, backup: Dict[str, Any]):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO operation_backups (backup_id, operation_id, data, created) "
+                "VALUES (?, ?, ?, ?)",
+                (backup["backup_id"], backup["operation_id"], json.dumps(backup), backup["created"])
+            )
+    
+    def get_backup(self, backup_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM operation_backups WHERE backup_id = ?", (backup_id,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+    
+    # Retention
+    
+    def prune(self) -> Dict[str, List[str]]:
+        """
+        Drop finished operations older than the retention period or beyond
+        the newest max_operations, with their payloads and backups
+        
+        Returns:
+            Dict with the pruned operation ids and the backup snapshot paths
+            the caller should delete
+        """
+        cutoff = (datetime.now() - self.retention).isoformat()
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT operation_id FROM operations WHERE status NOT IN ({placeholders}) "
+                "AND (started < ? OR operation_id NOT IN "
+                "(SELECT operation_id FROM operations ORDER BY started DESC LIMIT ?))",
+                ACTIVE_STATUSES + (cutoff, self.max_operations)
+            ).fetchall()
+            operation_ids = [row["operation_id"] for row in rows]
+            
+            paths = []
+            for operation_id in operation_ids:
+                for backup in conn.execute(
+                    "SELECT data FROM operation_backups WHERE operation_id = ?", (operation_id,)
+                ).fetchall():
+                    paths.append(json.loads(backup["data"])["path"])
+                conn.execute("DELETE FROM operation_backups WHERE operation_id = ?", (operation_id,))
+                conn.execute("DELETE FROM operation_payloads WHERE operation_id = ?", (operation_id,))
+                conn.execute("DELETE FROM operations WHERE operation_id = ?", (operation_id,))
+        
+        if operation_ids:
+            logger.info(f"Pruned {len(operation_ids)} bulk operations")
+        return {"operations": operation_ids, "backup_paths": paths}
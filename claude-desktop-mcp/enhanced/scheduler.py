@@ -0,0 +1,313 @@
+"""
+Job Scheduler
+Single asyncio scheduler for recurring store syncs and maintenance jobs
+"""
+
+import logging
+import json
+import os
+import random
+import sqlite3
+import threading
+import asyncio
+from typing import Dict, List, Any, Optional, Callable, Iterator
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from shared.woocommerce_api.sync_state import DEFAULT_SYNC_STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+# SyncConfig.schedule values and their run intervals ("manual" is never scheduled).
+# "real-time" is polled; incremental syncs make a short interval cheap.
+SCHEDULE_INTERVALS = {
+    "real-time": timedelta(minutes=5),
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1)
+}
+
+# Runs are spread by up to this part of the interval, capped at MAX_JITTER
+JITTER_FRACTION = 0.1
+MAX_JITTER = timedelta(minutes=5)
+
+# Longest the loop sleeps without rechecking, so clock changes are noticed
+MAX_IDLE_SECONDS = 60
+
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+
+
+class JobScheduler:
+    """
+    Recurring jobs on one asyncio loop running in a daemon thread
+    
+    Jobs are persisted (kind, params, interval, next run, last outcome) so
+    their schedule survives restarts. A job's work is done by the runner
+    registered for its kind, on a small thread pool so blocking store
+    calls never stall the loop. Each run is offset by random jitter so jobs
+    of many stores do not fire together, and a job that is still running
+    when it comes due again is skipped rather than started twice.
+    """
+    
+    def __init__(self, path: str = DEFAULT_SYNC_STATE_PATH,
+                 max_concurrent_jobs: int = DEFAULT_MAX_CONCURRENT_JOBS):
+        self.path = path
+        self._lock = threading.Lock()
+        self._runners: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._running: Dict[str, datetime] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrent_jobs), thread_name_prefix="scheduled-job"
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scheduled_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    interval_seconds REAL NOT NULL,
+                    next_run TEXT NOT NULL,
+                    paused INTEGER NOT NULL DEFAULT 0,
+                    last_run TEXT,
+                    last_status TEXT,
+                    last_error TEXT,
+                    last_duration REAL,
+                    runs INTEGER NOT NULL DEFAULT 0,
+                    skipped INTEGER NOT NULL DEFAULT 0,
+                    created TEXT NOT NULL
+                )
+            """)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    # Jobs
+    
+    def register_runner(self, kind: str, runner: Callable[[Dict[str, Any]], Any]):
+        """
+        Set the function doing the work of a job kind
+        
+        The runner gets the job's params and runs on a worker thread. A
+        returned dict with an "error" key or status "failed" marks the run
+        failed.
+        """
+        self._runners[kind] = runner
+    
+    @staticmethod
+    def _jitter(interval: timedelta) -> timedelta:
+        limit = min(interval * JITTER_FRACTION, MAX_JITTER)
+        return timedelta(seconds=random.uniform(0, limit.total_seconds()))
+    
+    def add_job(self, job_id: str, kind: str, params: Dict[str, Any],
+                interval: timedelta) -> Dict[str, Any]:
+        """
+        Create or replace a job; its first run is one interval (plus jitter) away
+        
+        Args:
+            job_id: Stable id, e.g. one per store pair, so re-adding updates the job
+            kind: Runner kind, see register_runner
+            params: JSON-serializable arguments for the runner
+            interval: Time between runs
+        """
+        now = datetime.now()
+        next_run = now + interval + self._jitter(interval)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO scheduled_jobs "
+                "(job_id, kind, params, interval_seconds, next_run, created) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET kind = excluded.kind, "
+                "params = excluded.params, interval_seconds = excluded.interval_seconds, "
+                "next_run = excluded.next_run",
+                (job_id, kind, json.dumps(params, default=str), interval.total_seconds(),
+                 next_run.isoformat(), now.isoformat())
+            )
+        self._notify()
+        return self.get_job(job_id)
+    
+    def remove_job(self, job_id: str) -> bool:
+        with self._lock, self._connect() as conn:
+            removed = conn.execute(
+                "DELETE FROM scheduled_jobs WHERE job_id = ?", (job_id,)
+            ).rowcount
+        self._notify()
+        return bool(removed)
+    
+    def pause(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Stop scheduling a job (a run in progress finishes)"""
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE scheduled_jobs SET paused = 1 WHERE job_id = ?", (job_id,))
+        return self.get_job(job_id)
+    
+    def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Schedule a paused job again; if runs were missed it runs shortly"""
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        interval = timedelta(seconds=job["interval_seconds"])
+        now = datetime.now()
+        next_run = max(datetime.fromisoformat(job["next_run"]), now + self._jitter(interval))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE scheduled_jobs SET paused = 0, next_run = ? WHERE job_id = ?",
+                (next_run.isoformat(), job_id)
+            )
+        self._notify()
+        return self.get_job(job_id)
+    
+    def _job_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["paused"] = bool(job["paused"])
+        running_since = self._running.get(job["job_id"])
+        job["running"] = running_since is not None
+        job["running_since"] = running_since.isoformat() if running_since else None
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM scheduled_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return self._job_dict(row) if row else None
+    
+    def list_jobs(self, kind: str = None) -> List[Dict[str, Any]]:
+        """Jobs by next run time"""
+        query = "SELECT * FROM scheduled_jobs"
+        args: List[Any] = []
+        if kind:
+            query += " WHERE kind = ?"
+            args.append(kind)
+        query += " ORDER BY next_run"
+        with self._lock, self._connect() as conn:
+            return [self._job_dict(row) for row in conn.execute(query, args).fetchall()]
+    
+    # Loop
+    
+    def start(self) -> "JobScheduler":
+        """Run the scheduler loop in the background"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run_loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop scheduling; runs in progress are not interrupted"""
+        self._stopping = True
+        self._notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._executor.shutdown(wait=False)
+    
+    def _notify(self):
+        """Wake the loop so it picks up added, resumed or removed jobs"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass
+    
+    def _run_loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._main())
+        finally:
+            self._loop = None
+            loop.close()
+    
+    async def _main(self):
+        self._wakeup = asyncio.Event()
+        tasks = set()
+        
+        while not self._stopping:
+            now = datetime.now()
+            for job in self.list_jobs():
+                if job["paused"] or datetime.fromisoformat(job["next_run"]) > now:
+                    continue
+                task = self._dispatch(job, now)
+                if task is not None:
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._idle_seconds())
+            except asyncio.TimeoutError:
+                pass
+        
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _idle_seconds(self) -> float:
+        now = datetime.now()
+        upcoming = [
+            (datetime.fromisoformat(job["next_run"]) - now).total_seconds()
+            for job in self.list_jobs() if not job["paused"] and not job["running"]
+        ]
+        return max(0.0, min(upcoming + [MAX_IDLE_SECONDS]))
+    
+    def _dispatch(self, job: Dict[str, Any], now: datetime) -> Optional[asyncio.Task]:
+        """Reschedule a due job and start it unless its previous run is still going"""
+        job_id = job["job_id"]
+        interval = timedelta(seconds=job["interval_seconds"])
+        next_run = now + interval + self._jitter(interval)
+        
+        skip = job_id in self._running or job["kind"] not in self._runners
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE scheduled_jobs SET next_run = ?, skipped = skipped + ? WHERE job_id = ?",
+                (next_run.isoformat(), 1 if skip else 0, job_id)
+            )
+        if skip:
+            if job["kind"] not in self._runners:
+                logger.warning(f"No runner for scheduled job {job_id} ({job['kind']})")
+            else:
+                logger.info(f"Skipping scheduled job {job_id}: previous run still in progress")
+            return None
+        
+        self._running[job_id] = now
+        return asyncio.get_running_loop().create_task(self._execute(job))
+    
+    async def _execute(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        runner = self._runners[job["kind"]]
+        started = datetime.now()
+        status, error = "completed", None
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, runner, job["params"]
+            )
+            if isinstance(result, dict) and (result.get("error") or result.get("status") == "failed"):
+                status, error = "failed", str(result.get("error") or "")
+        except Exception as e:
+            logger.error(f"Scheduled job {job_id} failed: {e}")
+            status, error = "failed", str(e)
+        finally:
+            self._running.pop(job_id, None)
+        
+        duration = (datetime.now() - started).total_seconds()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE scheduled_jobs SET last_run = ?, last_status = ?, last_error = ?, "
+                "last_duration = ?, runs = runs + 1 WHERE job_id = ?",
+                (started.isoformat(), status, error, duration, job_id)
+            )
+        logger.info(f"Scheduled job {job_id} {status} in {duration:.1f}s")
@@ -13,6 +13,8 @@ import os
 import zipfile
 import tempfile
 
+from shared.woocommerce_api import iter_items, stream_items, ManagedAPI, BatchWriter, BatchResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -207,14 +209,14 @@ class StoreCloner:
         from woocommerce import API as WooCommerceAPI
         
         try:
-            target_api = WooCommerceAPI(
+            target_api = ManagedAPI(WooCommerceAPI(
                 url=target_api_config["url"],
                 consumer_key=target_api_config["consumer_key"],
                 consumer_secret=target_api_config["consumer_secret"],
                 wp_api=True,
                 version="wc/v3",
                 timeout=30
-            )
+            ))
             
             # Test connection
             response = target_api.get("system_status")
@@ -305,27 +307,13 @@ class StoreCloner:
     def _export_products(self, api) -> List[Dict[str, Any]]:
         """Export all products with full data"""
         products = []
-        page = 1
         
-        while True:
-            response = api.get("products", params={"page": page, "per_page": 100})
-            if response.status_code != 200:
-                break
-            
-            page_products = response.json()
-            if not page_products:
-                break
-            
-            for product in page_products:
-                # Get product variations if it's a variable product
-                if product.get("type") == "variable":
-                    variations_response = api.get(f"products/{product['id']}/variations")
-                    if variations_response.status_code == 200:
-                        product["variations"] = variations_response.json()
-                
-                products.append(product)
+        for product in iter_items(api, "products"):
+            # Get product variations if it's a variable product
+            if product.get("type") == "variable":
+                product["variations"] = list(iter_items(api, f"products/{product['id']}/variations"))
             
-            page += 1
+            products.append(product)
         
         return products
     
@@ -342,47 +330,21 @@ class StoreCloner:
     def _export_customers(self, api) -> List[Dict[str, Any]]:
         """Export customer data (with privacy considerations)"""
         customers = []
-        page = 1
         
-        while True:
-            response = api.get("customers", params={"page": page, "per_page": 100})
-            if response.status_code != 200:
-                break
-            
-            page_customers = response.json()
-            if not page_customers:
-                break
-            
+        # Decoded record by record so only the anonymized copies are kept
+        for customer in stream_items(api, "customers"):
             # Anonymize sensitive data
-            for customer in page_customers:
-                # Remove sensitive fields for privacy
-                sensitive_fields = ['password', 'last_order_id', 'orders_count']
-                for field in sensitive_fields:
-                    customer.pop(field, None)
+            sensitive_fields = ['password', 'last_order_id', 'orders_count']
+            for field in sensitive_fields:
+                customer.pop(field, None)
             
-            customers.extend(page_customers)
-            page += 1
+            customers.append(customer)
         
         return customers
     
     def _export_orders(self, api) -> List[Dict[str, Any]]:
         """Export order data"""
-        orders = []
-        page = 1
-        
-        while True:
-            response = api.get("orders", params={"page": page, "per_page": 100})
-            if response.status_code != 200:
-                break
-            
-            page_orders = response.json()
-            if not page_orders:
-                break
-            
-            orders.extend(page_orders)
-            page += 1
-        
-        return orders
+        return list(stream_items(api, "orders"))
     
     def _export_settings(self, api) -> Dict[str, Any]:
         """Export store settings"""
@@ -533,70 +495,50 @@ class StoreCloner:
         
         return transformed
     
+    def _batch_errors(self, label: str, result: BatchResult) -> List[str]:
+        """Format batch item errors as import error messages"""
+        errors = []
+        for error in result.errors:
+            key = error.get("sku") or error.get("slug") or error.get("email") or error.get("id")
+            target = f" {key}" if key else ""
+            errors.append(f"{label}{target} import failed: {error['message']}")
+        return errors
+    
     def _import_categories(self, api, categories: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Import categories to target store"""
-        success = 0
-        errors = []
-        
-        for category in categories:
-            try:
-                response = api.post("products/categories", category)
-                if response.status_code in [200, 201]:
-                    success += 1
-                else:
-                    errors.append(f"Category import failed: {response.text}")
-            except Exception as e:
-                errors.append(f"Category import error: {str(e)}")
-        
-        return {"success": success, "errors": errors}
+        result = BatchWriter(api, "products/categories").write(create=categories)
+        return {"success": result.count("create"), "errors": self._batch_errors("Category", result)}
     
     def _import_products(self, api, products: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Import products to target store"""
-        success = 0
-        errors = []
-        
-        for product in products:
-            try:
-                # Handle variations separately
-                variations = product.pop("variations", None)
-                
-                response = api.post("products", product)
-                if response.status_code in [200, 201]:
-                    product_data = response.json()
-                    success += 1
-                    
-                    # Import variations if any
-                    if variations and product_data.get("id"):
-                        for variation in variations:
-                            variation.pop("id", None)  # Remove original ID
-                            var_response = api.post(
-                                f"products/{product_data['id']}/variations", 
-                                variation
-                            )
-                            # Don't count variations in main success count
-                else:
-                    errors.append(f"Product import failed: {response.text}")
-            except Exception as e:
-                errors.append(f"Product import error: {str(e)}")
+        # Handle variations separately, keyed by the product's position
+        variations_by_index = {
+            index: product.pop("variations", None)
+            for index, product in enumerate(products)
+        }
         
-        return {"success": success, "errors": errors}
+        result = BatchWriter(api, "products").write(create=products)
+        errors = self._batch_errors("Product", result)
+        
+        # Import variations for every created product
+        for index, product_data in result.responses["create"].items():
+            variations = variations_by_index.get(index)
+            if not variations or not product_data.get("id"):
+                continue
+            for variation in variations:
+                variation.pop("id", None)  # Remove original ID
+            # Don't count variations in main success count
+            variation_result = BatchWriter(
+                api, f"products/{product_data['id']}/variations"
+            ).write(create=variations)
+            errors.extend(self._batch_errors("Variation", variation_result))
+        
+        return {"success": result.count("create"), "errors": errors}
     
     def _import_customers(self, api, customers: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Import customers to target store"""
-        success = 0
-        errors = []
-        
-        for customer in customers:
-            try:
-                response = api.post("customers", customer)
-                if response.status_code in [200, 201]:
-                    success += 1
-                else:
-                    errors.append(f"Customer import failed: {response.text}")
-            except Exception as e:
-                errors.append(f"Customer import error: {str(e)}")
-        
-        return {"success": success, "errors": errors}
+        result = BatchWriter(api, "customers").write(create=customers)
+        return {"success": result.count("create"), "errors": self._batch_errors("Customer", result)}
     
     def _import_settings(self, api, settings: Dict[str, Any]) -> Dict[str, Any]:
         """Import settings to target store"""
@@ -607,19 +549,16 @@ class StoreCloner:
             if group_name == "groups":
                 continue  # Skip the groups overview
             
-            try:
-                for setting in group_settings:
-                    if "value" in setting:
-                        response = api.put(
-                            f"settings/{group_name}/{setting['id']}", 
-                            {"value": setting["value"]}
-                        )
-                        if response.status_code in [200, 201]:
-                            success += 1
-                        else:
-                            errors.append(f"Setting {setting['id']} update failed")
-            except Exception as e:
-                errors.append(f"Settings import error for {group_name}: {str(e)}")
+            updates = [
+                {"id": setting["id"], "value": setting["value"]}
+                for setting in group_settings if "value" in setting
+            ]
+            result = BatchWriter(api, f"settings/{group_name}").write(update=updates)
+            success += result.count("update")
+            errors.extend(
+                f"Setting {error.get('id')} update failed: {error['message']}"
+                for error in result.errors
+            )
         
         return {"success": success, "errors": errors}
     
@@ -7,6 +7,8 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
+from shared.woocommerce_api import iter_items
+
 logger = logging.getLogger(__name__)
 
 
@@ -323,33 +325,17 @@ def get_customer_analytics(api_client, filters: Dict[str, Any] = None) -> Dict[s
     
     try:
         # Get all customers with pagination
-        all_customers = []
-        page = 1
-        
-        while True:
-            params = {"page": page, "per_page": 100}
-            if filters:
-                if "role" in filters:
-                    params["role"] = filters["role"]
-                if "registered_after" in filters:
-                    params["after"] = filters["registered_after"]
-                if "registered_before" in filters:
-                    params["before"] = filters["registered_before"]
-            
-            response = api_client.get("customers", params=params)
-            if response.status_code != 200:
-                break
-            
-            customers = response.json()
-            if not customers:
-                break
-            
-            all_customers.extend(customers)
-            page += 1
-            
-            # Safety limit
-            if len(all_customers) >= 10000:
-                break
+        params = {}
+        if filters:
+            if "role" in filters:
+                params["role"] = filters["role"]
+            if "registered_after" in filters:
+                params["after"] = filters["registered_after"]
+            if "registered_before" in filters:
+                params["before"] = filters["registered_before"]
+        
+        # Pages fetched concurrently, safety limit 10000
+        all_customers = list(iter_items(api_client, "customers", params, max_items=10000))
         
         if not all_customers:
             return {"error": "No customers found"}
@@ -490,25 +476,7 @@ def create_customer_segment(api_client, segment_name: str, criteria: Dict[str, A
     
     try:
         # Get all customers and apply criteria
-        params = {"per_page": 100}
-        all_customers = []
-        page = 1
-        
-        while True:
-            params["page"] = page
-            response = api_client.get("customers", params=params)
-            if response.status_code != 200:
-                break
-            
-            customers = response.json()
-            if not customers:
-                break
-            
-            all_customers.extend(customers)
-            page += 1
-            
-            if len(all_customers) >= 5000:  # Limit for performance
-                break
+        all_customers = list(iter_items(api_client, "customers", max_items=5000))  # Limit for performance
         
         # Apply segment criteria
         segment_customers = []
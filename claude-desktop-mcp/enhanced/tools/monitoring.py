@@ -4,9 +4,7 @@ from typing import Dict, List, Any, Optional
 import json
 import logging
 import os
-import schedule
 import time
-from threading import Thread
 
 class PerformanceMonitor:
     def __init__(self):
@@ -529,65 +527,82 @@ def run_store_health_check(api_client) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
 
-def setup_monitoring_schedule(api_client, schedule_config: Dict[str, Any]) -> Dict[str, Any]:
-    """Setup automated monitoring schedule."""
+def run_monitoring(api_client) -> Dict[str, Any]:
+    """Scheduled monitoring task."""
+    try:
+        monitor = PerformanceMonitor()
+        metrics = monitor.collect_metrics(api_client)
+        
+        # Log metrics
+        logging.info(f"Store metrics: {metrics}")
+        
+        # Check for critical alerts
+        critical_alerts = [alert for alert in monitor.alerts if alert.get("severity") == "critical"]
+        if critical_alerts:
+            logging.critical(f"Critical alerts: {critical_alerts}")
+        
+        return {"success": True, "alerts": len(monitor.alerts)}
+        
+    except Exception as e:
+        logging.error(f"Monitoring task failed: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+def run_backup(api_client) -> Dict[str, Any]:
+    """Scheduled backup task."""
+    try:
+        backup_manager = BackupManager()
+        result = backup_manager.create_backup(api_client, "incremental")
+        logging.info(f"Scheduled backup completed: {result}")
+        return result
+        
+    except Exception as e:
+        logging.error(f"Backup task failed: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+def run_health_check(api_client) -> Dict[str, Any]:
+    """Scheduled health check task."""
+    try:
+        health_checker = HealthChecker()
+        health = health_checker.run_health_check(api_client)
+        
+        if health["overall_status"] != "healthy":
+            logging.warning(f"Store health issue: {health}")
+        
+        return {"success": True, "overall_status": health["overall_status"]}
+        
+    except Exception as e:
+        logging.error(f"Health check failed: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+# Scheduler job kinds and the task each one runs
+MONITORING_TASKS = {
+    "monitoring": run_monitoring,
+    "backup": run_backup,
+    "health_check": run_health_check
+}
+
+def setup_monitoring_schedule(scheduler, store_id: str, schedule_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Setup automated monitoring schedule on the server's job scheduler.
+    
+    Jobs are keyed by store, so calling this again updates the intervals
+    instead of starting another set of jobs. The scheduler must have a
+    runner for each MONITORING_TASKS kind.
+    """
     try:
         monitoring_interval = schedule_config.get("monitoring_interval_minutes", 30)
         backup_interval = schedule_config.get("backup_interval_hours", 24)
         health_check_interval = schedule_config.get("health_check_interval_minutes", 15)
         
-        def run_monitoring():
-            """Background monitoring task."""
-            try:
-                monitor = PerformanceMonitor()
-                metrics = monitor.collect_metrics(api_client)
-                
-                # Log metrics
-                logging.info(f"Store metrics: {metrics}")
-                
-                # Check for critical alerts
-                critical_alerts = [alert for alert in monitor.alerts if alert.get("severity") == "critical"]
-                if critical_alerts:
-                    logging.critical(f"Critical alerts: {critical_alerts}")
-                
-            except Exception as e:
-                logging.error(f"Monitoring task failed: {str(e)}")
-        
-        def run_backup():
-            """Background backup task."""
-            try:
-                backup_manager = BackupManager()
-                result = backup_manager.create_backup(api_client, "incremental")
-                logging.info(f"Scheduled backup completed: {result}")
-                
-            except Exception as e:
-                logging.error(f"Backup task failed: {str(e)}")
-        
-        def run_health_check():
-            """Background health check task."""
-            try:
-                health_checker = HealthChecker()
-                health = health_checker.run_health_check(api_client)
-                
-                if health["overall_status"] != "healthy":
-                    logging.warning(f"Store health issue: {health}")
-                
-            except Exception as e:
-                logging.error(f"Health check failed: {str(e)}")
-        
         # Schedule tasks
-        schedule.every(monitoring_interval).minutes.do(run_monitoring)
-        schedule.every(backup_interval).hours.do(run_backup)
-        schedule.every(health_check_interval).minutes.do(run_health_check)
-        
-        # Start scheduler in background thread
-        def run_scheduler():
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        
-        scheduler_thread = Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
+        intervals = {
+            "monitoring": timedelta(minutes=monitoring_interval),
+            "backup": timedelta(hours=backup_interval),
+            "health_check": timedelta(minutes=health_check_interval)
+        }
+        jobs = [
+            scheduler.add_job(f"{kind}:{store_id}", kind, {"store_id": store_id}, interval)
+            for kind, interval in intervals.items()
+        ]
         
         return {
             "success": True,
@@ -597,7 +612,7 @@ def setup_monitoring_schedule(api_client, schedule_config: Dict[str, Any]) -> Di
                 "backup_interval_hours": backup_interval,
                 "health_check_interval_minutes": health_check_interval
             },
-            "scheduler_thread_active": scheduler_thread.is_alive()
+            "jobs": [{"job_id": job["job_id"], "next_run": job["next_run"]} for job in jobs]
         }
         
     except Exception as e:
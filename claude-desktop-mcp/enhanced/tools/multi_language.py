@@ -7,6 +7,8 @@ import logging
 from typing import Dict, List, Any, Optional
 import json
 
+from shared.woocommerce_api import iter_items, BatchWriter, MAX_BATCH_SIZE
+
 logger = logging.getLogger(__name__)
 
 
@@ -174,42 +176,45 @@ def manage_translations(api_client, translation_data: Dict[str, Any]) -> Dict[st
                 "errors": []
             }
             
+            # Fetch current meta of all products, 100 ids per request
+            product_ids = [str(product_id) for product_id in product_translations]
+            products = {}
+            for offset in range(0, len(product_ids), MAX_BATCH_SIZE):
+                include = ",".join(product_ids[offset:offset + MAX_BATCH_SIZE])
+                for product in iter_items(api_client, "products", params={"include": include},
+                                          fields=["id", "meta_data"]):
+                    products[str(product["id"])] = product
+            
+            updates = []
             for product_id, translations in product_translations.items():
-                try:
-                    # Get current product
-                    product_response = api_client.get(f"products/{product_id}")
-                    if product_response.status_code != 200:
-                        translation_results["errors"].append(f"Product {product_id} not found")
-                        translation_results["failed"] += 1
-                        continue
-                    
-                    product = product_response.json()
-                    
-                    # Prepare translation meta data
-                    current_meta = product.get("meta_data", [])
-                    new_meta = [meta for meta in current_meta 
-                              if not meta.get("key", "").startswith(f"_translation_{target_language}")]
-                    
-                    # Add new translations as meta data
-                    for field, translated_value in translations.items():
-                        new_meta.append({
-                            "key": f"_translation_{target_language}_{field}",
-                            "value": translated_value
-                        })
-                    
-                    # Update product with translation meta
-                    update_data = {"meta_data": new_meta}
-                    update_response = api_client.put(f"products/{product_id}", update_data)
-                    
-                    if update_response.status_code in [200, 201]:
-                        translation_results["successful"] += 1
-                    else:
-                        translation_results["errors"].append(f"Failed to update product {product_id}")
-                        translation_results["failed"] += 1
-                
-                except Exception as e:
-                    translation_results["errors"].append(f"Error translating product {product_id}: {str(e)}")
+                product = products.get(str(product_id))
+                if product is None:
+                    translation_results["errors"].append(f"Product {product_id} not found")
                     translation_results["failed"] += 1
+                    continue
+                
+                # Prepare translation meta data
+                current_meta = product.get("meta_data", [])
+                new_meta = [meta for meta in current_meta 
+                          if not meta.get("key", "").startswith(f"_translation_{target_language}")]
+                
+                # Add new translations as meta data
+                for field, translated_value in translations.items():
+                    new_meta.append({
+                        "key": f"_translation_{target_language}_{field}",
+                        "value": translated_value
+                    })
+                
+                updates.append({"id": product["id"], "meta_data": new_meta})
+            
+            # Update products with translation meta through products/batch
+            result = BatchWriter(api_client, "products").write(update=updates)
+            translation_results["successful"] += result.count("update")
+            for error in result.errors:
+                translation_results["errors"].append(
+                    f"Failed to update product {error.get('id')}: {error['message']}"
+                )
+                translation_results["failed"] += 1
             
             results["translation_results"] = translation_results
         
@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import json
 
+from shared.woocommerce_api import stream_items
+
 logger = logging.getLogger(__name__)
 
 
@@ -354,6 +356,13 @@ def process_refund(api_client, order_id: int, amount: float, reason: str,
         return {"error": str(e)}
 
 
+# Order fields read by get_sales_analytics
+SALES_ANALYTICS_FIELDS = [
+    "total", "total_tax", "shipping_total", "discount_total", "customer_id",
+    "payment_method_title", "line_items", "date_created", "billing"
+]
+
+
 def get_sales_analytics(api_client, date_range: str = "last_30_days", 
                        grouping: str = "day") -> Dict[str, Any]:
     """Get comprehensive sales analytics and revenue reports"""
@@ -389,46 +398,15 @@ def get_sales_analytics(api_client, date_range: str = "last_30_days",
         params = {
             "after": start_date.isoformat(),
             "before": end_date.isoformat(),
-            "per_page": 100,
             "status": "completed"  # Only completed orders for sales analytics
         }
         
-        all_orders = []
-        page = 1
-        
-        while True:
-            params["page"] = page
-            response = api_client.get("orders", params=params)
-            if response.status_code != 200:
-                break
-            
-            orders = response.json()
-            if not orders:
-                break
-            
-            all_orders.extend(orders)
-            page += 1
-            
-            # Safety limit
-            if len(all_orders) >= 10000:
-                break
-        
-        if not all_orders:
-            return {
-                "date_range": date_range,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "total_orders": 0,
-                "total_revenue": 0,
-                "message": "No completed orders found in date range"
-            }
-        
         # Calculate analytics
         analytics = {
             "date_range": date_range,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "total_orders": len(all_orders),
+            "total_orders": 0,
             "total_revenue": 0,
             "total_tax": 0,
             "total_shipping": 0,
@@ -450,7 +428,13 @@ def get_sales_analytics(api_client, date_range: str = "last_30_days",
         daily_sales = {}
         countries = {}
         
-        for order in all_orders:
+        # Orders are decoded one at a time and folded into the totals, never
+        # held as a list (safety limit 10000)
+        orders = stream_items(api_client, "orders", params, max_items=10000,
+                              fields=SALES_ANALYTICS_FIELDS)
+        for order in orders:
+            analytics["total_orders"] += 1
+            
             # Basic revenue calculations
             total = float(order.get("total", 0))
             tax = float(order.get("total_tax", 0))
@@ -512,6 +496,16 @@ def get_sales_analytics(api_client, date_range: str = "last_30_days",
             else:
                 countries[country] = {"orders": 1, "revenue": total}
         
+        if not analytics["total_orders"]:
+            return {
+                "date_range": date_range,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "total_orders": 0,
+                "total_revenue": 0,
+                "message": "No completed orders found in date range"
+            }
+        
         # Calculate derived metrics
         analytics["unique_customers"] = len(customer_ids)
         analytics["average_order_value"] = analytics["total_revenue"] / max(analytics["total_orders"], 1)
@@ -10,6 +10,8 @@ import json
 from io import StringIO
 import pandas as pd
 
+from shared.woocommerce_api import iter_items, BatchWriter, ResourceIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -259,6 +261,17 @@ def import_products(api_client, file_data: str, mapping_rules: Dict[str, Any]) -
             "imported_products": []
         }
         
+        # Rows are collected first and written in batches; *_rows map batch
+        # positions back to file rows
+        creates, create_rows = [], []
+        updates, update_rows = [], []
+        
+        # Existing SKUs from one projected listing instead of a GET per row,
+        # plus the SKUs queued for creation by earlier rows
+        sku_index = ResourceIndex.build(api_client, "products", key="sku", fields=("id", "sku"))
+        queued = {}        # SKU -> position in creates
+        merged_rows = {}   # position in creates -> later rows folded into it
+        
         for index, row in df.iterrows():
             try:
                 # Skip empty rows
@@ -348,38 +361,59 @@ def import_products(api_client, file_data: str, mapping_rules: Dict[str, Any]) -
                 product_data.setdefault("type", "simple")
                 product_data.setdefault("status", "publish")
                 
-                # Check if product exists (by SKU)
-                existing_product = None
-                if product_data.get("sku"):
-                    existing_product = find_product_by_sku(api_client, product_data["sku"])
+                # Check if product exists (by SKU), in the store or earlier in the file
+                sku = product_data.get("sku")
+                existing_id = sku_index.id_for(sku) if sku else None
+                position = queued.get(sku) if sku else None
                 
-                if existing_product and mapping_rules.get("update_existing", False):
-                    # Update existing product
-                    response = api_client.put(f"products/{existing_product['id']}", product_data)
-                elif not existing_product:
-                    # Create new product
-                    response = api_client.post("products", product_data)
+                if existing_id and mapping_rules.get("update_existing", False):
+                    # Queue update of existing product
+                    updates.append({"id": existing_id, **product_data})
+                    update_rows.append(index)
+                elif position is not None and mapping_rules.get("update_existing", False):
+                    # Created by an earlier row - this row updates it
+                    creates[position].update(product_data)
+                    merged_rows.setdefault(position, []).append(index)
+                elif not existing_id and position is None:
+                    # Queue new product
+                    if sku:
+                        queued[sku] = len(creates)
+                    creates.append(product_data)
+                    create_rows.append(index)
                 else:
                     # Skip existing product
                     import_results["skipped_rows"] += 1
                     continue
-                
-                if response.status_code in [200, 201]:
-                    product = response.json()
+            
+            except Exception as e:
+                import_results["failed_imports"] += 1
+                import_results["errors"].append(f"Row {index + 1}: {str(e)}")
+        
+        # Write all rows through products/batch, 100 per request
+        result = BatchWriter(api_client, "products").write(create=creates, update=updates)
+        
+        for action, label in (("create", "created"), ("update", "updated")):
+            for position, product in sorted(result.responses[action].items()):
+                labels = [label]
+                if action == "create":
+                    labels += ["updated"] * len(merged_rows.get(position, []))
+                for row_label in labels:
                     import_results["successful_imports"] += 1
                     import_results["imported_products"].append({
                         "id": product.get("id"),
                         "name": product.get("name"),
                         "sku": product.get("sku"),
-                        "action": "updated" if existing_product else "created"
+                        "action": row_label
                     })
-                else:
-                    import_results["failed_imports"] += 1
-                    import_results["errors"].append(f"Row {index + 1}: {response.text}")
-            
-            except Exception as e:
+        
+        for error in result.errors:
+            if error["action"] == "create":
+                rows = [create_rows[error["index"]]] + merged_rows.get(error["index"], [])
+            else:
+                rows = [update_rows[error["index"]]]
+            for row in rows:
                 import_results["failed_imports"] += 1
-                import_results["errors"].append(f"Row {index + 1}: {str(e)}")
+                import_results["errors"].append(f"Row {row + 1}: {error['message']}")
         
         return import_results
     
@@ -406,7 +440,7 @@ def export_products(api_client, filters: Dict[str, Any] = None,
         export_columns = columns or default_columns
         
         # Build API parameters from filters
-        params = {"per_page": 100}
+        params = {}
         if filters:
             if "status" in filters:
                 params["status"] = filters["status"]
@@ -421,26 +455,8 @@ def export_products(api_client, filters: Dict[str, Any] = None,
             if "max_price" in filters:
                 params["max_price"] = filters["max_price"]
         
-        # Fetch all products
-        all_products = []
-        page = 1
-        
-        while True:
-            params["page"] = page
-            response = api_client.get("products", params=params)
-            if response.status_code != 200:
-                break
-            
-            products = response.json()
-            if not products:
-                break
-            
-            all_products.extend(products)
-            page += 1
-            
-            # Safety limit
-            if len(all_products) >= 10000:
-                break
+        # Fetch all products (pages fetched concurrently, safety limit 10000)
+        all_products = list(iter_items(api_client, "products", params, max_items=10000))
         
         if not all_products:
             return {"error": "No products found matching filters"}
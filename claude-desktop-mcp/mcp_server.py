@@ -4,13 +4,20 @@ Lightweight stdio server for single-store management
 """
 
 import os
+import sys
 import json
 import logging
+from pathlib import Path
 from typing import Any, Dict
 
+# Make the repository-level shared package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 from mcp.server.fastmcp import FastMCP
 from woocommerce import API as WooCommerceAPI
 
+from shared.woocommerce_api import ManagedAPI, ConnectionMonitor, probe_store
+
 # Import tool modules
 from tools import products, orders, store
 
@@ -21,13 +28,14 @@ logger = logging.getLogger(__name__)
 # Create FastMCP app
 mcp = FastMCP("WooCommerce Store Manager")
 
-# Global API client
+# Global API client and its background connection check
 api_client = None
+connection_monitor = None
 
 
 def initialize_store():
     """Initialize store connection from environment variables"""
-    global api_client
+    global api_client, connection_monitor
     
     store_url = os.getenv('STORE_URL')
     consumer_key = os.getenv('WOOCOMMERCE_KEY')  
@@ -39,23 +47,20 @@ def initialize_store():
         return False
     
     try:
-        api_client = WooCommerceAPI(
+        api_client = ManagedAPI(WooCommerceAPI(
             url=store_url,
             consumer_key=consumer_key,
             consumer_secret=consumer_secret,
             wp_api=True,
             version="wc/v3",
             timeout=30
-        )
+        ))
         
-        # Test connection
-        response = api_client.get("system_status")
-        if response.status_code == 200:
-            logger.info(f"Successfully connected to {store_url}")
-            return True
-        else:
-            logger.error(f"Connection test failed: {response.status_code}")
-            return False
+        # Validate in the background so the server accepts calls immediately
+        connection_monitor = ConnectionMonitor(
+            lambda: probe_store(api_client), name=store_url
+        ).start()
+        return True
     except Exception as e:
         logger.error(f"Failed to initialize store: {e}")
         return False
@@ -189,6 +194,14 @@ def get_store_stats() -> str:
     return json.dumps(result, indent=2)
 
 
+@mcp.tool()
+def get_connection_status() -> str:
+    """Get the store connection state (connecting, healthy or degraded)"""
+    if not connection_monitor:
+        return json.dumps({"state": "not_configured"}, indent=2)
+    return json.dumps(connection_monitor.status(), indent=2)
+
+
 @mcp.tool()
 def get_categories(hide_empty: bool = False) -> str:
     """List all product categories
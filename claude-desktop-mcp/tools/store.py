@@ -43,19 +43,19 @@ def get_store_stats(api_client) -> Dict[str, Any]:
             }
     
     # Get product count
-    response = api_client.get("products", params={"per_page": 1})
+    response = api_client.get("products", params={"per_page": 1, "_fields": "id"})
     if response.status_code == 200:
         total_products = response.headers.get("X-WP-Total", "Unknown")
         stats["total_products"] = total_products
     
     # Get order count
-    response = api_client.get("orders", params={"per_page": 1})
+    response = api_client.get("orders", params={"per_page": 1, "_fields": "id"})
     if response.status_code == 200:
         total_orders = response.headers.get("X-WP-Total", "Unknown")
         stats["total_orders"] = total_orders
     
     # Get customer count
-    response = api_client.get("customers", params={"per_page": 1})
+    response = api_client.get("customers", params={"per_page": 1, "_fields": "id"})
     if response.status_code == 200:
         total_customers = response.headers.get("X-WP-Total", "Unknown")
         stats["total_customers"] = total_customers
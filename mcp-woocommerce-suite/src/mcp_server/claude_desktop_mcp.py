@@ -4,14 +4,21 @@ Modern FastMCP-based stdio server for WooCommerce management
 """
 
 import os
+import sys
 import json
 import logging
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+# Make the repository-level shared package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
 from mcp.server.fastmcp import FastMCP
 from woocommerce import API as WooCommerceAPI
 
+from shared.woocommerce_api import ManagedAPI
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,14 +49,14 @@ def initialize_store():
     }
     
     try:
-        api_client = WooCommerceAPI(
+        api_client = ManagedAPI(WooCommerceAPI(
             url=store_url,
             consumer_key=consumer_key,
             consumer_secret=consumer_secret,
             wp_api=True,
             version="wc/v3",
             timeout=30
-        )
+        ))
         
         # Test connection
         response = api_client.get("system_status")
@@ -199,8 +206,8 @@ def get_store_stats() -> str:
     
     try:
         # Get basic stats
-        products_response = api_client.get("products", params={"per_page": 1})
-        orders_response = api_client.get("orders", params={"per_page": 1})
+        products_response = api_client.get("products", params={"per_page": 1, "_fields": "id"})
+        orders_response = api_client.get("orders", params={"per_page": 1, "_fields": "id"})
         
         stats = {
             "store_url": store_config["url"] if store_config else "Unknown",
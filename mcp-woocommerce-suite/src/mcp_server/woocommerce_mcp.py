@@ -25,6 +25,7 @@ from ..utils.store_manager import StoreManager
 from ..utils.data_validator import DataValidator
 from ..utils.backup_manager import BackupManager
 from ..utils.security import SecureCredentialStore
+from shared.woocommerce_api import iter_items, stream_items, with_fields
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -405,9 +406,13 @@ class WooCommerceMCPServer:
                     text="No stores configured. Use 'add_store' to add a WooCommerce store."
                 )
             
+            # Health checks hit independent hosts - run them concurrently
+            statuses = await asyncio.gather(
+                *(self.store_manager.check_store_health(store['id']) for store in stores)
+            )
+            
             store_info = []
-            for store in stores:
-                status = await self.store_manager.check_store_health(store['id'])
+            for store, status in zip(stores, statuses):
                 store_info.append({
                     "id": store['id'],
                     "name": store['name'],
@@ -459,7 +464,7 @@ class WooCommerceMCPServer:
             )
             
             # Try to fetch store info
-            response = api.get("system_status")
+            response = await asyncio.to_thread(api.get, "system_status")
             if response.status_code != 200:
                 return TextContent(text=f"Failed to connect to store: {response.text}")
             
@@ -493,21 +498,21 @@ class WooCommerceMCPServer:
             if not api:
                 return TextContent(text=f"Store '{store_id}' not found or not configured")
             
-            # Fetch products
-            params = {
+            # Fetch products, projected server-side when only some fields are wanted
+            params = with_fields({
                 "page": page,
                 "per_page": per_page,
                 "orderby": "date",
                 "order": "desc"
-            }
+            }, fields)
             
-            response = api.get("products", params=params)
+            response = await asyncio.to_thread(api.get, "products", params=params)
             if response.status_code != 200:
                 return TextContent(text=f"Failed to fetch products: {response.text}")
             
             products = response.json()
             
-            # Filter fields if specified
+            # Keep every requested key even when the store omits it
             if fields:
                 filtered_products = []
                 for product in products:
@@ -555,7 +560,7 @@ class WooCommerceMCPServer:
                 if "stock_status" in filters:
                     params["stock_status"] = filters["stock_status"]
             
-            response = api.get("products", params=params)
+            response = await asyncio.to_thread(api.get, "products", params=params)
             if response.status_code != 200:
                 return TextContent(text=f"Search failed: {response.text}")
             
@@ -594,7 +599,7 @@ class WooCommerceMCPServer:
                 return TextContent(text=f"Validation failed: {validation_result['errors']}")
             
             # Apply updates
-            response = api.put(f"products/{product_id}", updates)
+            response = await asyncio.to_thread(api.put, f"products/{product_id}", updates)
             if response.status_code not in [200, 201]:
                 return TextContent(text=f"Update failed: {response.text}")
             
@@ -650,7 +655,7 @@ class WooCommerceMCPServer:
                     # Remove NaN values
                     product_data = {k: v for k, v in product_data.items() if pd.notna(v)}
                     
-                    response = api.post("products", product_data)
+                    response = await asyncio.to_thread(api.post, "products", product_data)
                     if response.status_code in [200, 201]:
                         success_count += 1
                     else:
@@ -683,24 +688,12 @@ class WooCommerceMCPServer:
             if not api:
                 return TextContent(text=f"Store '{store_id}' not found")
             
-            # Fetch all products with pagination
-            all_products = []
-            page = 1
-            while True:
-                params = {"page": page, "per_page": 100}
-                if filters:
-                    params.update(filters)
-                
-                response = api.get("products", params=params)
-                if response.status_code != 200:
-                    break
-                
-                products = response.json()
-                if not products:
-                    break
-                
-                all_products.extend(products)
-                page += 1
+            # Fetch all products, pages in parallel and projected server-side
+            # when only some fields are wanted; a failed page raises
+            # PageFetchError rather than exporting a partial catalog
+            all_products = await asyncio.to_thread(
+                lambda: list(iter_items(api, "products", filters, fields=fields))
+            )
             
             # Filter fields
             if fields:
@@ -783,52 +776,44 @@ class WooCommerceMCPServer:
                 "settings": {"total": 0, "completed": 0}
             }
             
-            # 1. Export all products
-            all_products = []
-            page = 1
-            while True:
-                response = source_api.get("products", params={"page": page, "per_page": 100})
-                if response.status_code != 200:
-                    break
-                products = response.json()
-                if not products:
-                    break
-                all_products.extend(products)
-                page += 1
-            
-            progress["products"]["total"] = len(all_products)
-            
-            # 2. Export categories
-            categories = source_api.get("products/categories", params={"per_page": 100}).json()
+            # 1. Export categories
+            categories = (await asyncio.to_thread(
+                source_api.get, "products/categories", params={"per_page": 100}
+            )).json()
             progress["categories"]["total"] = len(categories)
             
-            # 3. Export attributes
-            attributes = source_api.get("products/attributes").json()
+            # 2. Export attributes
+            attributes = (await asyncio.to_thread(source_api.get, "products/attributes")).json()
             progress["attributes"]["total"] = len(attributes)
             
-            # 4. Export store settings
-            settings_response = source_api.get("system_status")
+            # 3. Export store settings
+            settings_response = await asyncio.to_thread(source_api.get, "system_status")
             store_settings = settings_response.json() if settings_response.status_code == 200 else {}
             
-            # 5. Create deployment package
-            deployment_package = {
+            # 4. Stream products straight into the deployment package - same
+            # layout as dumping the whole package, without holding the catalog
+            package_file = f"{settings.backup_dir}/clone_{source_store}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            package_header = {
                 "source_store": source_store,
                 "target_domain": target_domain,
-                "timestamp": datetime.now().isoformat(),
-                "data": {
-                    "products": all_products,
-                    "categories": categories,
-                    "attributes": attributes,
-                    "settings": store_settings
-                }
+                "timestamp": datetime.now().isoformat()
             }
             
-            # 6. Save deployment package
-            package_file = f"{settings.backup_dir}/clone_{source_store}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(package_file, 'w') as f:
-                json.dump(deployment_package, f)
-            
-            # 7. Deploy to target (if credentials provided)
+            def write_package():
+                with open(package_file, 'w') as f:
+                    f.write(json.dumps(package_header)[:-1] + ', "data": {"products": [')
+                    for product in stream_items(source_api, "products"):
+                        if progress["products"]["total"]:
+                            f.write(", ")
+                        json.dump(product, f)
+                        progress["products"]["total"] += 1
+                    f.write('], "categories": ' + json.dumps(categories))
+                    f.write(', "attributes": ' + json.dumps(attributes))
+                    f.write(', "settings": ' + json.dumps(store_settings) + '}}')
+            
+            await asyncio.to_thread(write_package)
+            
+            # 5. Deploy to target (if credentials provided)
             if shared_hosting_config.get('deploy_now'):
                 # This would connect to the target domain and import data
                 # Implementation depends on hosting provider API
@@ -840,7 +825,7 @@ class WooCommerceMCPServer:
                 "target_domain": target_domain,
                 "package_file": package_file,
                 "statistics": {
-                    "products_cloned": len(all_products),
+                    "products_cloned": progress["products"]["total"],
                     "categories_cloned": len(categories),
                     "attributes_cloned": len(attributes)
                 }
@@ -867,7 +852,7 @@ class WooCommerceMCPServer:
                     continue
                 
                 # Search for product by SKU
-                response = api.get("products", params={"sku": product_sku})
+                response = await asyncio.to_thread(api.get, "products", params={"sku": product_sku})
                 if response.status_code != 200:
                     comparison_results.append({
                         "store": store_id,
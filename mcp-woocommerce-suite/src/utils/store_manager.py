@@ -3,6 +3,7 @@ Store Manager - Handles multiple WooCommerce store connections
 """
 
 import json
+import sys
 import asyncio
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -14,6 +15,12 @@ import logging
 
 from ..config.settings import settings
 
+# Make the repository-level shared package importable
+sys.path.insert(0, str(settings.base_dir.parent))
+from shared.woocommerce_api import (
+    AsyncWooCommerceClient, ManagedAPI, RetryPolicy, ResponseCache, get_store_limiter
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +31,7 @@ class StoreManager:
         self.stores_file = settings.stores_dir / "stores.json"
         self.stores_cache = {}
         self.api_clients = {}
+        self.async_clients = {}
         self.cipher = Fernet(settings.security.encryption_key.encode())
         self._load_stores()
     
@@ -50,6 +58,7 @@ class StoreManager:
             # Clear API client cache for this store
             if store_id in self.api_clients:
                 del self.api_clients[store_id]
+            await self._close_async_client(store_id)
             
             return True
         except Exception as e:
@@ -89,6 +98,7 @@ class StoreManager:
                 # Clear API client cache
                 if store_id in self.api_clients:
                     del self.api_clients[store_id]
+                await self._close_async_client(store_id)
                 
                 return True
             return False
@@ -97,7 +107,13 @@ class StoreManager:
             return False
     
     async def get_api_client(self, store_id: str) -> Optional[WooCommerceAPI]:
-        """Get WooCommerce API client for a store"""
+        """
+        Get WooCommerce API client for a store
+        
+        The client blocks while it waits for the store's limiter, which it
+        shares with the async client - call it through asyncio.to_thread,
+        never on the event loop, or a full window can never drain.
+        """
         try:
             # Check cache
             if store_id in self.api_clients:
@@ -112,15 +128,15 @@ class StoreManager:
             consumer_key = self.cipher.decrypt(store['consumer_key'].encode()).decode()
             consumer_secret = self.cipher.decrypt(store['consumer_secret'].encode()).decode()
             
-            # Create API client
-            api = WooCommerceAPI(
+            # Create API client, throttled by the store's shared limiter
+            api = ManagedAPI(WooCommerceAPI(
                 url=store['url'],
                 consumer_key=consumer_key,
                 consumer_secret=consumer_secret,
                 wp_api=store.get('wp_api', True),
                 version=store.get('version', 'wc/v3'),
                 timeout=settings.woocommerce.api_timeout
-            )
+            ), settings=settings.woocommerce)
             
             # Cache the client
             self.api_clients[store_id] = api
@@ -130,10 +146,57 @@ class StoreManager:
             logger.error(f"Error creating API client for store {store_id}: {e}")
             return None
     
+    async def get_async_client(self, store_id: str) -> Optional[AsyncWooCommerceClient]:
+        """Get pooled non-blocking API client for a store"""
+        try:
+            # Check cache
+            if store_id in self.async_clients:
+                return self.async_clients[store_id]
+            
+            # Get store configuration
+            store = await self.get_store(store_id)
+            if not store:
+                return None
+            
+            # Decrypt credentials
+            consumer_key = self.cipher.decrypt(store['consumer_key'].encode()).decode()
+            consumer_secret = self.cipher.decrypt(store['consumer_secret'].encode()).decode()
+            
+            client = AsyncWooCommerceClient(
+                url=store['url'],
+                consumer_key=consumer_key,
+                consumer_secret=consumer_secret,
+                version=store.get('version', 'wc/v3'),
+                timeout=settings.woocommerce.api_timeout,
+                max_connections=settings.woocommerce.concurrent_requests,
+                limiter=get_store_limiter(store['url'], settings=settings.woocommerce),
+                retry_policy=RetryPolicy.from_settings(settings.woocommerce),
+                cache=ResponseCache.from_settings(settings.woocommerce)
+            )
+            
+            # Cache the client
+            self.async_clients[store_id] = client
+            
+            return client
+        except Exception as e:
+            logger.error(f"Error creating async API client for store {store_id}: {e}")
+            return None
+    
+    async def _close_async_client(self, store_id: str):
+        """Close and forget the pooled client of a store"""
+        client = self.async_clients.pop(store_id, None)
+        if client:
+            await client.close()
+    
+    async def close(self):
+        """Close all pooled store connections"""
+        for store_id in list(self.async_clients.keys()):
+            await self._close_async_client(store_id)
+    
     async def check_store_health(self, store_id: str) -> Dict[str, Any]:
         """Check if store connection is healthy"""
         try:
-            api = await self.get_api_client(store_id)
+            api = await self.get_async_client(store_id)
             if not api:
                 return {
                     'status': 'error',
@@ -141,7 +204,7 @@ class StoreManager:
                 }
             
             # Try to fetch system status
-            response = api.get("system_status")
+            response = await api.get("system_status")
             
             if response.status_code == 200:
                 return {
@@ -164,31 +227,31 @@ class StoreManager:
     async def get_store_statistics(self, store_id: str) -> Dict[str, Any]:
         """Get store statistics"""
         try:
-            api = await self.get_api_client(store_id)
+            api = await self.get_async_client(store_id)
             if not api:
                 return {}
             
             stats = {}
             
-            # Get product count
-            products_response = api.get("products", params={"per_page": 1})
-            if products_response.status_code == 200:
-                stats['total_products'] = int(products_response.headers.get('X-WP-Total', 0))
-            
-            # Get order count
-            orders_response = api.get("orders", params={"per_page": 1})
-            if orders_response.status_code == 200:
-                stats['total_orders'] = int(orders_response.headers.get('X-WP-Total', 0))
-            
-            # Get customer count
-            customers_response = api.get("customers", params={"per_page": 1})
-            if customers_response.status_code == 200:
-                stats['total_customers'] = int(customers_response.headers.get('X-WP-Total', 0))
+            # Count requests are independent - run them concurrently; only the
+            # X-WP-Total header is read so the body is projected to ids
+            endpoints = {
+                'total_products': "products",
+                'total_orders': "orders",
+                'total_customers': "customers",
+                'total_categories': "products/categories"
+            }
+            responses = await asyncio.gather(
+                *(api.get(endpoint, params={"per_page": 1, "_fields": "id"}) for endpoint in endpoints.values()),
+                return_exceptions=True
+            )
             
-            # Get categories count
-            categories_response = api.get("products/categories", params={"per_page": 1})
-            if categories_response.status_code == 200:
-                stats['total_categories'] = int(categories_response.headers.get('X-WP-Total', 0))
+            for stat_name, response in zip(endpoints.keys(), responses):
+                if isinstance(response, Exception):
+                    logger.warning(f"Error counting {stat_name} for store {store_id}: {response}")
+                    continue
+                if response.status_code == 200:
+                    stats[stat_name] = int(response.headers.get('X-WP-Total', 0))
             
             return stats
         except Exception as e:
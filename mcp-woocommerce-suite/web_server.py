@@ -11,12 +11,16 @@ from datetime import datetime
 from typing import Dict, List, Any
 import asyncio
 import logging
-from woocommerce import API
 import requests
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Make the repository-level shared package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.woocommerce_api import AsyncWooCommerceClient, BatchWriter, MAX_BATCH_SIZE, aiter_items, with_fields
+
 # Load environment variables
 load_dotenv()
 
@@ -73,16 +77,21 @@ class WooCommerceManager:
         for store_id, store_data in stores_db.items():
             if 'consumer_key' in store_data:
                 try:
-                    api = API(
+                    api = AsyncWooCommerceClient(
                         url=store_data['url'],
                         consumer_key=store_data['consumer_key'], 
                         consumer_secret=store_data['consumer_secret'],
-                        wp_api=True, version='wc/v3', timeout=30
+                        version='wc/v3', timeout=30
                     )
                     self.store_apis[store_id] = api
                 except: pass
     
-    async def get_products(self, store_id: str, **params):
+    async def close(self):
+        """Release pooled store connections"""
+        for api in self.store_apis.values():
+            await api.close()
+    
+    async def get_products(self, store_id: str, fields: List[str] = None, **params):
         if store_id in self.store_apis:
             try:
                 api = self.store_apis[store_id]
@@ -91,11 +100,11 @@ class WooCommerceManager:
                 if 'per_page' not in params:
                     params['per_page'] = 100
                     
-                response = api.get("products", params=params)
+                response = await api.get("products", params=with_fields(params, fields))
                 
                 # Handle Response object vs direct data
                 if hasattr(response, 'json'):
-                    # It's a requests Response object
+                    # It's an httpx Response object
                     products = response.json()
                 elif isinstance(response, list):
                     products = response
@@ -108,12 +117,23 @@ class WooCommerceManager:
                 return {'success': False, 'error': str(e)}
         return {'success': False, 'error': 'Store not found'}
     
+    async def get_all_products(self, store_id: str, fields: List[str] = None, **params):
+        """Walk every page of a store's products, optionally projected to fields"""
+        if store_id in self.store_apis:
+            try:
+                api = self.store_apis[store_id]
+                products = [p async for p in aiter_items(api, "products", params, fields=fields)]
+                return {'success': True, 'products': products}
+            except Exception as e:
+                return {'success': False, 'error': str(e)}
+        return {'success': False, 'error': 'Store not found'}
+    
     async def get_product(self, store_id: str, product_id: str):
         """Get a single product by ID"""
         if store_id in self.store_apis:
             try:
                 api = self.store_apis[store_id]
-                response = api.get(f"products/{product_id}")
+                response = await api.get(f"products/{product_id}")
                 
                 if hasattr(response, 'json'):
                     product = response.json()
@@ -130,7 +150,7 @@ class WooCommerceManager:
         if store_id in self.store_apis:
             try:
                 api = self.store_apis[store_id]
-                response = api.post("products", product_data)
+                response = await api.post("products", product_data)
                 
                 if hasattr(response, 'json'):
                     product = response.json()
@@ -147,7 +167,7 @@ class WooCommerceManager:
         if store_id in self.store_apis:
             try:
                 api = self.store_apis[store_id]
-                response = api.put(f"products/{product_id}", updates)
+                response = await api.put(f"products/{product_id}", updates)
                 
                 if hasattr(response, 'json'):
                     product = response.json()
@@ -159,13 +179,40 @@ class WooCommerceManager:
                 return {'success': False, 'error': str(e)}
         return {'success': False, 'error': 'Store not found'}
     
+    async def batch_update_products(self, store_id: str, updates: List[dict]):
+        """Update many products through products/batch, 100 per request"""
+        if store_id in self.store_apis:
+            try:
+                api = self.store_apis[store_id]
+                result = await BatchWriter(api, "products").write_async(update=updates)
+                return {'success': True, 'result': result}
+            except Exception as e:
+                return {'success': False, 'error': str(e)}
+        return {'success': False, 'error': 'Store not found'}
+    
+    def batch_item_results(self, updates: List[dict], batch: dict):
+        """Per-product outcome of batch_update_products in input order"""
+        result = batch.get('result')
+        errors = {error['index']: error['message'] for error in result.errors} if result else {}
+        items = []
+        for index, update in enumerate(updates):
+            item = {'product_id': update['id']}
+            if result is None:
+                item.update(success=False, error=batch.get('error'))
+            elif index in errors:
+                item.update(success=False, error=errors[index])
+            else:
+                item['success'] = True
+            items.append(item)
+        return items
+    
     async def delete_product(self, store_id: str, product_id: str, force: bool = False):
         """Delete a product"""
         if store_id in self.store_apis:
             try:
                 api = self.store_apis[store_id]
                 params = {'force': force} if force else {}
-                response = api.delete(f"products/{product_id}", params=params)
+                response = await api.delete(f"products/{product_id}", params=params)
                 
                 if hasattr(response, 'json'):
                     result = response.json()
@@ -250,11 +297,11 @@ async def execute_specific_tool(tool_id: str, params: dict):
         
         # Initialize WooCommerce API for this store
         try:
-            api = API(
+            api = AsyncWooCommerceClient(
                 url=url,
                 consumer_key=consumer_key,
                 consumer_secret=consumer_secret,
-                wp_api=True, version='wc/v3', timeout=30
+                version='wc/v3', timeout=30
             )
             wc_manager.store_apis[store_id] = api
             
@@ -412,9 +459,11 @@ async def execute_specific_tool(tool_id: str, params: dict):
         if not source_store or not target_store:
             return {'success': False, 'error': 'Source and target stores required'}
         
-        # Get all products from both stores
-        source_products = await wc_manager.get_products(source_store, per_page=100)
-        target_products = await wc_manager.get_products(target_store, per_page=100)
+        # Get all products from both stores - the target side only needs SKUs
+        source_products, target_products = await asyncio.gather(
+            wc_manager.get_all_products(source_store, fields=['id', 'sku', 'name', 'price', 'status']),
+            wc_manager.get_all_products(target_store, fields=['sku'])
+        )
         
         if not source_products.get('success') or not target_products.get('success'):
             return {'success': False, 'error': 'Failed to fetch products'}
@@ -501,30 +550,43 @@ async def execute_specific_tool(tool_id: str, params: dict):
         if not price_rule:
             return {'success': False, 'error': 'Price rule required'}
         
-        results = []
+        current_prices = {}
+        if 'percentage_increase' in price_rule:
+            # Get current prices, 100 ids per request
+            for offset in range(0, len(product_ids), MAX_BATCH_SIZE):
+                include = ','.join(str(product_id) for product_id in product_ids[offset:offset + MAX_BATCH_SIZE])
+                products = await wc_manager.get_all_products(
+                    store_id, fields=['id', 'regular_price'], include=include
+                )
+                for product in products.get('products', []):
+                    current_prices[str(product['id'])] = product.get('regular_price')
+        
+        updates = []
+        skipped = []
         for product_id in product_ids:
-            updates = {}
-            
             if 'percentage_increase' in price_rule:
-                # Get current price
-                product = await wc_manager.get_product(store_id, product_id)
-                if product.get('success'):
-                    current_price = float(product['product'].get('regular_price', 0))
+                if str(product_id) not in current_prices:
+                    skipped.append({'product_id': product_id, 'success': False, 'error': 'Product not found'})
+                elif not current_prices[str(product_id)]:
+                    skipped.append({
+                        'product_id': product_id, 'success': False, 'error': 'No regular price to increase'
+                    })
+                else:
+                    current_price = float(current_prices[str(product_id)])
                     new_price = current_price * (1 + price_rule['percentage_increase'] / 100)
-                    updates['regular_price'] = str(round(new_price, 2))
+                    updates.append({'id': product_id, 'regular_price': str(round(new_price, 2))})
             
             elif 'fixed_amount' in price_rule:
-                updates['regular_price'] = str(price_rule['fixed_amount'])
-            
-            if updates:
-                result = await wc_manager.update_product(store_id, product_id, updates)
-                results.append({
-                    'product_id': product_id,
-                    'updates': updates,
-                    'success': result.get('success', False)
-                })
+                updates.append({'id': product_id, 'regular_price': str(price_rule['fixed_amount'])})
+        
+        results = []
+        if updates:
+            batch = await wc_manager.batch_update_products(store_id, updates)
+            results = wc_manager.batch_item_results(updates, batch)
+            for update, item in zip(updates, results):
+                item['updates'] = {'regular_price': update['regular_price']}
         
-        return {'success': True, 'price_update_results': results}
+        return {'success': True, 'price_update_results': results + skipped}
     
     elif tool_id == 'bulk_category_update':
         store_id = params.get('store_id', 'store_0')
@@ -534,14 +596,11 @@ async def execute_specific_tool(tool_id: str, params: dict):
         if not categories:
             return {'success': False, 'error': 'Categories required'}
         
-        results = []
-        for product_id in product_ids:
-            result = await wc_manager.update_product(store_id, product_id, {'categories': categories})
-            results.append({
-                'product_id': product_id,
-                'categories': categories,
-                'success': result.get('success', False)
-            })
+        updates = [{'id': product_id, 'categories': categories} for product_id in product_ids]
+        batch = await wc_manager.batch_update_products(store_id, updates)
+        results = wc_manager.batch_item_results(updates, batch)
+        for item in results:
+            item['categories'] = categories
         
         return {'success': True, 'category_update_results': results}
     
@@ -552,25 +611,24 @@ async def execute_specific_tool(tool_id: str, params: dict):
         if not stock_data:
             return {'success': False, 'error': 'Stock data required'}
         
-        results = []
+        updates = []
         for item in stock_data:
             product_id = item.get('product_id')
             stock_quantity = item.get('stock')
             
             if product_id is not None and stock_quantity is not None:
-                updates = {
+                updates.append({
+                    'id': product_id,
                     'stock_quantity': stock_quantity,
                     'manage_stock': True,
                     'in_stock': stock_quantity > 0
-                }
-                
-                result = await wc_manager.update_product(store_id, product_id, updates)
-                results.append({
-                    'product_id': product_id,
-                    'stock_quantity': stock_quantity,
-                    'success': result.get('success', False)
                 })
         
+        batch = await wc_manager.batch_update_products(store_id, updates)
+        results = wc_manager.batch_item_results(updates, batch)
+        for update, item in zip(updates, results):
+            item['stock_quantity'] = update['stock_quantity']
+        
         return {'success': True, 'stock_update_results': results}
     
     elif tool_id == 'bulk_image_update':
@@ -2732,6 +2790,11 @@ async def home():
     """
     return HTMLResponse(content=html_content)
 
+@app.on_event('shutdown')
+async def close_store_connections():
+    """Close pooled WooCommerce connections on shutdown"""
+    await wc_manager.close()
+
 @app.get('/api/tools')
 async def get_tools():
     """Return the complete tool catalog"""
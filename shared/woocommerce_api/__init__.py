@@ -3,5 +3,51 @@ Shared WooCommerce API components
 """
 
 from .client import WooCommerceClient
+from .async_client import AsyncWooCommerceClient
+from .pagination import (
+    iter_pages, iter_items, aiter_pages, aiter_items, stream_items, with_fields,
+    PageFetchError
+)
+from .streaming import iter_json_array
+from .rate_limiter import StoreRateLimiter, get_store_limiter, remove_store_limiter
+from .retry import RetryPolicy
+from .cache import ResponseCache
+from .coalescing import SingleFlight, AsyncSingleFlight
+from .managed_api import ManagedAPI
+from .connection import ConnectionMonitor, ConnectionState, probe_store
+from .batch import BatchWriter, BatchResult, MAX_BATCH_SIZE
+from .index import ResourceIndex
+from .sync_state import SyncStateStore, payload_hash, store_key
+from .journal import SyncJournal
 
-__all__ = ['WooCommerceClient']
\ No newline at end of file
+__all__ = [
+    'WooCommerceClient',
+    'AsyncWooCommerceClient',
+    'iter_pages',
+    'iter_items',
+    'aiter_pages',
+    'aiter_items',
+    'stream_items',
+    'with_fields',
+    'PageFetchError',
+    'iter_json_array',
+    'StoreRateLimiter',
+    'get_store_limiter',
+    'remove_store_limiter',
+    'RetryPolicy',
+    'ResponseCache',
+    'SingleFlight',
+    'AsyncSingleFlight',
+    'ManagedAPI',
+    'ConnectionMonitor',
+    'ConnectionState',
+    'probe_store',
+    'BatchWriter',
+    'BatchResult',
+    'MAX_BATCH_SIZE',
+    'ResourceIndex',
+    'SyncStateStore',
+    'payload_hash',
+    'store_key',
+    'SyncJournal'
+]
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""
+Asyncio WooCommerce API Client
+Pooled keep-alive (and HTTP/2 where available) sibling of WooCommerceClient
+"""
+
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlencode
+import time
+import logging
+
+import httpx
+from woocommerce.oauth import OAuth
+
+from .rate_limiter import StoreRateLimiter, get_store_limiter
+from .retry import RetryPolicy
+from .cache import ResponseCache
+from .coalescing import AsyncSingleFlight
+from .pagination import with_fields
+from .batch import BatchWriter
+from .connection import PROBE_ENDPOINT, PROBE_PARAMS
+
+try:
+    import h2  # noqa: F401 - presence enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWooCommerceClient:
+    """Non-blocking WooCommerce API client sharing one connection pool per store"""
+    
+    def __init__(self, url: str, consumer_key: str, consumer_secret: str,
+                 timeout: int = 30, version: str = "wc/v3",
+                 max_connections: int = 20, max_keepalive_connections: int = 10,
+                 http2: bool = True, verify_ssl: bool = True,
+                 limiter: StoreRateLimiter = None, retry_policy: RetryPolicy = None,
+                 cache: ResponseCache = None, background: bool = False):
+        """
+        Initialize async WooCommerce API client
+        
+        Args:
+            url: Store URL
+            consumer_key: WooCommerce consumer key
+            consumer_secret: WooCommerce consumer secret
+            timeout: Request timeout in seconds
+            version: API version
+            max_connections: Upper bound of concurrent connections to the store
+            max_keepalive_connections: Idle connections kept open for reuse
+            http2: Negotiate HTTP/2 when the server and the h2 package support it
+            verify_ssl: Verify the store TLS certificate
+            limiter: StoreRateLimiter, defaults to the shared limiter for url
+            retry_policy: RetryPolicy for transient failures
+            cache: ResponseCache for read-mostly endpoints
+            background: Acquire background limiter slots, as ManagedAPI does
+        """
+        self.url = url
+        self.version = version
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.timeout = timeout
+        self.is_ssl = url.startswith("https")
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.verify_ssl = verify_ssl
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.limiter = limiter or get_store_limiter(url)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache or ResponseCache()
+        self.background = background
+        self.single_flight = AsyncSingleFlight()
+        self.connected = False
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self) -> "AsyncWooCommerceClient":
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def as_background(self) -> "AsyncWooCommerceClient":
+        """Client for the same store sharing limiter, retries and cache, at background priority"""
+        return AsyncWooCommerceClient(
+            self.url, self.consumer_key, self.consumer_secret,
+            timeout=self.timeout, version=self.version,
+            max_connections=self.limits.max_connections,
+            max_keepalive_connections=self.limits.max_keepalive_connections,
+            http2=self.http2, verify_ssl=self.verify_ssl,
+            limiter=self.limiter, retry_policy=self.retry_policy, cache=self.cache,
+            background=True
+        )
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                auth=(self.consumer_key, self.consumer_secret) if self.is_ssl else None,
+                headers={"accept": "application/json"},
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                verify=self.verify_ssl
+            )
+        return self._client
+    
+    def _endpoint_url(self, endpoint: str) -> str:
+        """Build the REST URL for an endpoint, same layout as woocommerce.API"""
+        base = self.url.rstrip("/")
+        return f"{base}/wp-json/{self.version}/{endpoint}"
+    
+    async def request(self, method: str, endpoint: str, params: Dict[str, Any] = None,
+                      data: Any = None, headers: Dict[str, str] = None) -> httpx.Response:
+        """Send a raw request with retries and return the httpx response"""
+        response = await self.retry_policy.acall(
+            lambda: self._send(method, endpoint, params, data, headers), method, endpoint, data
+        )
+        if method != "GET":
+            self.cache.invalidate(self.url, endpoint)
+        return response
+    
+    async def _send(self, method: str, endpoint: str, params: Dict[str, Any] = None,
+                    data: Any = None, headers: Dict[str, str] = None) -> httpx.Response:
+        """Single attempt under the store limiter"""
+        url = self._endpoint_url(endpoint)
+        params = dict(params or {})
+        
+        if not self.is_ssl:
+            # Plain HTTP stores require OAuth 1.0a signed URLs
+            if params:
+                url = f"{url}?{urlencode(params)}"
+            url = OAuth(
+                url=url,
+                consumer_key=self.consumer_key,
+                consumer_secret=self.consumer_secret,
+                version=self.version,
+                method=method
+            ).get_oauth_url()
+            params = {}
+        
+        start = None
+        status_code = None
+        try:
+            # A cancelled acquire gives its slot back itself
+            await self.limiter.acquire_async(self.background)
+            start = time.monotonic()
+            response = await self._get_client().request(
+                method, url, params=params or None, json=data, headers=headers
+            )
+            status_code = response.status_code
+            return response
+        finally:
+            if start is not None:
+                self.limiter.release(status_code, time.monotonic() - start, self.background)
+    
+    async def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]], key,
+                     resource: Optional[str], entry) -> httpx.Response:
+        # Revalidate an expired entry instead of downloading it again
+        headers = entry.conditional_headers() if entry else None
+        response = await self.request("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key)
+            return entry.response
+        if resource is not None and response.status_code == 200:
+            self.cache.store(key, response, resource)
+        return response
+    
+    async def get(self, endpoint: str, params: Dict[str, Any] = None) -> httpx.Response:
+        key = self.cache.make_key(self.url, endpoint, params)
+        resource = self.cache.resource_for(endpoint)
+        entry = None
+        if resource is not None:
+            entry, fresh = self.cache.lookup(key)
+            if fresh:
+                return entry.response
+        
+        # Concurrent identical reads share one in-flight request
+        return await self.single_flight.do(
+            key, lambda: self._fetch(endpoint, params, key, resource, entry)
+        )
+    
+    async def post(self, endpoint: str, data: Any, params: Dict[str, Any] = None) -> httpx.Response:
+        return await self.request("POST", endpoint, params=params, data=data)
+    
+    async def put(self, endpoint: str, data: Any, params: Dict[str, Any] = None) -> httpx.Response:
+        return await self.request("PUT", endpoint, params=params, data=data)
+    
+    async def delete(self, endpoint: str, params: Dict[str, Any] = None) -> httpx.Response:
+        return await self.request("DELETE", endpoint, params=params)
+    
+    async def connect(self) -> bool:
+        """Open the connection pool and validate credentials"""
+        self.connected = await self.test_connection()
+        return self.connected
+    
+    async def close(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.connected = False
+    
+    async def test_connection(self) -> bool:
+        """Test the API connection with the same cheap probe as probe_store"""
+        try:
+            response = await self.get(PROBE_ENDPOINT, params=dict(PROBE_PARAMS))
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Connection test failed: {e}")
+            return False
+    
+    async def get_products(self, fields: List[str] = None, **kwargs) -> Dict[str, Any]:
+        """Get products with pagination and filters, fields limits the returned fields"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            response = await self.get("products", params=with_fields(kwargs, fields))
+            if response.status_code != 200:
+                return {"error": f"API error: {response.status_code}"}
+            
+            return {
+                "success": True,
+                "data": response.json(),
+                "headers": dict(response.headers)
+            }
+        except Exception as e:
+            logger.error(f"Error fetching products: {e}")
+            return {"error": str(e)}
+    
+    async def get_product(self, product_id: int) -> Dict[str, Any]:
+        """Get single product by ID"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            response = await self.get(f"products/{product_id}")
+            if response.status_code != 200:
+                return {"error": f"Product not found: {response.status_code}"}
+            
+            return {
+                "success": True,
+                "data": response.json()
+            }
+        except Exception as e:
+            logger.error(f"Error fetching product {product_id}: {e}")
+            return {"error": str(e)}
+    
+    async def update_product(self, product_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update product"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            response = await self.put(f"products/{product_id}", data)
+            if response.status_code not in [200, 201]:
+                return {"error": f"Update failed: {response.status_code}"}
+            
+            return {
+                "success": True,
+                "data": response.json()
+            }
+        except Exception as e:
+            logger.error(f"Error updating product {product_id}: {e}")
+            return {"error": str(e)}
+    
+    async def create_product(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create new product"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            response = await self.post("products", data)
+            if response.status_code not in [200, 201]:
+                return {"error": f"Creation failed: {response.status_code}"}
+            
+            return {
+                "success": True,
+                "data": response.json()
+            }
+        except Exception as e:
+            logger.error(f"Error creating product: {e}")
+            return {"error": str(e)}
+    
+    async def get_orders(self, fields: List[str] = None, **kwargs) -> Dict[str, Any]:
+        """Get orders with filters, fields limits the returned fields"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            response = await self.get("orders", params=with_fields(kwargs, fields))
+            if response.status_code != 200:
+                return {"error": f"API error: {response.status_code}"}
+            
+            return {
+                "success": True,
+                "data": response.json(),
+                "headers": dict(response.headers)
+            }
+        except Exception as e:
+            logger.error(f"Error fetching orders: {e}")
+            return {"error": str(e)}
+    
+    async def get_store_info(self) -> Dict[str, Any]:
+        """Get store system information"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            response = await self.get("system_status")
+            if response.status_code != 200:
+                return {"error": f"API error: {response.status_code}"}
+            
+            return {
+                "success": True,
+                "data": response.json()
+            }
+        except Exception as e:
+            logger.error(f"Error fetching store info: {e}")
+            return {"error": str(e)}
+    
+    async def bulk_update_products(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bulk update multiple products"""
+        if not self.connected:
+            return {"error": "Not connected to store"}
+        
+        try:
+            # Chunked to the 100-object batch limit, failures mapped per item
+            result = await BatchWriter(self, "products").write_async(update=updates)
+            if result.requests and result.failed_requests == result.requests:
+                return {"error": f"Bulk update failed: {result.errors[0]['message']}"}
+            
+            return {
+                "success": not result.errors,
+                "data": result.combined_response(),
+                "errors": result.errors
+            }
+        except Exception as e:
+            logger.error(f"Error in bulk update: {e}")
+            return {"error": str(e)}
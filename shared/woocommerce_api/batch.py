@@ -0,0 +1,298 @@
+"""
+Batch Writer
+Chunked create/update/delete through WooCommerce <resource>/batch endpoints
+"""
+
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple, Union, Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from itertools import islice
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# WooCommerce rejects batches with more than 100 objects in total
+MAX_BATCH_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+
+BATCH_ACTIONS = ("create", "update", "delete")
+
+# (action, input index, payload)
+BatchItem = Tuple[str, int, Any]
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a batch write, mapped back to the caller's inputs
+    
+    responses[action][index] holds the store's object for every input that
+    succeeded; errors lists every failed input with its action and index.
+    """
+    responses: Dict[str, Dict[int, Dict[str, Any]]] = field(
+        default_factory=lambda: {action: {} for action in BATCH_ACTIONS}
+    )
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    requests: int = 0
+    failed_requests: int = 0
+    aborted: bool = False
+    
+    @property
+    def succeeded(self) -> int:
+        return sum(len(items) for items in self.responses.values())
+    
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+    
+    def count(self, action: str) -> int:
+        return len(self.responses[action])
+    
+    def merge(self, other: "BatchResult"):
+        for action in BATCH_ACTIONS:
+            self.responses[action].update(other.responses[action])
+        self.errors.extend(other.errors)
+        self.requests += other.requests
+        self.failed_requests += other.failed_requests
+    
+    def combined_response(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Successful objects per action in input order, like a single batch response"""
+        return {
+            action: [items[index] for index in sorted(items)]
+            for action, items in self.responses.items() if items
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "created": self.count("create"),
+            "updated": self.count("update"),
+            "deleted": self.count("delete"),
+            "failed": self.failed,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "aborted": self.aborted,
+            "errors": self.errors
+        }
+
+
+def _item_error(action: str, index: int, payload: Any, code: str, message: str) -> Dict[str, Any]:
+    error = {"action": action, "index": index, "code": code, "message": message}
+    if isinstance(payload, dict):
+        for key in ("id", "sku", "slug", "email"):
+            if payload.get(key):
+                error[key] = payload[key]
+    elif payload is not None:
+        error["id"] = payload
+    return error
+
+
+def _chunk_body(chunk: List[BatchItem]) -> Dict[str, List[Any]]:
+    body: Dict[str, List[Any]] = {}
+    for action, _, payload in chunk:
+        body.setdefault(action, []).append(payload)
+    return body
+
+
+def _read_chunk(chunk: List[BatchItem], response=None, error: Exception = None) -> BatchResult:
+    """Map one batch response (or failure) back onto the chunk's inputs"""
+    result = BatchResult(requests=1)
+    
+    if error is None and response.status_code not in (200, 201):
+        error = RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+    if error is not None:
+        result.failed_requests = 1
+        for action, index, payload in chunk:
+            result.errors.append(_item_error(action, index, payload, "request_failed", str(error)))
+        return result
+    
+    body = response.json() or {}
+    positions = {action: 0 for action in BATCH_ACTIONS}
+    for action, index, payload in chunk:
+        items = body.get(action) or []
+        position = positions[action]
+        positions[action] += 1
+        item = items[position] if position < len(items) else None
+        
+        if not isinstance(item, dict):
+            result.errors.append(_item_error(action, index, payload, "missing_response",
+                                             "No result returned for this item"))
+        elif item.get("error"):
+            item_error = item["error"]
+            result.errors.append(_item_error(
+                action, index, payload,
+                item_error.get("code", "error"), item_error.get("message", str(item_error))
+            ))
+        else:
+            result.responses[action][index] = item
+    return result
+
+
+class BatchWriter:
+    """
+    Write create/update/delete streams through a batch endpoint
+    
+    Inputs are chunked to batch_size objects per request (create, update and
+    delete share one chunk) and chunks run concurrently on max_workers; the
+    API client's limiter keeps the store within its rate. Per-item errors in
+    WooCommerce batch responses are mapped back to input indexes.
+    """
+    
+    def __init__(self, api, endpoint: str, batch_size: int = MAX_BATCH_SIZE,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 on_chunk: Callable[[BatchResult], Optional[bool]] = None):
+        """
+        Args:
+            api: woocommerce.API compatible client (sync post) or
+                 AsyncWooCommerceClient for write_async
+            endpoint: Batchable collection such as "products",
+                      "products/<id>/variations", "orders", "customers",
+                      "products/categories" or "coupons"
+            batch_size: Objects per request, capped at 100
+            max_workers: Concurrent batch requests
+            on_chunk: Called with each chunk's result as it completes;
+                      returning False stops sending further chunks (chunks
+                      already sent are still awaited and reported)
+        """
+        self.api = api
+        self.endpoint = endpoint.strip("/")
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_workers = max(1, max_workers)
+        self.on_chunk = on_chunk
+    
+    @property
+    def batch_endpoint(self) -> str:
+        return f"{self.endpoint}/batch"
+    
+    def _chunks(self, create: Iterable[Dict[str, Any]] = None,
+                update: Iterable[Dict[str, Any]] = None,
+                delete: Iterable[Union[int, Dict[str, Any]]] = None) -> Iterator[List[BatchItem]]:
+        def items() -> Iterator[BatchItem]:
+            for index, payload in enumerate(create or []):
+                yield "create", index, payload
+            for index, payload in enumerate(update or []):
+                yield "update", index, payload
+            for index, payload in enumerate(delete or []):
+                # Batch delete takes bare ids
+                yield "delete", index, payload.get("id") if isinstance(payload, dict) else payload
+        
+        stream = items()
+        while True:
+            chunk = list(islice(stream, self.batch_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def _send_chunk(self, chunk: List[BatchItem]) -> BatchResult:
+        try:
+            response = self.api.post(self.batch_endpoint, _chunk_body(chunk))
+            return _read_chunk(chunk, response)
+        except Exception as e:
+            logger.error(f"Batch request to {self.batch_endpoint} failed: {e}")
+            return _read_chunk(chunk, error=e)
+    
+    def _accept(self, result: BatchResult, chunk_result: BatchResult) -> bool:
+        """Merge a chunk result, False when on_chunk asks to stop"""
+        result.merge(chunk_result)
+        if self.on_chunk and self.on_chunk(chunk_result) is False:
+            result.aborted = True
+            return False
+        return True
+    
+    def _drain(self, result: BatchResult, in_flight: set):
+        """
+        After a stop, drop chunks not yet sent and account for the ones
+        already on the wire - their writes land on the store either way
+        """
+        started = [future for future in in_flight if not future.cancel()]
+        for future in started:
+            chunk_result = future.result()
+            result.merge(chunk_result)
+            if self.on_chunk:
+                self.on_chunk(chunk_result)
+    
+    def write(self, create: Iterable[Dict[str, Any]] = None,
+              update: Iterable[Dict[str, Any]] = None,
+              delete: Iterable[Union[int, Dict[str, Any]]] = None) -> BatchResult:
+        """Send all inputs and return the mapped result"""
+        result = BatchResult()
+        chunks = self._chunks(create, update, delete)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        in_flight = set()
+        
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            in_flight.add(pool.submit(self._send_chunk, chunk))
+            return True
+        
+        try:
+            # Inputs may be generators - only pull a bounded number of chunks ahead
+            for _ in range(self.max_workers * 2):
+                if not submit_next():
+                    break
+            
+            while in_flight:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.discard(future)
+                    if not self._accept(result, future.result()):
+                        self._drain(result, in_flight)
+                        return result
+                    submit_next()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        
+        return result
+    
+    async def _send_chunk_async(self, chunk: List[BatchItem]) -> BatchResult:
+        try:
+            response = await self.api.post(self.batch_endpoint, _chunk_body(chunk))
+            return _read_chunk(chunk, response)
+        except Exception as e:
+            logger.error(f"Batch request to {self.batch_endpoint} failed: {e}")
+            return _read_chunk(chunk, error=e)
+    
+    async def _drain_async(self, result: BatchResult, in_flight: set):
+        """_drain for write_async - every task in flight was already sent"""
+        for task in asyncio.as_completed(list(in_flight)):
+            chunk_result = await task
+            result.merge(chunk_result)
+            if self.on_chunk:
+                self.on_chunk(chunk_result)
+        in_flight.clear()
+    
+    async def write_async(self, create: Iterable[Dict[str, Any]] = None,
+                          update: Iterable[Dict[str, Any]] = None,
+                          delete: Iterable[Union[int, Dict[str, Any]]] = None) -> BatchResult:
+        """write() for AsyncWooCommerceClient"""
+        result = BatchResult()
+        chunks = self._chunks(create, update, delete)
+        in_flight = set()
+        
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            in_flight.add(asyncio.ensure_future(self._send_chunk_async(chunk)))
+            return True
+        
+        try:
+            for _ in range(self.max_workers):
+                if not submit_next():
+                    break
+            
+            while in_flight:
+                done, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.discard(task)
+                    if not self._accept(result, task.result()):
+                        await self._drain_async(result, in_flight)
+                        return result
+                    submit_next()
+        finally:
+            for task in in_flight:
+                task.cancel()
+        
+        return result
@@ -0,0 +1,163 @@
+"""
+Response Cache
+TTL + LRU cache for read-mostly WooCommerce endpoints with conditional revalidation
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import json
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Mirrors WooCommerceSettings.cache_ttl_seconds
+DEFAULT_CACHE_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 256
+
+# Endpoints that change rarely and are re-read by many tools
+CACHEABLE_RESOURCES = (
+    "system_status",
+    "settings",
+    "products/categories"
+)
+
+CacheKey = Tuple[str, str, str]
+
+
+def cache_resource(endpoint: str, resources: Tuple[str, ...] = CACHEABLE_RESOURCES) -> Optional[str]:
+    """Cacheable resource an endpoint belongs to, None when it is not cached"""
+    path = endpoint.split("?", 1)[0].strip("/")
+    for resource in resources:
+        if path == resource or path.startswith(resource + "/"):
+            return resource
+    return None
+
+
+class CacheEntry:
+    """Cached response plus the validators needed to revalidate it"""
+    
+    __slots__ = ("response", "resource", "stored_at", "etag", "last_modified")
+    
+    def __init__(self, response, resource: str):
+        self.response = response
+        self.resource = resource
+        self.stored_at = time.monotonic()
+        headers = getattr(response, "headers", {}) or {}
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+    
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.stored_at < ttl
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU response cache
+    
+    Entries are keyed by store, endpoint and params. Expired entries are kept
+    (until evicted) so clients able to send conditional headers can
+    revalidate them with If-None-Match / If-Modified-Since.
+    """
+    
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 resources: Tuple[str, ...] = CACHEABLE_RESOURCES):
+        """
+        Args:
+            ttl: Seconds a response is served without contacting the store
+            max_entries: LRU capacity
+            resources: Endpoint prefixes that may be cached
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.resources = resources
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+    
+    @classmethod
+    def from_settings(cls, settings) -> "ResponseCache":
+        """Build from a WooCommerceSettings-like object"""
+        return cls(ttl=getattr(settings, "cache_ttl_seconds", DEFAULT_CACHE_TTL_SECONDS))
+    
+    @staticmethod
+    def make_key(store: str, endpoint: str, params: Optional[Dict[str, Any]]) -> CacheKey:
+        return (
+            store.rstrip("/").lower(),
+            endpoint.strip("/"),
+            json.dumps(params or {}, sort_keys=True, default=str)
+        )
+    
+    def resource_for(self, endpoint: str) -> Optional[str]:
+        return cache_resource(endpoint, self.resources)
+    
+    def lookup(self, key: CacheKey) -> Tuple[Optional[CacheEntry], bool]:
+        """Return (entry, fresh); stale entries are returned for revalidation"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.is_fresh(self.ttl):
+                self.counters["hits"] += 1
+                return entry, True
+            self.counters["misses"] += 1
+            return entry, False
+    
+    def store(self, key: CacheKey, response, resource: str):
+        with self._lock:
+            self._entries[key] = CacheEntry(response, resource)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+    
+    def refresh(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Mark an entry fresh again after a 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+                self.counters["revalidated"] += 1
+            return entry
+    
+    def invalidate(self, store: str, endpoint: str):
+        """Drop cached responses of the resource a write endpoint belongs to"""
+        resource = self.resource_for(endpoint)
+        if resource is None:
+            return
+        store_key = store.rstrip("/").lower()
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if key[0] == store_key and entry.resource == resource
+            ]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self.counters["invalidations"] += len(stale)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries), "ttl": self.ttl}
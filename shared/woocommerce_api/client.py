@@ -7,6 +7,11 @@ from typing import Dict, Any, Optional, List
 from woocommerce import API as WooCommerceAPI
 import logging
 
+from .managed_api import ManagedAPI
+from .connection import ConnectionMonitor, ConnectionState, probe_store
+from .pagination import with_fields
+from .batch import BatchWriter
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,7 +19,8 @@ class WooCommerceClient:
     """Enhanced WooCommerce API client with error handling"""
     
     def __init__(self, url: str, consumer_key: str, consumer_secret: str, 
-                 timeout: int = 30, version: str = "wc/v3"):
+                 timeout: int = 30, version: str = "wc/v3", limiter=None,
+                 retry_policy=None):
         """
         Initialize WooCommerce API client
         
@@ -24,41 +30,56 @@ class WooCommerceClient:
             consumer_secret: WooCommerce consumer secret
             timeout: Request timeout in seconds
             version: API version
+            limiter: StoreRateLimiter, defaults to the shared limiter for url
+            retry_policy: RetryPolicy for transient failures
+        
+        The connection is validated in the background; requests are accepted
+        while it is connecting and refused only once the store is degraded.
         """
         self.url = url
         self.version = version
+        self.monitor = ConnectionMonitor(self.test_connection, name=url)
         
         try:
-            self.api = WooCommerceAPI(
+            self.api = ManagedAPI(WooCommerceAPI(
                 url=url,
                 consumer_key=consumer_key,
                 consumer_secret=consumer_secret,
                 wp_api=True,
                 version=version,
                 timeout=timeout
-            )
-            self.connected = self.test_connection()
+            ), limiter=limiter, retry_policy=retry_policy)
+            self.monitor.start()
         except Exception as e:
             logger.error(f"Failed to initialize WooCommerce client: {e}")
             self.api = None
-            self.connected = False
+    
+    @property
+    def state(self) -> str:
+        """connecting, healthy or degraded"""
+        if self.api is None:
+            return ConnectionState.DEGRADED
+        return self.monitor.state
+    
+    @property
+    def connected(self) -> bool:
+        return self.state != ConnectionState.DEGRADED
     
     def test_connection(self) -> bool:
         """Test the API connection"""
         try:
-            response = self.api.get("system_status")
-            return response.status_code == 200
+            return probe_store(self.api)
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
             return False
     
-    def get_products(self, **kwargs) -> Dict[str, Any]:
-        """Get products with pagination and filters"""
+    def get_products(self, fields: List[str] = None, **kwargs) -> Dict[str, Any]:
+        """Get products with pagination and filters, fields limits the returned fields"""
         if not self.connected:
             return {"error": "Not connected to store"}
         
         try:
-            response = self.api.get("products", params=kwargs)
+            response = self.api.get("products", params=with_fields(kwargs, fields))
             if response.status_code != 200:
                 return {"error": f"API error: {response.status_code}"}
             
@@ -125,13 +146,13 @@ class WooCommerceClient:
             logger.error(f"Error creating product: {e}")
             return {"error": str(e)}
     
-    def get_orders(self, **kwargs) -> Dict[str, Any]:
-        """Get orders with filters"""
+    def get_orders(self, fields: List[str] = None, **kwargs) -> Dict[str, Any]:
+        """Get orders with filters, fields limits the returned fields"""
         if not self.connected:
             return {"error": "Not connected to store"}
         
         try:
-            response = self.api.get("orders", params=kwargs)
+            response = self.api.get("orders", params=with_fields(kwargs, fields))
             if response.status_code != 200:
                 return {"error": f"API error: {response.status_code}"}
             
@@ -168,14 +189,15 @@ class WooCommerceClient:
             return {"error": "Not connected to store"}
         
         try:
-            data = {"update": updates}
-            response = self.api.post("products/batch", data)
-            if response.status_code not in [200, 201]:
-                return {"error": f"Bulk update failed: {response.status_code}"}
+            # Chunked to the 100-object batch limit, failures mapped per item
+            result = BatchWriter(self.api, "products").write(update=updates)
+            if result.requests and result.failed_requests == result.requests:
+                return {"error": f"Bulk update failed: {result.errors[0]['message']}"}
             
             return {
-                "success": True,
-                "data": response.json()
+                "success": not result.errors,
+                "data": result.combined_response(),
+                "errors": result.errors
             }
         except Exception as e:
             logger.error(f"Error in bulk update: {e}")
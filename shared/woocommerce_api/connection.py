@@ -0,0 +1,126 @@
+"""
+Store Connection State
+Background validation of store connections so startup never waits on a store
+"""
+
+from typing import Dict, Any, Optional, Callable
+from datetime import datetime
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECHECK_SECONDS = 60.0
+
+# One projected product id - proves the URL and keys work without the
+# multi-second system_status report
+PROBE_ENDPOINT = "products"
+PROBE_PARAMS = {"per_page": 1, "_fields": "id"}
+
+
+class ConnectionState:
+    """Lifecycle states of a store connection"""
+    CONNECTING = "connecting"
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+
+
+def probe_store(api) -> bool:
+    """Cheap credential check, see PROBE_PARAMS"""
+    response = api.get(PROBE_ENDPOINT, params=dict(PROBE_PARAMS))
+    return response.status_code == 200
+
+
+class ConnectionMonitor:
+    """
+    Validates a store connection on a daemon thread
+    
+    The store starts CONNECTING and becomes HEALTHY or DEGRADED once the probe
+    finishes. A DEGRADED store is probed again in the background when its
+    state is read after recheck_interval seconds, so a store that comes back
+    recovers without a restart.
+    """
+    
+    def __init__(self, probe: Callable[[], bool], name: str = "store",
+                 recheck_interval: float = DEFAULT_RECHECK_SECONDS,
+                 on_change: Callable[[str], None] = None):
+        """
+        Args:
+            probe: Returns True when the store answers correctly
+            name: Label used in log messages
+            recheck_interval: Seconds before a degraded store is probed again
+            on_change: Called with the new state after every probe
+        """
+        self.probe = probe
+        self.name = name
+        self.recheck_interval = recheck_interval
+        self.on_change = on_change
+        self._state = ConnectionState.CONNECTING
+        self.last_checked: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._checked_at = 0.0
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._running = False
+    
+    def start(self) -> "ConnectionMonitor":
+        """Begin validation in the background"""
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+            self._done.clear()
+        threading.Thread(
+            target=self._run, name=f"validate-{self.name}", daemon=True
+        ).start()
+        return self
+    
+    def _run(self):
+        error = None
+        try:
+            healthy = bool(self.probe())
+            if not healthy:
+                error = "Connection test failed"
+        except Exception as e:
+            healthy = False
+            error = str(e)
+        
+        state = ConnectionState.HEALTHY if healthy else ConnectionState.DEGRADED
+        with self._lock:
+            self._state = state
+            self.last_error = error
+            self.last_checked = datetime.now()
+            self._checked_at = time.monotonic()
+            self._running = False
+        self._done.set()
+        
+        if healthy:
+            logger.info(f"Store {self.name} is healthy")
+        else:
+            logger.warning(f"Store {self.name} is degraded: {error}")
+        
+        if self.on_change:
+            try:
+                self.on_change(state)
+            except Exception as e:
+                logger.error(f"Connection state callback failed for {self.name}: {e}")
+    
+    @property
+    def state(self) -> str:
+        if (self._state == ConnectionState.DEGRADED
+                and time.monotonic() - self._checked_at >= self.recheck_interval):
+            self.start()
+        return self._state
+    
+    def wait(self, timeout: float = None) -> str:
+        """Block until the current probe finishes (or timeout) and return the state"""
+        self._done.wait(timeout)
+        return self._state
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+            "last_error": self.last_error
+        }
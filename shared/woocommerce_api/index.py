@@ -0,0 +1,190 @@
+"""
+Resource Index
+In-memory key -> record index of a store listing, replacing per-item lookups
+"""
+
+from typing import Dict, Any, Optional, Iterable, Sequence
+from datetime import datetime, timedelta
+import threading
+import logging
+
+from .pagination import iter_items
+
+logger = logging.getLogger(__name__)
+
+SKU_INDEX_FIELDS = ("id", "sku", "date_modified", "date_modified_gmt")
+
+# Field whose maximum is the modified_after watermark of an incremental refresh
+WATERMARK_FIELD = "date_modified_gmt"
+
+
+class ResourceIndex:
+    """
+    Thread-safe index of a collection by one field (sku, slug, ...)
+    
+    Built once from a projected listing, so lookups are dict hits instead
+    of a GET per item. Writers call record() with the store's response so
+    objects created during a run are found by later lookups. A built index
+    can be kept and refresh()ed, which only lists records modified since
+    the newest date_modified_gmt it has seen.
+    """
+    
+    def __init__(self, key: str = "sku", items: Iterable[Dict[str, Any]] = (),
+                 fields: Sequence[str] = None):
+        """
+        Args:
+            key: Field to index by
+            items: Initial records
+            fields: Fields kept per record (None keeps whole records)
+        """
+        self.key = key
+        self.fields = tuple(fields) if fields else None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._keys_by_id: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self.built_at: Optional[datetime] = None
+        self.refreshed_at: Optional[datetime] = None
+        self.watermark: Optional[str] = None
+        self.endpoint: Optional[str] = None
+        self.params: Dict[str, Any] = {}
+        for item in items:
+            self.record(item)
+    
+    @classmethod
+    def build(cls, api, endpoint: str = "products", key: str = "sku",
+              fields: Sequence[str] = SKU_INDEX_FIELDS,
+              params: Dict[str, Any] = None) -> "ResourceIndex":
+        """
+        Index every record of a list endpoint
+        
+        Args:
+            api: woocommerce.API compatible client
+            endpoint: List endpoint such as "products" or "products/categories"
+            key: Field to index by
+            fields: Fields kept per record (_fields projection), must include key
+            params: Extra query parameters, e.g. {"status": "any"}
+        """
+        index = cls(key, fields=fields)
+        index.endpoint = endpoint
+        index.params = dict(params or {})
+        for item in iter_items(api, endpoint, params, fields=fields):
+            index.record(item)
+        index.built_at = index.refreshed_at = datetime.now()
+        logger.info(f"Indexed {len(index)} {endpoint} by {key}")
+        return index
+    
+    def refresh(self, api) -> int:
+        """
+        Pull records modified since the watermark into a built index
+        
+        Deletions are not visible through modified_after, so owners should
+        rebuild periodically to drop deleted records.
+        
+        Returns:
+            Number of records listed
+        """
+        if self.endpoint is None or self.watermark is None:
+            raise ValueError("Only an index built with a date_modified_gmt field can be refreshed")
+        
+        # Step back a second - modified_after is exclusive and second-granular
+        since = datetime.fromisoformat(self.watermark) - timedelta(seconds=1)
+        params = {
+            **self.params,
+            "modified_after": since.isoformat(),
+            "dates_are_gmt": "true"
+        }
+        count = 0
+        watermark = self.watermark
+        try:
+            for item in iter_items(api, self.endpoint, params, fields=self.fields):
+                self.record(item)
+                count += 1
+        except Exception:
+            # Pages after a failed one were not seen - list them again next time
+            self.watermark = watermark
+            raise
+        self.refreshed_at = datetime.now()
+        return count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form, see from_dict"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "key": self.key,
+            "fields": list(self.fields) if self.fields else None,
+            "endpoint": self.endpoint,
+            "params": self.params,
+            "built_at": self.built_at.isoformat() if self.built_at else None,
+            "entries": entries
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResourceIndex":
+        """Restore a saved index; refresh() brings it up to date"""
+        index = cls(data["key"], data.get("entries", []), fields=data.get("fields"))
+        index.endpoint = data.get("endpoint")
+        index.params = data.get("params") or {}
+        if data.get("built_at"):
+            index.built_at = index.refreshed_at = datetime.fromisoformat(data["built_at"])
+        return index
+    
+    @staticmethod
+    def _normalize(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+    
+    def record(self, item: Dict[str, Any]):
+        """Add or refresh the entry for a record (e.g. a create/update response)"""
+        value = self._normalize(item.get(self.key))
+        object_id = item.get("id")
+        modified = item.get(WATERMARK_FIELD)
+        if self.fields:
+            # Write responses carry the whole object - keep the index compact
+            item = {field: item[field] for field in self.fields if field in item}
+        with self._lock:
+            if modified and (self.watermark is None or modified > self.watermark):
+                self.watermark = modified
+            if value is None:
+                # The record lost its key (e.g. SKU cleared) - forget its old entry
+                previous = self._keys_by_id.pop(object_id, None)
+                if previous is not None:
+                    self._entries.pop(previous, None)
+                return
+            if object_id is not None:
+                # A record whose key changed must not stay findable by the old key
+                previous = self._keys_by_id.get(object_id)
+                if previous is not None and previous != value:
+                    self._entries.pop(previous, None)
+                self._keys_by_id[object_id] = value
+            self._entries[value] = item
+    
+    def discard(self, value: Any):
+        value = self._normalize(value)
+        with self._lock:
+            item = self._entries.pop(value, None)
+            if item is not None:
+                self._keys_by_id.pop(item.get("id"), None)
+    
+    def get(self, value: Any) -> Optional[Dict[str, Any]]:
+        value = self._normalize(value)
+        with self._lock:
+            return self._entries.get(value)
+    
+    def id_for(self, value: Any) -> Optional[int]:
+        entry = self.get(value)
+        return entry.get("id") if entry else None
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of all entries keyed by the index field"""
+        with self._lock:
+            return dict(self._entries)
+    
+    def __contains__(self, value: Any) -> bool:
+        return self.get(value) is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,622 @@
+"""
+Sync Journal
+Write-ahead journal of batch chunks so interrupted sync runs can resume
+"""
+
+from typing import Dict, Any, Optional, Iterable, Iterator, List, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+import json
+import os
+import queue
+import sqlite3
+import threading
+import logging
+
+from .batch import BatchWriter, BatchResult, MAX_BATCH_SIZE, DEFAULT_MAX_WORKERS
+from .sync_state import DEFAULT_SYNC_STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+# Run lifecycle
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+
+# Chunk lifecycle: intent recorded, outcome recorded, or the whole request failed
+CHUNK_PENDING = "pending"
+CHUNK_COMMITTED = "committed"
+CHUNK_FAILED = "failed"
+
+# Fields kept from each written object in a chunk outcome
+OUTCOME_FIELDS = ("id", "sku", "slug", "date_modified")
+
+# Payload fields kept once a run completes, enough for its report
+COMPACT_FIELDS = ("id", "sku", "slug")
+
+# Retention of finished runs, applied at most once per PRUNE_INTERVAL
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_MAX_RUNS = 200
+PRUNE_INTERVAL = timedelta(hours=1)
+
+
+class SyncJournal:
+    """
+    SQLite write-ahead journal of sync runs
+    
+    A run is an ordered list of steps (e.g. "products", "shop2:categories").
+    Each step is planned before anything is sent: its create/update/delete
+    payloads are split into batch chunks and recorded as pending intents.
+    Chunks are then executed and their outcome committed one by one, so a
+    crashed run can be resumed by executing only the chunks that are not
+    committed, and a finished run's report is rebuilt from the journal.
+    
+    Large steps can instead be streamed: chunks are journaled and sent as
+    the caller produces them, and the step is only marked complete once
+    the producer is exhausted.
+    
+    A completed run keeps only the identifying fields of its payloads, and
+    runs past the retention policy are pruned as new runs start, so the
+    file stays bounded under recurring scheduled syncs.
+    """
+    
+    def __init__(self, path: str = DEFAULT_SYNC_STATE_PATH,
+                 retention_days: int = DEFAULT_RETENTION_DAYS,
+                 max_runs: int = DEFAULT_MAX_RUNS):
+        """
+        Args:
+            path: SQLite file, shared with the sync state by default
+            retention_days: Runs not updated for this long are pruned
+            max_runs: Completed runs kept, most recent first
+        """
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        self.max_runs = max_runs
+        self._last_prune = None
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_runs (
+                    sync_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    steps TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    summary TEXT,
+                    error TEXT,
+                    started TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    completed TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_steps (
+                    sync_id TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    chunks INTEGER NOT NULL,
+                    info TEXT,
+                    planned TEXT NOT NULL,
+                    complete INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (sync_id, step)
+                )
+            """)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(sync_steps)")}
+            if "complete" not in columns:
+                conn.execute("ALTER TABLE sync_steps ADD COLUMN complete INTEGER NOT NULL DEFAULT 1")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_chunks (
+                    sync_id TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    chunk INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    intent TEXT NOT NULL,
+                    outcome TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    updated TEXT NOT NULL,
+                    PRIMARY KEY (sync_id, step, chunk)
+                )
+            """)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    # Runs
+    
+    def start_run(self, sync_id: str, kind: str, params: Dict[str, Any], steps: List[str]):
+        """Record a new run and the ordered steps it will execute"""
+        self._prune_if_due()
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_runs (sync_id, kind, params, steps, status, started, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sync_id, kind, json.dumps(params, default=str), json.dumps(steps),
+                 RUN_RUNNING, now, now)
+            )
+    
+    def update_summary(self, sync_id: str, **values):
+        """Merge values into the run's summary (counters gathered while planning)"""
+        run = self.get_run(sync_id)
+        summary = {**(run.get("summary") or {}), **values} if run else values
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_runs SET summary = ?, updated = ? WHERE sync_id = ?",
+                (json.dumps(summary, default=str), datetime.now().isoformat(), sync_id)
+            )
+    
+    def finish_run(self, sync_id: str, status: str = RUN_COMPLETED, error: str = None):
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_runs SET status = ?, error = ?, updated = ?, completed = ? "
+                "WHERE sync_id = ?",
+                (status, error, now, now if status == RUN_COMPLETED else None, sync_id)
+            )
+        if status == RUN_COMPLETED:
+            self._compact(sync_id)
+    
+    def reopen_run(self, sync_id: str):
+        """Mark a failed or interrupted run running again before resuming it"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_runs SET status = ?, error = NULL, updated = ? WHERE sync_id = ?",
+                (RUN_RUNNING, datetime.now().isoformat(), sync_id)
+            )
+    
+    @staticmethod
+    def _compact_body(body: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        return {
+            action: [
+                {field: payload[field] for field in COMPACT_FIELDS if field in payload}
+                if isinstance(payload, dict) else payload
+                for payload in payloads
+            ]
+            for action, payloads in body.items()
+        }
+    
+    def _compact(self, sync_id: str):
+        """Drop a completed run's full payloads; a completed run is never resumed"""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT step, chunk, intent FROM sync_chunks WHERE sync_id = ? AND status = ?",
+                (sync_id, CHUNK_COMMITTED)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE sync_chunks SET intent = ? WHERE sync_id = ? AND step = ? AND chunk = ?",
+                [
+                    (json.dumps(self._compact_body(json.loads(row["intent"])), default=str),
+                     sync_id, row["step"], row["chunk"])
+                    for row in rows
+                ]
+            )
+    
+    def prune(self) -> List[str]:
+        """
+        Delete runs not updated within the retention period, and completed
+        runs beyond the newest max_runs, with their steps and chunks
+        
+        Returns:
+            The pruned sync ids
+        """
+        cutoff = (datetime.now() - self.retention).isoformat()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT sync_id FROM sync_runs WHERE updated < ? OR (status = ? AND sync_id NOT IN "
+                "(SELECT sync_id FROM sync_runs WHERE status = ? ORDER BY started DESC LIMIT ?))",
+                (cutoff, RUN_COMPLETED, RUN_COMPLETED, self.max_runs)
+            ).fetchall()
+            sync_ids = [row["sync_id"] for row in rows]
+            for table in ("sync_chunks", "sync_steps", "sync_runs"):
+                conn.executemany(f"DELETE FROM {table} WHERE sync_id = ?", [(sync_id,) for sync_id in sync_ids])
+        
+        if sync_ids:
+            logger.info(f"Pruned {len(sync_ids)} journaled sync runs")
+        return sync_ids
+    
+    def _prune_if_due(self):
+        now = datetime.now()
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        try:
+            self.prune()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not prune the sync journal: {e}")
+    
+    @staticmethod
+    def _run_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        run = dict(row)
+        run["params"] = json.loads(run["params"])
+        run["steps"] = json.loads(run["steps"])
+        run["summary"] = json.loads(run["summary"]) if run["summary"] else {}
+        return run
+    
+    def get_run(self, sync_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM sync_runs WHERE sync_id = ?", (sync_id,)).fetchone()
+        return self._run_dict(row) if row else None
+    
+    def list_runs(self, kind: str = None, status: str = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs first, with chunk progress"""
+        query = "SELECT * FROM sync_runs WHERE 1 = 1"
+        args: List[Any] = []
+        if kind:
+            query += " AND kind = ?"
+            args.append(kind)
+        if status:
+            query += " AND status = ?"
+            args.append(status)
+        query += " ORDER BY started DESC LIMIT ?"
+        args.append(limit)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(query, args).fetchall()
+        runs = [self._run_dict(row) for row in rows]
+        for run in runs:
+            run["progress"] = self.progress(run["sync_id"])
+        return runs
+    
+    def progress(self, sync_id: str) -> Dict[str, Any]:
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS count FROM sync_chunks WHERE sync_id = ? GROUP BY status",
+                (sync_id,)
+            ).fetchall()
+        counts = {row["status"]: row["count"] for row in rows}
+        return {
+            "chunks": sum(counts.values()),
+            "committed": counts.get(CHUNK_COMMITTED, 0),
+            "failed": counts.get(CHUNK_FAILED, 0),
+            "pending": counts.get(CHUNK_PENDING, 0)
+        }
+    
+    # Steps
+    
+    def step_info(self, sync_id: str, step: str) -> Optional[Dict[str, Any]]:
+        """
+        Planning record of a step, None when it has not been planned
+        
+        complete is False for a streamed step whose producer was interrupted.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM sync_steps WHERE sync_id = ? AND step = ?", (sync_id, step)
+            ).fetchone()
+        if row is None:
+            return None
+        info = dict(row)
+        info["info"] = json.loads(info["info"]) if info["info"] else {}
+        info["complete"] = bool(info["complete"])
+        return info
+    
+    @staticmethod
+    def _chunk_bodies(items: Iterable[Tuple[str, Any]], batch_size: int) -> Iterator[Dict[str, List[Any]]]:
+        """Group (action, payload) pairs into batch request bodies"""
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        stream = iter(items)
+        while True:
+            chunk = list(islice(stream, batch_size))
+            if not chunk:
+                return
+            body: Dict[str, List[Any]] = {}
+            for action, payload in chunk:
+                if action == "delete" and isinstance(payload, dict):
+                    payload = payload.get("id")
+                body.setdefault(action, []).append(payload)
+            yield body
+    
+    def plan(self, sync_id: str, step: str, endpoint: str,
+             create: Iterable[Dict[str, Any]] = None,
+             update: Iterable[Dict[str, Any]] = None,
+             delete: Iterable[Any] = None,
+             batch_size: int = MAX_BATCH_SIZE,
+             info: Dict[str, Any] = None) -> int:
+        """
+        Record a step's writes as pending chunk intents before sending any
+        
+        Args:
+            sync_id: Run the step belongs to
+            step: Step name, unique within the run
+            endpoint: Batchable collection, e.g. "products"
+            create/update/delete: Payloads as for BatchWriter.write
+            batch_size: Objects per chunk, capped at 100
+            info: Step-level details kept for the report (e.g. conflicts)
+        
+        Returns:
+            Number of chunks planned
+        """
+        items = (
+            [("create", payload) for payload in create or []]
+            + [("update", payload) for payload in update or []]
+            + [("delete", payload) for payload in delete or []]
+        )
+        now = datetime.now().isoformat()
+        rows = [
+            (sync_id, step, number, CHUNK_PENDING, json.dumps(body, default=str), now)
+            for number, body in enumerate(self._chunk_bodies(items, batch_size))
+        ]
+        
+        with self._lock, self._connect() as conn:
+            # One transaction: a step is either fully planned or not at all
+            conn.executemany(
+                "INSERT OR REPLACE INTO sync_chunks (sync_id, step, chunk, status, intent, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_steps (sync_id, step, endpoint, chunks, info, planned) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (sync_id, step, endpoint.strip("/"), len(rows), json.dumps(info or {}, default=str), now)
+            )
+        return len(rows)
+    
+    def open_chunks(self, sync_id: str, step: str) -> List[Dict[str, Any]]:
+        """Chunks of a step that are not committed yet"""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT chunk, status, intent FROM sync_chunks "
+                "WHERE sync_id = ? AND step = ? AND status != ? ORDER BY chunk",
+                (sync_id, step, CHUNK_COMMITTED)
+            ).fetchall()
+        return [
+            {"chunk": row["chunk"], "status": row["status"], "body": json.loads(row["intent"])}
+            for row in rows
+        ]
+    
+    def _save_chunk(self, sync_id: str, step: str, chunk: int, status: str,
+                    outcome: Dict[str, Any] = None, body: Dict[str, Any] = None):
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            if body is not None:
+                conn.execute(
+                    "UPDATE sync_chunks SET intent = ?, updated = ? "
+                    "WHERE sync_id = ? AND step = ? AND chunk = ?",
+                    (json.dumps(body, default=str), now, sync_id, step, chunk)
+                )
+            conn.execute(
+                "UPDATE sync_chunks SET status = ?, outcome = ?, attempts = attempts + 1, updated = ? "
+                "WHERE sync_id = ? AND step = ? AND chunk = ?",
+                (status, json.dumps(outcome, default=str) if outcome is not None else None,
+                 now, sync_id, step, chunk)
+            )
+    
+    @staticmethod
+    def _outcome(result: BatchResult) -> Dict[str, Any]:
+        outcome: Dict[str, Any] = {
+            action: {
+                str(index): {field: item[field] for field in OUTCOME_FIELDS if field in item}
+                for index, item in items.items()
+            }
+            for action, items in result.responses.items()
+        }
+        outcome["errors"] = result.errors
+        return outcome
+    
+    def execute(self, api, sync_id: str, step: str,
+                max_workers: int = DEFAULT_MAX_WORKERS,
+                existing: Callable[[Dict[str, Any]], Optional[int]] = None,
+                on_commit: Callable[[Dict[str, Any], BatchResult], None] = None) -> Dict[str, Any]:
+        """
+        Send a step's open chunks and commit each outcome
+        
+        Args:
+            api: Client of the store the step writes to
+            sync_id: Run the step belongs to
+            step: Planned step name
+            max_workers: Chunks sent concurrently
+            existing: When resuming, returns the id of an object a pending
+                      create may already have made (e.g. by SKU); such creates
+                      are sent as updates so a retried chunk does not duplicate
+            on_commit: Called with (body, result) after each chunk commits
+        
+        Returns:
+            Aggregated step result, see step_result
+        """
+        info = self.step_info(sync_id, step)
+        if info is None:
+            raise ValueError(f"Step {step} of {sync_id} has not been planned")
+        writer = BatchWriter(api, info["endpoint"])
+        
+        chunks = self.open_chunks(sync_id, step)
+        if chunks:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                futures = [
+                    pool.submit(self._send_chunk, writer, sync_id, step, chunk, existing, on_commit)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    future.result()
+        return self.step_result(sync_id, step)
+    
+    def stream(self, api, sync_id: str, step: str, endpoint: str,
+               items: Iterable[Tuple[str, Any]], info: Dict[str, Any] = None,
+               batch_size: int = MAX_BATCH_SIZE,
+               max_workers: int = DEFAULT_MAX_WORKERS, queue_size: int = None,
+               on_commit: Callable[[Dict[str, Any], BatchResult], None] = None) -> Dict[str, Any]:
+        """
+        Journal and send a step's writes while they are still being produced
+        
+        Every full chunk is recorded as a pending intent and put on a bounded
+        queue that max_workers writer threads drain, so producing (e.g.
+        reading and transforming source pages) overlaps with writing and the
+        producer blocks instead of buffering when the store falls behind.
+        The step is marked complete, with info as it stands then, once items
+        is exhausted. Streaming into an incomplete step (a resume) appends
+        after its existing chunks; the caller must make re-produced items
+        safe to send again, e.g. by planning creates of known keys as updates.
+        
+        Args:
+            api: Client of the store the step writes to
+            sync_id: Run the step belongs to
+            step: Step name, unique within the run
+            endpoint: Batchable collection, e.g. "products"
+            items: (action, payload) pairs, action one of create/update/delete
+            info: Step-level details, may be filled in while items is consumed
+            batch_size: Objects per chunk, capped at 100
+            max_workers: Chunks sent concurrently
+            queue_size: Chunks journaled ahead of the writers (2 x max_workers)
+            on_commit: Called with (body, result) after each chunk commits
+        
+        Returns:
+            Aggregated step result, see step_result
+        """
+        endpoint = endpoint.strip("/")
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO sync_steps "
+                "(sync_id, step, endpoint, chunks, info, planned, complete) "
+                "VALUES (?, ?, ?, 0, ?, ?, 0)",
+                (sync_id, step, endpoint, json.dumps(info or {}, default=str), now)
+            )
+            row = conn.execute(
+                "SELECT COALESCE(MAX(chunk) + 1, 0) AS next FROM sync_chunks "
+                "WHERE sync_id = ? AND step = ?", (sync_id, step)
+            ).fetchone()
+        first = row["next"]
+        
+        writer = BatchWriter(api, endpoint)
+        workers = max(1, max_workers)
+        pending: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size or 2 * workers)
+        failures: List[Exception] = []
+        
+        def drain():
+            while True:
+                chunk = pending.get()
+                if chunk is None:
+                    return
+                try:
+                    self._send_chunk(writer, sync_id, step, chunk, None, on_commit)
+                except Exception as e:
+                    # The chunk stays pending in the journal for a resume
+                    logger.error(f"Chunk {chunk['chunk']} of {sync_id}/{step} failed: {e}")
+                    failures.append(e)
+        
+        threads = [
+            threading.Thread(target=drain, name=f"{step}-writer-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        number = first
+        try:
+            for body in self._chunk_bodies(items, batch_size):
+                with self._lock, self._connect() as conn:
+                    conn.execute(
+                        "INSERT INTO sync_chunks (sync_id, step, chunk, status, intent, updated) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (sync_id, step, number, CHUNK_PENDING, json.dumps(body, default=str),
+                         datetime.now().isoformat())
+                    )
+                pending.put({"chunk": number, "body": body})
+                number += 1
+        finally:
+            for _ in threads:
+                pending.put(None)
+            for thread in threads:
+                thread.join()
+        
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_steps SET chunks = ?, info = ?, complete = 1 "
+                "WHERE sync_id = ? AND step = ?",
+                (number, json.dumps(info or {}, default=str), sync_id, step)
+            )
+        if failures:
+            raise failures[0]
+        return self.step_result(sync_id, step)
+    
+    def _send_chunk(self, writer: BatchWriter, sync_id: str, step: str, chunk: Dict[str, Any],
+                    existing: Optional[Callable[[Dict[str, Any]], Optional[int]]],
+                    on_commit: Optional[Callable[[Dict[str, Any], BatchResult], None]]):
+        body = chunk["body"]
+        if existing and body.get("create"):
+            body = self._reconcile(body, existing)
+        result = writer.write(
+            create=body.get("create"), update=body.get("update"), delete=body.get("delete")
+        )
+        status = CHUNK_FAILED if result.failed_requests else CHUNK_COMMITTED
+        self._save_chunk(sync_id, step, chunk["chunk"], status, self._outcome(result), body)
+        if on_commit and status == CHUNK_COMMITTED:
+            on_commit(body, result)
+    
+    @staticmethod
+    def _reconcile(body: Dict[str, Any], existing: Callable[[Dict[str, Any]], Optional[int]]) -> Dict[str, Any]:
+        creates, updates = [], list(body.get("update") or [])
+        for payload in body["create"]:
+            object_id = existing(payload)
+            if object_id:
+                updates.append({**payload, "id": object_id})
+            else:
+                creates.append(payload)
+        reconciled = {action: items for action, items in body.items() if action not in ("create", "update")}
+        if creates:
+            reconciled["create"] = creates
+        if updates:
+            reconciled["update"] = updates
+        return reconciled
+    
+    def step_result(self, sync_id: str, step: str) -> Dict[str, Any]:
+        """
+        Aggregate a step from its chunk outcomes
+        
+        Returns:
+            Counts per action, failed items, open chunks and every written
+            item as {"action", "payload", "result"} for caller reports
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, intent, outcome FROM sync_chunks "
+                "WHERE sync_id = ? AND step = ? ORDER BY chunk", (sync_id, step)
+            ).fetchall()
+        info = self.step_info(sync_id, step) or {}
+        result = {
+            "created": 0, "updated": 0, "deleted": 0, "failed": 0,
+            "open_chunks": 0, "items": [], "errors": [], "info": info.get("info", {})
+        }
+        labels = {"create": "created", "update": "updated", "delete": "deleted"}
+        for row in rows:
+            if row["status"] == CHUNK_PENDING or row["outcome"] is None:
+                result["open_chunks"] += 1
+                continue
+            if row["status"] == CHUNK_FAILED:
+                result["open_chunks"] += 1
+            body = json.loads(row["intent"])
+            outcome = json.loads(row["outcome"])
+            for action, label in labels.items():
+                for index, item in (outcome.get(action) or {}).items():
+                    result[label] += 1
+                    result["items"].append({
+                        "action": action,
+                        "payload": body[action][int(index)],
+                        "result": item
+                    })
+            for error in outcome.get("errors", []):
+                result["failed"] += 1
+                result["errors"].append({**error, "payload": body[error["action"]][error["index"]]})
+        return result
+    
+    def committed_payloads(self, sync_id: str, step: str, key: str) -> Dict[Any, Dict[str, Any]]:
+        """
+        Payloads a step wrote successfully, by their key field (e.g. sku)
+        
+        A resumed streaming step compares what it produces again against
+        these to skip writes that were applied before the interruption.
+        """
+        return {
+            item["payload"][key]: item["payload"]
+            for item in self.step_result(sync_id, step)["items"]
+            if item["action"] != "delete" and isinstance(item["payload"], dict)
+            and item["payload"].get(key)
+        }
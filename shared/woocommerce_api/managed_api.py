@@ -0,0 +1,138 @@
+"""
+Managed WooCommerce API
+Drop-in woocommerce.API wrapper routing every request through the store limiter,
+the retry policy and the response cache
+"""
+
+from typing import Dict, Any
+import time
+import logging
+
+from .rate_limiter import StoreRateLimiter, get_store_limiter
+from .retry import RetryPolicy
+from .cache import ResponseCache
+from .coalescing import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ManagedAPI:
+    """
+    woocommerce.API compatible wrapper
+    
+    Tool modules keep calling api.get/post/put/delete as before; each call
+    waits for the store's rate token and concurrency slot and reports its
+    status and latency back so the window adapts. Transient failures are
+    retried by the retry policy, every attempt going through the limiter.
+    Reads of read-mostly endpoints are served from the response cache and
+    writes through this client invalidate the resource they touch.
+    Concurrent identical GETs are coalesced into one request.
+    
+    woocommerce.API does not accept extra headers, so expired entries are
+    refetched rather than revalidated on this path.
+    
+    A background client (see as_background) takes lower-priority limiter
+    slots, for scheduled work that must not starve interactive calls.
+    """
+    
+    def __init__(self, api, limiter: StoreRateLimiter = None,
+                 retry_policy: RetryPolicy = None, cache: ResponseCache = None,
+                 settings=None, background: bool = False):
+        """
+        Args:
+            api: woocommerce.API instance
+            limiter: Explicit limiter, defaults to the shared one for api.url
+            retry_policy: Explicit retry policy, defaults to one built from settings
+            cache: Explicit response cache, defaults to one built from settings
+            settings: WooCommerceSettings-like object used for the defaults
+            background: Acquire background limiter slots
+        """
+        self.api = api
+        self.background = background
+        self.limiter = limiter or get_store_limiter(api.url, settings=settings)
+        if retry_policy is None:
+            retry_policy = RetryPolicy.from_settings(settings) if settings is not None else RetryPolicy()
+        self.retry_policy = retry_policy
+        if cache is None:
+            cache = ResponseCache.from_settings(settings) if settings is not None else ResponseCache()
+        self.cache = cache
+        self.single_flight = SingleFlight()
+    
+    def as_background(self) -> "ManagedAPI":
+        """Client for the same store sharing limiter, retries and cache, at background priority"""
+        return ManagedAPI(
+            self.api, limiter=self.limiter, retry_policy=self.retry_policy,
+            cache=self.cache, background=True
+        )
+    
+    def __getattr__(self, name: str) -> Any:
+        # url, version, timeout, ... of the wrapped client
+        return getattr(self.api, name)
+    
+    def _request(self, method: str, endpoint: str, *args, **kwargs):
+        data = args[0] if args else kwargs.get("data")
+        return self.retry_policy.call(
+            lambda: self._send(method, endpoint, *args, **kwargs), method, endpoint, data
+        )
+    
+    def _send(self, method: str, endpoint: str, *args, **kwargs):
+        """Single attempt under the store limiter"""
+        self.limiter.acquire(self.background)
+        start = time.monotonic()
+        status_code = None
+        try:
+            response = getattr(self.api, method)(endpoint, *args, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            self.limiter.release(status_code, time.monotonic() - start, self.background)
+    
+    def _write(self, method: str, endpoint: str, *args, **kwargs):
+        try:
+            return self._request(method, endpoint, *args, **kwargs)
+        finally:
+            self.cache.invalidate(self.api.url, endpoint)
+    
+    def _fetch(self, endpoint: str, key, resource, **kwargs):
+        response = self._request("get", endpoint, **kwargs)
+        if resource is not None and response.status_code == 200:
+            self.cache.store(key, response, resource)
+        return response
+    
+    def get(self, endpoint: str, **kwargs):
+        # Only plain reads are cached or shared - stream=True and similar need a live response
+        if set(kwargs) - {"params"}:
+            return self._request("get", endpoint, **kwargs)
+        
+        key = self.cache.make_key(self.api.url, endpoint, kwargs.get("params"))
+        resource = self.cache.resource_for(endpoint)
+        if resource is not None:
+            entry, fresh = self.cache.lookup(key)
+            if fresh:
+                return entry.response
+        
+        # Concurrent identical reads share one in-flight request
+        return self.single_flight.do(
+            key, lambda: self._fetch(endpoint, key, resource, **kwargs)
+        )
+    
+    def post(self, endpoint: str, data, **kwargs):
+        return self._write("post", endpoint, data, **kwargs)
+    
+    def put(self, endpoint: str, data, **kwargs):
+        return self._write("put", endpoint, data, **kwargs)
+    
+    def delete(self, endpoint: str, **kwargs):
+        return self._write("delete", endpoint, **kwargs)
+    
+    def options(self, endpoint: str, **kwargs):
+        return self._request("options", endpoint, **kwargs)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Limiter, retry, cache and coalescing counters for this store"""
+        return {
+            "limiter": self.limiter.stats(),
+            "retries": self.retry_policy.stats(),
+            "cache": self.cache.stats(),
+            "coalescing": self.single_flight.stats()
+        }
@@ -0,0 +1,320 @@
+"""
+Parallel Page Fetcher
+Reads X-WP-TotalPages from the first page and fetches the rest concurrently
+"""
+
+from typing import Dict, Any, Optional, List, Iterator, AsyncIterator, Tuple, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import asyncio
+import logging
+
+from .streaming import iter_json_array, STREAM_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# WooCommerce REST API caps per_page at 100
+MAX_PER_PAGE = 100
+DEFAULT_MAX_WORKERS = 4
+
+Page = List[Dict[str, Any]]
+
+
+class PageFetchError(RuntimeError):
+    """A page of a list endpoint could not be fetched, so the listing is incomplete"""
+    
+    def __init__(self, endpoint: str, page: int, reason: str):
+        super().__init__(f"Page {page} of {endpoint} failed: {reason}")
+        self.endpoint = endpoint
+        self.page = page
+
+
+def with_fields(params: Optional[Dict[str, Any]], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """
+    Copy params and add a _fields projection
+    
+    The REST API then only serializes the listed top-level fields, e.g.
+    ["id", "sku", "date_modified"] instead of full product objects.
+    """
+    projected = dict(params or {})
+    if fields:
+        projected["_fields"] = ",".join(fields)
+    return projected
+
+
+def _page_params(params: Optional[Dict[str, Any]], page: int, per_page: int) -> Dict[str, Any]:
+    """Copy caller params and set the page window"""
+    page_params = dict(params or {})
+    page_params["page"] = page
+    page_params["per_page"] = min(per_page, MAX_PER_PAGE)
+    return page_params
+
+
+def _total_pages(headers) -> Optional[int]:
+    """Read X-WP-TotalPages, None when the server (or a proxy) stripped it"""
+    value = headers.get("X-WP-TotalPages")
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_page(endpoint: str, page: int, response) -> Tuple[Page, Optional[int]]:
+    """Decode a page response into (items, total_pages)"""
+    if response.status_code != 200:
+        raise PageFetchError(endpoint, page, f"HTTP {response.status_code}")
+    return response.json(), _total_pages(response.headers)
+
+
+def _fetch_page(api, endpoint: str, params: Optional[Dict[str, Any]],
+                page: int, per_page: int) -> Tuple[Page, Optional[int]]:
+    """Fetch one page, raising PageFetchError when the request failed"""
+    try:
+        response = api.get(endpoint, params=_page_params(params, page, per_page))
+    except Exception as e:
+        raise PageFetchError(endpoint, page, str(e)) from e
+    return _read_page(endpoint, page, response)
+
+
+def iter_pages(api, endpoint: str, params: Dict[str, Any] = None,
+               per_page: int = MAX_PER_PAGE, max_workers: int = DEFAULT_MAX_WORKERS,
+               ordered: bool = True, max_pages: int = None,
+               fields: Sequence[str] = None) -> Iterator[Page]:
+    """
+    Yield pages of a WooCommerce list endpoint
+    
+    The first page is fetched alone to learn X-WP-TotalPages; the remaining
+    pages are fetched on a bounded thread pool. Without a total-pages header
+    it falls back to serial paging.
+    
+    A page that still fails after the client's retries raises PageFetchError,
+    so callers never mistake a partial listing for the whole collection.
+    
+    Args:
+        api: woocommerce.API compatible client (get returns a response)
+        endpoint: List endpoint such as "products" or "orders"
+        params: Extra query parameters (filters)
+        per_page: Page size, capped at 100
+        max_workers: Concurrent page requests
+        ordered: Yield pages in page order (False yields as they complete)
+        max_pages: Stop after this many pages
+        fields: Only fetch these top-level fields (_fields projection)
+    """
+    params = with_fields(params, fields)
+    first, total_pages = _fetch_page(api, endpoint, params, 1, per_page)
+    if not first:
+        return
+    
+    yield first
+    
+    if total_pages is None:
+        # Headers unavailable - walk pages one by one until an empty page
+        page = 2
+        while max_pages is None or page <= max_pages:
+            items, _ = _fetch_page(api, endpoint, params, page, per_page)
+            if not items:
+                break
+            yield items
+            page += 1
+        return
+    
+    if max_pages is not None:
+        total_pages = min(total_pages, max_pages)
+    if total_pages <= 1:
+        return
+    
+    workers = max(1, max_workers)
+    remaining = iter(range(2, total_pages + 1))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    in_flight = {}
+    
+    def submit_next():
+        page = next(remaining, None)
+        if page is not None:
+            future = pool.submit(_fetch_page, api, endpoint, params, page, per_page)
+            in_flight[future] = page
+    
+    try:
+        # Keep at most two pages per worker queued so memory stays bounded
+        for _ in range(workers * 2):
+            submit_next()
+        
+        completed = {}
+        next_page = 2
+        
+        while in_flight or completed:
+            if ordered and next_page in completed:
+                items = completed.pop(next_page)
+                next_page += 1
+                if items:
+                    yield items
+                continue
+            
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                page = in_flight.pop(future)
+                items, _ = future.result()
+                submit_next()
+                if ordered:
+                    completed[page] = items
+                elif items:
+                    yield items
+    finally:
+        # Consumer may stop early - drop queued pages instead of fetching them
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_items(api, endpoint: str, params: Dict[str, Any] = None,
+               per_page: int = MAX_PER_PAGE, max_workers: int = DEFAULT_MAX_WORKERS,
+               ordered: bool = True, max_items: int = None,
+               fields: Sequence[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield individual records of a list endpoint, see iter_pages"""
+    count = 0
+    for page in iter_pages(api, endpoint, params, per_page, max_workers, ordered, fields=fields):
+        for item in page:
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+
+
+def stream_items(api, endpoint: str, params: Dict[str, Any] = None,
+                 per_page: int = MAX_PER_PAGE, max_items: int = None,
+                 fields: Sequence[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records of a list endpoint, decoding each page as it downloads
+    
+    Pages are requested one at a time with stream=True and parsed with
+    iter_json_array, so at most one record is fully materialized on top of
+    what the consumer keeps. Use it for exports and aggregations over large
+    collections; iter_items is faster when memory is not a concern.
+    
+    Args:
+        api: woocommerce.API compatible client passing stream=True to requests
+        endpoint: List endpoint such as "orders"
+        params: Extra query parameters (filters)
+        per_page: Page size, capped at 100
+        max_items: Stop after this many records
+        fields: Only fetch these top-level fields (_fields projection)
+    
+    Raises:
+        PageFetchError: A page failed; records already yielded are kept
+    """
+    params = with_fields(params, fields)
+    count = 0
+    page = 1
+    total_pages = None
+    
+    while total_pages is None or page <= total_pages:
+        try:
+            response = api.get(endpoint, params=_page_params(params, page, per_page), stream=True)
+        except Exception as e:
+            raise PageFetchError(endpoint, page, str(e)) from e
+        
+        try:
+            if response.status_code != 200:
+                raise PageFetchError(endpoint, page, f"HTTP {response.status_code}")
+            if total_pages is None:
+                total_pages = _total_pages(response.headers)
+            
+            page_count = 0
+            for item in iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE)):
+                yield item
+                page_count += 1
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+        finally:
+            response.close()
+        
+        if page_count == 0:
+            break
+        page += 1
+
+
+async def _afetch_page(client, endpoint: str, params: Optional[Dict[str, Any]],
+                       page: int, per_page: int) -> Tuple[Page, Optional[int]]:
+    """Async counterpart of _fetch_page for AsyncWooCommerceClient"""
+    try:
+        response = await client.get(endpoint, params=_page_params(params, page, per_page))
+    except Exception as e:
+        raise PageFetchError(endpoint, page, str(e)) from e
+    return _read_page(endpoint, page, response)
+
+
+async def aiter_pages(client, endpoint: str, params: Dict[str, Any] = None,
+                      per_page: int = MAX_PER_PAGE, max_workers: int = DEFAULT_MAX_WORKERS,
+                      ordered: bool = True, max_pages: int = None,
+                      fields: Sequence[str] = None) -> AsyncIterator[Page]:
+    """Async iter_pages for AsyncWooCommerceClient, concurrency bounded by max_workers"""
+    params = with_fields(params, fields)
+    first, total_pages = await _afetch_page(client, endpoint, params, 1, per_page)
+    if not first:
+        return
+    
+    yield first
+    
+    if total_pages is None:
+        page = 2
+        while max_pages is None or page <= max_pages:
+            items, _ = await _afetch_page(client, endpoint, params, page, per_page)
+            if not items:
+                break
+            yield items
+            page += 1
+        return
+    
+    if max_pages is not None:
+        total_pages = min(total_pages, max_pages)
+    
+    workers = max(1, max_workers)
+    remaining = iter(range(2, total_pages + 1))
+    in_flight = {}
+    
+    def submit_next():
+        page = next(remaining, None)
+        if page is not None:
+            task = asyncio.ensure_future(_afetch_page(client, endpoint, params, page, per_page))
+            in_flight[task] = page
+    
+    try:
+        for _ in range(workers):
+            submit_next()
+        
+        completed = {}
+        next_page = 2
+        
+        while in_flight or completed:
+            if ordered and next_page in completed:
+                items = completed.pop(next_page)
+                next_page += 1
+                if items:
+                    yield items
+                continue
+            
+            done, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page = in_flight.pop(task)
+                items, _ = task.result()
+                submit_next()
+                if ordered:
+                    completed[page] = items
+                elif items:
+                    yield items
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+async def aiter_items(client, endpoint: str, params: Dict[str, Any] = None,
+                      per_page: int = MAX_PER_PAGE, max_workers: int = DEFAULT_MAX_WORKERS,
+                      ordered: bool = True, max_items: int = None,
+                      fields: Sequence[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Async iter_items for AsyncWooCommerceClient"""
+    count = 0
+    async for page in aiter_pages(client, endpoint, params, per_page, max_workers, ordered,
+                                  fields=fields):
+        for item in page:
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
@@ -0,0 +1,402 @@
+"""
+Store Rate Limiter
+Per-store token bucket plus an AIMD concurrency window shared by all API clients
+"""
+
+from typing import Dict, Any, Optional
+import asyncio
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Mirrors WooCommerceSettings defaults in mcp-woocommerce-suite
+DEFAULT_RATE_LIMIT_PER_MINUTE = 60
+DEFAULT_CONCURRENT_REQUESTS = 5
+DEFAULT_SLOW_REQUEST_SECONDS = 5.0
+
+# Responses that mean the store (or its WAF) wants us to back off
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Part of the concurrency window background (scheduled) traffic may use
+DEFAULT_BACKGROUND_SHARE = 0.5
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+    
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        """
+        Args:
+            rate_per_minute: Sustained request rate
+            capacity: Burst size, defaults to one second worth of tokens (min 1)
+        """
+        self.rate = max(rate_per_minute, 1) / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def set_rate(self, rate_per_minute: float, capacity: float = None):
+        """Change rate and burst size, keeping tokens already earned"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(rate_per_minute, 1) / 60.0
+            self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+            self.tokens = min(self.tokens, self.capacity)
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # Token is borrowed from the future - wait until it has been refilled
+            return -self.tokens / self.rate
+    
+    def try_take(self) -> bool:
+        """Take a token only if one is available now (never borrows)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+    
+    def acquire(self):
+        """Block until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def acquire_background(self):
+        """
+        Wait for a token without borrowing from the future
+        
+        Foreground callers reserve ahead and queue behind borrowed tokens;
+        background callers only take tokens that are already there, so they
+        never add to the queue a foreground request waits in.
+        """
+        while not self.try_take():
+            time.sleep(1.0 / self.rate)
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    async def acquire_background_async(self):
+        """acquire_background without blocking the event loop"""
+        while not self.try_take():
+            await asyncio.sleep(1.0 / self.rate)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency window
+    
+    The window grows by one slot per window of healthy responses and is
+    halved on throttling responses (429/503), connection failures or
+    responses slower than slow_threshold. Decreases are spaced by
+    cooldown seconds so one burst of failures only halves the window once.
+    
+    Background slots (scheduled syncs) are capped at background_share of
+    the window and are not handed out while a foreground caller waits.
+    """
+    
+    def __init__(self, max_limit: int, min_limit: int = 1,
+                 slow_threshold: float = DEFAULT_SLOW_REQUEST_SECONDS,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0,
+                 background_share: float = DEFAULT_BACKGROUND_SHARE):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.slow_threshold = slow_threshold
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.background_share = background_share
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.background_in_flight = 0
+        self.waiting = 0
+        self.last_decrease = 0.0
+        self._condition = threading.Condition()
+    
+    @property
+    def window(self) -> int:
+        return max(self.min_limit, int(self.limit))
+    
+    def set_max_limit(self, max_limit: int):
+        """Change the window's upper bound; a smaller bound takes effect at once"""
+        with self._condition:
+            self.max_limit = max(1, max_limit)
+            self.min_limit = min(self.min_limit, self.max_limit)
+            self.limit = min(self.limit, float(self.max_limit))
+            self._condition.notify_all()
+    
+    @property
+    def background_window(self) -> int:
+        return max(1, int(self.window * self.background_share))
+    
+    def _has_room(self, background: bool) -> bool:
+        if self.in_flight >= self.window:
+            return False
+        if background:
+            return self.waiting == 0 and self.background_in_flight < self.background_window
+        return True
+    
+    def _take(self, background: bool):
+        self.in_flight += 1
+        if background:
+            self.background_in_flight += 1
+    
+    def try_acquire(self, background: bool = False) -> bool:
+        """Take a slot if the window has room"""
+        with self._condition:
+            if self._has_room(background):
+                self._take(background)
+                return True
+            return False
+    
+    def acquire(self, background: bool = False):
+        """Block until a slot is free"""
+        with self._condition:
+            if not background:
+                self.waiting += 1
+            try:
+                while not self._has_room(background):
+                    self._condition.wait()
+            finally:
+                if not background:
+                    self.waiting -= 1
+            self._take(background)
+    
+    async def acquire_async(self, background: bool = False, poll_interval: float = 0.05):
+        """Wait for a slot without blocking the event loop, with acquire's priorities"""
+        if self.try_acquire(background):
+            return
+        if not background:
+            with self._condition:
+                self.waiting += 1
+        try:
+            while not self.try_acquire(background):
+                await asyncio.sleep(poll_interval)
+        finally:
+            if not background:
+                with self._condition:
+                    self.waiting -= 1
+    
+    def cancel(self, background: bool = False):
+        """Return a slot whose request was never sent, leaving the window as it is"""
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            if background:
+                self.background_in_flight = max(0, self.background_in_flight - 1)
+            self._condition.notify_all()
+    
+    def release(self, status_code: Optional[int], latency: float, background: bool = False):
+        """
+        Return a slot and adjust the window
+        
+        Args:
+            status_code: HTTP status, None when the request raised
+            latency: Request duration in seconds
+            background: The slot was taken with background=True
+        """
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            if background:
+                self.background_in_flight = max(0, self.background_in_flight - 1)
+            
+            congested = (
+                status_code is None
+                or status_code in THROTTLE_STATUS_CODES
+                or latency > self.slow_threshold
+            )
+            now = time.monotonic()
+            
+            if congested:
+                if now - self.last_decrease >= self.cooldown:
+                    previous = self.window
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self.last_decrease = now
+                    if self.window != previous:
+                        logger.info(
+                            f"Concurrency window reduced {previous} -> {self.window} "
+                            f"(status={status_code}, latency={latency:.2f}s)"
+                        )
+            elif self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.window)
+            
+            self._condition.notify_all()
+
+
+class StoreRateLimiter:
+    """Rate and concurrency limits for one store, shared by every client talking to it"""
+    
+    def __init__(self, rate_limit_per_minute: int = DEFAULT_RATE_LIMIT_PER_MINUTE,
+                 concurrent_requests: int = DEFAULT_CONCURRENT_REQUESTS,
+                 slow_request_seconds: float = DEFAULT_SLOW_REQUEST_SECONDS):
+        """
+        Args:
+            rate_limit_per_minute: Sustained request rate for the store
+            concurrent_requests: Upper bound of the concurrency window
+            slow_request_seconds: Latency above which a response counts as congestion
+        """
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.concurrent_requests = concurrent_requests
+        self.bucket = TokenBucket(rate_limit_per_minute, capacity=max(1, concurrent_requests))
+        self.concurrency = AdaptiveConcurrency(
+            concurrent_requests, slow_threshold=slow_request_seconds
+        )
+        self.total_requests = 0
+        self.background_requests = 0
+        self.throttled_responses = 0
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def settings_kwargs(settings) -> Dict[str, Any]:
+        """Constructor arguments from a WooCommerceSettings-like object"""
+        return {
+            "rate_limit_per_minute": getattr(settings, "rate_limit_per_minute", DEFAULT_RATE_LIMIT_PER_MINUTE),
+            "concurrent_requests": getattr(settings, "concurrent_requests", DEFAULT_CONCURRENT_REQUESTS),
+            "slow_request_seconds": getattr(settings, "slow_request_seconds", DEFAULT_SLOW_REQUEST_SECONDS)
+        }
+    
+    @classmethod
+    def from_settings(cls, settings) -> "StoreRateLimiter":
+        """Build from a WooCommerceSettings-like object"""
+        return cls(**cls.settings_kwargs(settings))
+    
+    def reconfigure(self, rate_limit_per_minute: int = None, concurrent_requests: int = None,
+                    slow_request_seconds: float = None) -> Dict[str, Any]:
+        """
+        Apply new limits in place, keeping in-flight accounting and stats
+        
+        Returns:
+            The settings that changed, {name: (old, new)}
+        """
+        changed = {}
+        if rate_limit_per_minute is not None and rate_limit_per_minute != self.rate_limit_per_minute:
+            changed["rate_limit_per_minute"] = (self.rate_limit_per_minute, rate_limit_per_minute)
+            self.rate_limit_per_minute = rate_limit_per_minute
+        if concurrent_requests is not None and concurrent_requests != self.concurrent_requests:
+            changed["concurrent_requests"] = (self.concurrent_requests, concurrent_requests)
+            self.concurrent_requests = concurrent_requests
+            self.concurrency.set_max_limit(concurrent_requests)
+        if "rate_limit_per_minute" in changed or "concurrent_requests" in changed:
+            self.bucket.set_rate(self.rate_limit_per_minute, capacity=max(1, self.concurrent_requests))
+        if (slow_request_seconds is not None
+                and slow_request_seconds != self.concurrency.slow_threshold):
+            changed["slow_request_seconds"] = (self.concurrency.slow_threshold, slow_request_seconds)
+            self.concurrency.slow_threshold = slow_request_seconds
+        return changed
+    
+    def acquire(self, background: bool = False):
+        """
+        Wait for a concurrency slot, then for a rate token
+        
+        Background requests (scheduled syncs) only use part of the window,
+        give way to waiting foreground requests and never borrow rate
+        tokens, so interactive tool calls are not starved by them.
+        """
+        self.concurrency.acquire(background)
+        try:
+            if background:
+                self.bucket.acquire_background()
+            else:
+                self.bucket.acquire()
+        except BaseException:
+            self.concurrency.cancel(background)
+            raise
+    
+    async def acquire_async(self, background: bool = False):
+        """
+        acquire without blocking the event loop
+        
+        A caller cancelled while waiting for its rate token gives its
+        concurrency slot back, so cancelled tasks cannot fill the window.
+        """
+        await self.concurrency.acquire_async(background)
+        try:
+            if background:
+                await self.bucket.acquire_background_async()
+            else:
+                await self.bucket.acquire_async()
+        except BaseException:
+            self.concurrency.cancel(background)
+            raise
+    
+    def release(self, status_code: Optional[int], latency: float, background: bool = False):
+        """Report the outcome of a request started with acquire"""
+        with self._stats_lock:
+            self.total_requests += 1
+            if background:
+                self.background_requests += 1
+            if status_code in THROTTLE_STATUS_CODES:
+                self.throttled_responses += 1
+        self.concurrency.release(status_code, latency, background)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate_limit_per_minute": self.rate_limit_per_minute,
+            "max_concurrency": self.concurrent_requests,
+            "current_window": self.concurrency.window,
+            "in_flight": self.concurrency.in_flight,
+            "background_in_flight": self.concurrency.background_in_flight,
+            "total_requests": self.total_requests,
+            "background_requests": self.background_requests,
+            "throttled_responses": self.throttled_responses
+        }
+
+
+_limiters: Dict[str, StoreRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _store_key(url: str) -> str:
+    return url.rstrip("/").lower()
+
+
+def get_store_limiter(url: str, settings=None, **kwargs) -> StoreRateLimiter:
+    """
+    Return the limiter for a store, creating it on first use
+    
+    Sync and async clients for the same store URL share one limiter so
+    their combined traffic stays within the store's limits. Settings given
+    for a store that already has a limiter are applied to it, so the most
+    recent configuration wins.
+    
+    Args:
+        url: Store URL
+        settings: Optional WooCommerceSettings-like object
+        **kwargs: StoreRateLimiter arguments when no settings are given
+    """
+    key = _store_key(url)
+    if settings is not None:
+        kwargs = StoreRateLimiter.settings_kwargs(settings)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = StoreRateLimiter(**kwargs)
+            _limiters[key] = limiter
+        elif kwargs:
+            changed = limiter.reconfigure(**kwargs)
+            if changed:
+                logger.info(
+                    f"Rate limiter for {key} reconfigured: "
+                    + ", ".join(f"{name} {old} -> {new}" for name, (old, new) in changed.items())
+                )
+        return limiter
+
+
+def remove_store_limiter(url: str):
+    """Forget a store's limiter (store removed or credentials changed)"""
+    with _limiters_lock:
+        _limiters.pop(_store_key(url), None)
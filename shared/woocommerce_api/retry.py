@@ -0,0 +1,263 @@
+"""
+Retry Policy
+Decorrelated-jitter retries with Retry-After support for WooCommerce requests
+"""
+
+from typing import Dict, Any, Optional, Callable, Awaitable
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Mirrors WooCommerceSettings defaults in mcp-woocommerce-suite
+DEFAULT_RETRY_COUNT = 3
+DEFAULT_RETRY_DELAY = 2.0
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_RETRY_BUDGET_SECONDS = 120.0
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("get", "head", "options")
+
+try:
+    import httpx
+    TRANSIENT_ERRORS = (OSError, httpx.TransportError)
+    HTTPX_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+except ImportError:
+    # requests exceptions derive from IOError
+    TRANSIENT_ERRORS = (OSError,)
+    HTTPX_CONNECT_ERRORS = ()
+
+try:
+    from requests.exceptions import ConnectTimeout, ConnectionError as RequestsConnectionError
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+except ImportError:
+    ConnectTimeout = RequestsConnectionError = MaxRetryError = NewConnectionError = None
+
+
+def is_batch_endpoint(endpoint: str) -> bool:
+    return endpoint.split("?", 1)[0].rstrip("/").endswith("/batch")
+
+
+def has_batch_creates(endpoint: str, data: Any) -> bool:
+    """Whether a request is a batch write carrying create items"""
+    return is_batch_endpoint(endpoint) and isinstance(data, dict) and bool(data.get("create"))
+
+
+def is_connect_error(error: Optional[Exception]) -> bool:
+    """
+    Whether a request failed before any of it reached the store
+    
+    Refused connections, DNS failures and connect timeouts qualify; read
+    timeouts and dropped connections do not, the store may have acted on them.
+    """
+    if error is None:
+        return False
+    if isinstance(error, (ConnectionRefusedError,) + HTTPX_CONNECT_ERRORS):
+        return True
+    if ConnectTimeout is not None and isinstance(error, ConnectTimeout):
+        return True
+    if RequestsConnectionError is not None and isinstance(error, RequestsConnectionError):
+        # requests wraps urllib3's connect failure in MaxRetryError
+        reason = error.args[0] if error.args else None
+        if isinstance(reason, MaxRetryError):
+            reason = reason.reason
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class RetryPolicy:
+    """
+    Central retry policy for store requests
+    
+    Idempotent reads are retried on transient failures. Batch writes are
+    retried too, as update/delete entries are keyed by id. A batch that
+    carries create items is only retried when the connection never opened:
+    creates without a SKU have nothing to dedupe them, so a replay after a
+    timeout or 5xx could add the items twice. Other writes are sent once.
+    
+    Each request gets at most max_retries retries and retry_budget seconds of
+    total waiting; a Retry-After beyond the remaining budget ends the retries.
+    """
+    
+    def __init__(self, max_retries: int = DEFAULT_RETRY_COUNT,
+                 base_delay: float = DEFAULT_RETRY_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY,
+                 retry_budget: float = DEFAULT_RETRY_BUDGET_SECONDS):
+        """
+        Args:
+            max_retries: Retries per request after the first attempt
+            base_delay: Smallest backoff in seconds
+            max_delay: Largest single backoff in seconds
+            retry_budget: Total seconds a request may spend waiting between attempts
+        """
+        self.max_retries = max(0, max_retries)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.retry_budget = retry_budget
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "recovered": 0,
+            "exhausted": 0,
+            "retry_after_honored": 0
+        }
+        self.retries_by_status: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls, settings) -> "RetryPolicy":
+        """Build from a WooCommerceSettings-like object"""
+        return cls(
+            max_retries=getattr(settings, "api_retry_count", DEFAULT_RETRY_COUNT),
+            base_delay=getattr(settings, "api_retry_delay", DEFAULT_RETRY_DELAY)
+        )
+    
+    def should_retry_request(self, method: str, endpoint: str) -> bool:
+        method = method.lower()
+        if method in IDEMPOTENT_METHODS:
+            return True
+        return method in ("post", "put") and is_batch_endpoint(endpoint)
+    
+    def next_delay(self, previous: float) -> float:
+        """Decorrelated jitter: uniform between base and three times the last delay"""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+    
+    @staticmethod
+    def retry_after(response) -> Optional[float]:
+        """Seconds requested by a Retry-After header (delta or HTTP date)"""
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    def _count(self, key: str, status: str = None):
+        with self._lock:
+            self.counters[key] += 1
+            if status is not None:
+                self.retries_by_status[status] = self.retries_by_status.get(status, 0) + 1
+    
+    def _plan_retry(self, attempt: int, response, error: Optional[Exception],
+                    previous_delay: float, waited: float,
+                    connect_only: bool = False) -> Optional[float]:
+        """Delay before the next attempt, None when the request should not be retried"""
+        if connect_only and not is_connect_error(error):
+            return None
+        if error is not None:
+            status = type(error).__name__
+        elif response.status_code in RETRYABLE_STATUS_CODES:
+            status = str(response.status_code)
+        else:
+            return None
+        
+        if attempt >= self.max_retries:
+            self._count("exhausted")
+            return None
+        
+        delay = self.next_delay(previous_delay)
+        requested = self.retry_after(response) if error is None else None
+        if requested is not None:
+            delay = requested
+        
+        if waited + delay > self.retry_budget:
+            self._count("exhausted")
+            return None
+        
+        if requested is not None:
+            self._count("retry_after_honored")
+        self._count("retries", status)
+        return delay
+    
+    def call(self, send: Callable[[], Any], method: str, endpoint: str,
+             data: Any = None):
+        """
+        Run send() with retries, returning the last response or raising the last error
+        
+        data is the request body, checked for batch create items.
+        """
+        self._count("requests")
+        if not self.should_retry_request(method, endpoint):
+            return send()
+        
+        connect_only = has_batch_creates(endpoint, data)
+        attempt, delay, waited = 0, self.base_delay, 0.0
+        while True:
+            response, error = None, None
+            try:
+                response = send()
+            except TRANSIENT_ERRORS as e:
+                error = e
+            
+            delay = self._plan_retry(attempt, response, error, delay, waited, connect_only)
+            if delay is None:
+                if attempt and error is None and response.status_code not in RETRYABLE_STATUS_CODES:
+                    self._count("recovered")
+                if error is not None:
+                    raise error
+                return response
+            
+            attempt += 1
+            waited += delay
+            logger.warning(
+                f"Retrying {method.upper()} {endpoint} in {delay:.1f}s "
+                f"(attempt {attempt}/{self.max_retries}, "
+                f"{error or 'HTTP ' + str(response.status_code)})"
+            )
+            time.sleep(delay)
+    
+    async def acall(self, send: Callable[[], Awaitable[Any]], method: str, endpoint: str,
+                    data: Any = None):
+        """Async counterpart of call"""
+        self._count("requests")
+        if not self.should_retry_request(method, endpoint):
+            return await send()
+        
+        connect_only = has_batch_creates(endpoint, data)
+        attempt, delay, waited = 0, self.base_delay, 0.0
+        while True:
+            response, error = None, None
+            try:
+                response = await send()
+            except TRANSIENT_ERRORS as e:
+                error = e
+            
+            delay = self._plan_retry(attempt, response, error, delay, waited, connect_only)
+            if delay is None:
+                if attempt and error is None and response.status_code not in RETRYABLE_STATUS_CODES:
+                    self._count("recovered")
+                if error is not None:
+                    raise error
+                return response
+            
+            attempt += 1
+            waited += delay
+            logger.warning(
+                f"Retrying {method.upper()} {endpoint} in {delay:.1f}s "
+                f"(attempt {attempt}/{self.max_retries}, "
+                f"{error or 'HTTP ' + str(response.status_code)})"
+            )
+            await asyncio.sleep(delay)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "retries_by_status": dict(self.retries_by_status),
+                "max_retries": self.max_retries,
+                "base_delay": self.base_delay
+            }
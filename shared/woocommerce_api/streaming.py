@@ -0,0 +1,94 @@
+"""
+Streaming JSON Decoding
+Incrementally decode a JSON array response into records without building the page
+"""
+
+from typing import Any, Iterable, Iterator, Union
+import codecs
+import json
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as they arrive
+    
+    Only the element currently being decoded is buffered, so a page of large
+    orders never exists as both raw text and a full list of dicts.
+    
+    Args:
+        chunks: Byte (UTF-8) or text chunks, e.g. response.iter_content()
+    
+    Raises:
+        ValueError: The body is not a JSON array or ends prematurely
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    exhausted = False
+    started = False
+    
+    def more() -> bool:
+        nonlocal buffer, pos, exhausted
+        for chunk in chunks:
+            text = utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                # Drop what has already been decoded before growing the buffer
+                buffer = buffer[pos:] + text
+                pos = 0
+                return True
+        tail = utf8.decode(b"", final=True)
+        if tail:
+            buffer = buffer[pos:] + tail
+            pos = 0
+        exhausted = True
+        return bool(tail)
+    
+    def skip(chars: str) -> bool:
+        """Advance past chars, pulling chunks as needed; False at end of input"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if exhausted or not more():
+                return False
+    
+    if not skip(_WHITESPACE + "\ufeff") or buffer[pos] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    
+    while True:
+        if not skip(_WHITESPACE):
+            raise ValueError("Unterminated JSON array")
+        if buffer[pos] == "]":
+            return
+        if started:
+            if buffer[pos] != ",":
+                raise ValueError(f"Expected ',' in JSON array, got {buffer[pos]!r}")
+            pos += 1
+            if not skip(_WHITESPACE):
+                raise ValueError("Unterminated JSON array")
+        
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number cut at a chunk edge decodes as a shorter number - only
+                # accept scalars once the delimiter after them has arrived
+                if (exhausted or isinstance(value, (dict, list, str))
+                        or (end < len(buffer) and buffer[end] in _WHITESPACE + ",]")):
+                    break
+            except ValueError:
+                if exhausted:
+                    raise
+            more()
+        
+        pos = end
+        started = True
+        yield value
@@ -0,0 +1,239 @@
+"""
+Sync State
+Local record of what was last pushed per (store, SKU) for delta syncs
+"""
+
+from typing import Dict, Any, Optional, Iterable, Iterator, List
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_STATE_PATH = os.getenv("WOOCOMMERCE_SYNC_STATE_DB", "./sync_state.db")
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """Canonical hash of a product payload (key order and spacing independent)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def store_key(api) -> str:
+    """Stable store identifier for an API client"""
+    return str(getattr(api, "url", "") or "").rstrip("/").lower()
+
+
+class SyncStateStore:
+    """
+    SQLite table of the last payload pushed per (store, SKU)
+    
+    Each row keeps the payload hash, the product id and the product's
+    date_modified as returned by the push. A product is unchanged when the
+    fresh payload hashes the same and the store still reports that
+    date_modified; a moved date_modified with an unchanged hash is drift -
+    someone edited the product on the store since the last push.
+    """
+    
+    def __init__(self, path: str = DEFAULT_SYNC_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    store TEXT NOT NULL,
+                    sku TEXT NOT NULL,
+                    payload_hash TEXT NOT NULL,
+                    product_id INTEGER,
+                    remote_modified TEXT,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY (store, sku)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resource_indexes (
+                    store TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    saved_at TEXT NOT NULL,
+                    PRIMARY KEY (store, endpoint, key)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_watermarks (
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    resource TEXT NOT NULL,
+                    watermark TEXT,
+                    keys TEXT,
+                    scanned_at TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (source, target, resource)
+                )
+            """)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def load(self, store: str) -> Dict[str, Dict[str, Any]]:
+        """All state rows of a store keyed by SKU"""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT sku, payload_hash, product_id, remote_modified, synced_at "
+                "FROM sync_state WHERE store = ?", (store,)
+            ).fetchall()
+        return {row["sku"]: dict(row) for row in rows}
+    
+    def record(self, store: str, pushed: Iterable[Dict[str, Any]]):
+        """
+        Save pushed products
+        
+        Args:
+            store: Store identifier, see store_key
+            pushed: Dicts with sku, payload_hash, product_id, remote_modified
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (store, item["sku"], item["payload_hash"], item.get("product_id"),
+             item.get("remote_modified"), now)
+            for item in pushed
+        ]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sync_state "
+                "(store, sku, payload_hash, product_id, remote_modified, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+    
+    def forget(self, store: str, skus: Iterable[str] = None):
+        """Drop state so the next sync pushes these SKUs (all when None)"""
+        with self._lock, self._connect() as conn:
+            if skus is None:
+                conn.execute("DELETE FROM sync_state WHERE store = ?", (store,))
+            else:
+                conn.executemany(
+                    "DELETE FROM sync_state WHERE store = ? AND sku = ?",
+                    [(store, sku) for sku in skus]
+                )
+    
+    def save_index(self, store: str, index):
+        """Persist a ResourceIndex so the next run can refresh instead of rebuild"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO resource_indexes (store, endpoint, key, data, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (store, index.endpoint, index.key, json.dumps(index.to_dict(), default=str),
+                 datetime.now().isoformat())
+            )
+    
+    def load_index(self, store: str, endpoint: str, key: str):
+        """Saved ResourceIndex of a store, None when there is none"""
+        from .index import ResourceIndex
+        
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM resource_indexes WHERE store = ? AND endpoint = ? AND key = ?",
+                (store, endpoint, key)
+            ).fetchone()
+        return ResourceIndex.from_dict(json.loads(row["data"])) if row else None
+    
+    def get_watermark(self, source: str, target: str, resource: str) -> Optional[Dict[str, Any]]:
+        """
+        Incremental sync position of a (source, target, resource)
+        
+        Returns:
+            Dict with watermark (newest source date_modified_gmt pushed),
+            keys (source key set at the last deletion scan) and scanned_at,
+            None before the first sync
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT watermark, keys, scanned_at, updated_at FROM sync_watermarks "
+                "WHERE source = ? AND target = ? AND resource = ?",
+                (source, target, resource)
+            ).fetchone()
+        if row is None:
+            return None
+        state = dict(row)
+        state["keys"] = set(json.loads(state["keys"])) if state["keys"] is not None else None
+        return state
+    
+    def set_watermark(self, source: str, target: str, resource: str, watermark: str):
+        """Advance the watermark after a sync that pushed everything up to it"""
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_watermarks (source, target, resource, watermark, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, target, resource) DO UPDATE SET "
+                "watermark = excluded.watermark, updated_at = excluded.updated_at",
+                (source, target, resource, watermark, now)
+            )
+    
+    def record_scan(self, source: str, target: str, resource: str, keys: Iterable[str]):
+        """Save the source key set a deletion scan saw"""
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_watermarks (source, target, resource, keys, scanned_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, target, resource) DO UPDATE SET "
+                "keys = excluded.keys, scanned_at = excluded.scanned_at, "
+                "updated_at = excluded.updated_at",
+                (source, target, resource, json.dumps(sorted(keys)), now, now)
+            )
+    
+    @staticmethod
+    def classify(state: Optional[Dict[str, Any]], remote: Optional[Dict[str, Any]],
+                 digest: str) -> str:
+        """
+        Compare one SKU's fresh payload hash with its state and remote record
+        
+        Returns:
+            "new" (never pushed), "missing" (pushed but gone from the store),
+            "changed" (payload differs), "drifted" (edited on the store) or
+            "unchanged"
+        """
+        if state is None:
+            return "new"
+        if remote is None:
+            return "missing"
+        if state["payload_hash"] != digest:
+            return "changed"
+        if (state["product_id"] != remote.get("id")
+                or state["remote_modified"] != remote.get("date_modified")):
+            return "drifted"
+        return "unchanged"
+    
+    def drift(self, store: str, index) -> Dict[str, List[str]]:
+        """
+        SKUs whose store copy no longer matches the last push
+        
+        Args:
+            store: Store identifier, see store_key
+            index: ResourceIndex of the store's products by SKU
+        """
+        report = {"drifted": [], "missing": []}
+        for sku, state in self.load(store).items():
+            remote = index.get(sku)
+            status = self.classify(state, remote, state["payload_hash"])
+            if status in report:
+                report[status].append(sku)
+        return report
@@ -0,0 +1,147 @@
+"""
+Shared fixtures: an in-memory WooCommerce store speaking the subset of the
+REST API the shared layer and the enhanced managers use
+"""
+
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "claude-desktop-mcp", "enhanced")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class FakeResponse:
+    """requests.Response lookalike"""
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+        self.text = json.dumps(data)
+
+    def json(self):
+        return self._data
+
+    def iter_content(self, chunk_size=1):
+        body = self.text.encode("utf-8")
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeStore:
+    """
+    Products (and their batch endpoint) of one store
+
+    get supports page/per_page, include, sku, modified_after and _fields;
+    post supports products/batch. fail_pages makes those pages answer 500
+    and fail_posts makes the next n batch posts raise.
+    """
+
+    def __init__(self, products=(), url="https://store.example"):
+        self.url = url
+        self.products = {}
+        self.next_id = 1
+        self.fail_pages = set()
+        self.fail_posts = 0
+        self.gets = []
+        self.posts = []
+        self._lock = threading.RLock()
+        for product in products:
+            self.add(product)
+
+    def add(self, product):
+        with self._lock:
+            product = {"id": self.next_id, **product}
+            self.next_id = max(self.next_id, product["id"]) + 1
+            self.products[product["id"]] = product
+            return product
+
+    def get(self, endpoint, params=None, **kwargs):
+        params = dict(params or {})
+        with self._lock:
+            self.gets.append((endpoint, params))
+        page = int(params.get("page", 1))
+        per_page = int(params.get("per_page", 10))
+        if page in self.fail_pages:
+            return FakeResponse(500, {"message": "error"})
+
+        with self._lock:
+            items = sorted(self.products.values(), key=lambda item: item["id"])
+        if "include" in params:
+            ids = {int(item_id) for item_id in str(params["include"]).split(",")}
+            items = [item for item in items if item["id"] in ids]
+        if "sku" in params:
+            items = [item for item in items if item.get("sku") == params["sku"]]
+        if "modified_after" in params:
+            items = [item for item in items
+                     if item.get("date_modified_gmt", "") > params["modified_after"]]
+
+        total_pages = max(1, -(-len(items) // per_page))
+        items = items[(page - 1) * per_page:page * per_page]
+        if "_fields" in params:
+            fields = params["_fields"].split(",")
+            items = [{key: value for key, value in item.items() if key in fields} for item in items]
+        return FakeResponse(200, items, {
+            "X-WP-Total": str(len(self.products)), "X-WP-TotalPages": str(total_pages)
+        })
+
+    def post(self, endpoint, data, **kwargs):
+        with self._lock:
+            self.posts.append((endpoint, data))
+            if self.fail_posts:
+                self.fail_posts -= 1
+                raise ConnectionError("connection reset")
+            # Batches posted from several threads apply one at a time
+            return self._apply(data)
+
+    def _apply(self, data):
+        response = {}
+        for payload in data.get("create", []):
+            if payload.get("sku") and any(p.get("sku") == payload["sku"] for p in self.products.values()):
+                response.setdefault("create", []).append(
+                    {"id": 0, "error": {"code": "product_invalid_sku", "message": "Duplicate SKU"}}
+                )
+                continue
+            response.setdefault("create", []).append(self.add(payload))
+        for payload in data.get("update", []):
+            product = self.products.get(payload["id"])
+            if product is None:
+                response.setdefault("update", []).append(
+                    {"id": payload["id"], "error": {"code": "invalid_id", "message": "Invalid ID"}}
+                )
+                continue
+            product.update(payload)
+            response.setdefault("update", []).append(product)
+        for product_id in data.get("delete", []):
+            product = self.products.pop(product_id, None)
+            response.setdefault("delete", []).append(
+                product or {"id": product_id, "error": {"code": "invalid_id", "message": "Invalid ID"}}
+            )
+        return FakeResponse(200, response)
+
+
+def make_products(count, start=1):
+    return [
+        {
+            "id": start + n,
+            "sku": f"SKU{start + n}",
+            "name": f"Product {start + n}",
+            "regular_price": "10.00",
+            "date_modified_gmt": f"2026-01-01T00:{n // 60:02d}:{n % 60:02d}"
+        }
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def store():
+    return FakeStore(make_products(25))
@@ -0,0 +1,143 @@
+import asyncio
+
+import httpx
+import pytest
+
+from shared.woocommerce_api import async_client
+from shared.woocommerce_api.async_client import AsyncWooCommerceClient
+from shared.woocommerce_api.rate_limiter import StoreRateLimiter
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Requests of every pooled client, answered with a product list"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.params.get("fail"):
+            return httpx.Response(401, json={"code": "woocommerce_rest_cannot_view"})
+        return httpx.Response(200, json=[{"id": 1}])
+
+    class MockClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            kwargs.pop("http2", None)
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(async_client.httpx, "AsyncClient", MockClient)
+    return requests
+
+
+def make_client(url="https://async.example"):
+    return AsyncWooCommerceClient(url, "ck", "cs", http2=False, limiter=StoreRateLimiter(6000, 4))
+
+
+def test_https_requests_use_basic_auth(sent):
+    async def scenario():
+        async with make_client() as client:
+            return await client.get("products", {"per_page": 5})
+
+    response = asyncio.run(scenario())
+
+    assert response.json() == [{"id": 1}]
+    request = sent[-1]
+    assert request.url.path == "/wp-json/wc/v3/products"
+    assert request.url.params["per_page"] == "5"
+    assert request.headers["Authorization"].startswith("Basic ")
+
+
+def test_plain_http_requests_are_oauth_signed(sent):
+    async def scenario():
+        client = make_client("http://async.example")
+        await client.get("products", {"per_page": 5})
+        await client.close()
+
+    asyncio.run(scenario())
+
+    request = sent[-1]
+    assert "oauth_signature" in request.url.params
+    assert request.url.params["per_page"] == "5"
+    assert "Authorization" not in request.headers
+
+
+def test_one_pool_serves_every_request_until_closed(sent):
+    async def scenario():
+        client = make_client()
+        await client.get("products")
+        pool = client._client
+        await asyncio.gather(*(client.get("orders", {"page": page}) for page in range(3)))
+        reused = client._client is pool
+        await client.close()
+        return reused, pool, client
+
+    reused, pool, client = asyncio.run(scenario())
+
+    assert reused and pool.is_closed
+    assert client._client is None and not client.connected
+    assert len(sent) == 4
+
+
+def test_connect_probes_one_projected_product(sent):
+    async def scenario():
+        client = make_client()
+        connected = await client.connect()
+        await client.close()
+        return connected
+
+    assert asyncio.run(scenario()) is True
+    assert dict(sent[-1].url.params) == {"per_page": "1", "_fields": "id"}
+    assert sent[-1].url.path.endswith("/products")
+
+
+def test_connect_fails_on_rejected_credentials(sent, monkeypatch):
+    monkeypatch.setattr(async_client, "PROBE_PARAMS", {"per_page": 1, "_fields": "id", "fail": 1})
+
+    async def scenario():
+        client = make_client()
+        connected = await client.connect()
+        products = await client.get_products()
+        await client.close()
+        return connected, products
+
+    connected, products = asyncio.run(scenario())
+
+    assert connected is False
+    assert products == {"error": "Not connected to store"}
+
+
+def test_cancelled_request_does_not_keep_a_limiter_slot(sent):
+    async def scenario():
+        client = make_client()
+        client.limiter.bucket.set_rate(60)
+        client.limiter.bucket.tokens = 0
+        task = asyncio.ensure_future(client.get("products"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await client.close()
+        return client.limiter
+
+    limiter = asyncio.run(scenario())
+
+    assert limiter.concurrency.in_flight == 0
+    assert sent == []
+
+
+def test_background_client_takes_background_slots(sent):
+    async def scenario():
+        client = make_client()
+        background = client.as_background()
+        taken = []
+        original = client.limiter.concurrency.try_acquire
+        client.limiter.concurrency.try_acquire = lambda flag=False: taken.append(flag) or original(flag)
+        await background.get("orders")
+        await background.close()
+        return client, background, taken
+
+    client, background, taken = asyncio.run(scenario())
+
+    assert background.limiter is client.limiter and background.cache is client.cache
+    assert taken == [True]
+    assert client.limiter.background_requests == 1
+    assert client.limiter.concurrency.background_in_flight == 0
@@ -0,0 +1,104 @@
+import asyncio
+
+from shared.woocommerce_api.batch import BatchWriter, BatchResult
+
+from conftest import FakeResponse, FakeStore, make_products
+
+
+def test_per_item_errors_map_back_to_input_indexes():
+    store = FakeStore(make_products(3))
+    writer = BatchWriter(store, "products", batch_size=2, max_workers=2)
+
+    result = writer.write(
+        create=[{"sku": "NEW1"}, {"sku": "SKU2"}],
+        update=[{"id": 1, "name": "renamed"}, {"id": 999, "name": "missing"}],
+        delete=[3, {"id": 404}]
+    )
+
+    assert result.requests == 3
+    assert set(result.responses["create"]) == {0}
+    assert set(result.responses["update"]) == {0}
+    assert set(result.responses["delete"]) == {0}
+    errors = {(error["action"], error["index"]): error for error in result.errors}
+    assert set(errors) == {("create", 1), ("update", 1), ("delete", 1)}
+    assert errors[("create", 1)]["sku"] == "SKU2"
+    assert errors[("create", 1)]["code"] == "product_invalid_sku"
+    assert errors[("update", 1)]["id"] == 999
+    assert errors[("delete", 1)]["id"] == 404
+    assert store.products[1]["name"] == "renamed"
+
+
+def test_missing_response_items_are_reported():
+    class ShortStore:
+        def post(self, endpoint, data):
+            return FakeResponse(200, {"update": [{"id": data["update"][0]["id"]}]})
+
+    result = BatchWriter(ShortStore(), "products").write(update=[{"id": 1}, {"id": 2}])
+
+    assert set(result.responses["update"]) == {0}
+    assert [(error["index"], error["code"]) for error in result.errors] == [(1, "missing_response")]
+
+
+def test_failed_request_fails_every_item_of_its_chunk():
+    store = FakeStore(make_products(4))
+    store.fail_posts = 1
+    writer = BatchWriter(store, "products", batch_size=2, max_workers=1)
+
+    result = writer.write(update=[{"id": i, "name": "x"} for i in range(1, 5)])
+
+    assert result.failed_requests == 1
+    assert sorted(error["index"] for error in result.errors) == [0, 1]
+    assert all(error["code"] == "request_failed" for error in result.errors)
+    assert sorted(result.responses["update"]) == [2, 3]
+
+
+def test_combined_response_keeps_input_order():
+    result = BatchResult()
+    result.responses["update"] = {2: {"id": 3}, 0: {"id": 1}, 1: {"id": 2}}
+
+    assert result.combined_response() == {"update": [{"id": 1}, {"id": 2}, {"id": 3}]}
+
+
+def test_stop_still_reports_chunks_already_sent():
+    store = FakeStore(make_products(40))
+    seen = []
+
+    def on_chunk(chunk_result):
+        seen.append(chunk_result.succeeded)
+        return False
+
+    writer = BatchWriter(store, "products", batch_size=10, max_workers=2, on_chunk=on_chunk)
+    result = writer.write(update=[{"id": i} for i in range(1, 41)])
+
+    assert result.aborted
+    # Every chunk that reached the store is in the result and went through on_chunk
+    assert result.requests == len(store.posts)
+    assert result.succeeded == sum(seen) == 10 * len(store.posts)
+    assert len(store.posts) < 4
+
+
+def test_write_async_stop_merges_chunks_in_flight():
+    class AsyncStore:
+        def __init__(self):
+            self.posts = 0
+
+        async def post(self, endpoint, data):
+            self.posts += 1
+            first = data["update"][0]["id"]
+            await asyncio.sleep(0.01 * (first // 10))
+            return FakeResponse(200, {"update": [{"id": item["id"]} for item in data["update"]]})
+
+    store = AsyncStore()
+    seen = []
+
+    def on_chunk(chunk_result):
+        seen.append(chunk_result.succeeded)
+        return False
+
+    writer = BatchWriter(store, "products", batch_size=10, max_workers=4, on_chunk=on_chunk)
+    result = asyncio.run(writer.write_async(update=[{"id": i} for i in range(100)]))
+
+    assert result.aborted
+    assert store.posts == 4
+    assert result.requests == 4
+    assert result.succeeded == sum(seen) == 40
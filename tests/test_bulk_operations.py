@@ -0,0 +1,203 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from bulk_operations import BulkOperationManager
+from operation_store import OperationStore
+
+from conftest import FakeResponse, FakeStore, make_products
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = BulkOperationManager(backup_dir=str(tmp_path / "backups"),
+                                   store=OperationStore(str(tmp_path / "operations.db")))
+    yield manager
+    manager._executor.shutdown(wait=False)
+
+
+@pytest.fixture
+def store():
+    products = make_products(5)
+    for product in products:
+        product["regular_price"] = "10.00"
+    return FakeStore(products)
+
+
+def test_targets_are_normalized_to_int(manager, store):
+    preview = manager.preview_changes(store, "update_prices", ["1", " 2", 3], {"regular_price": "12.00"})
+
+    assert preview["total_targets"] == 3
+    assert manager.store.load_payload(preview["operation_id"])["targets"] == [1, 2, 3]
+    assert manager.preview_changes(store, "update_prices", ["SKU1"], {}) == {
+        "error": "Targets must be numeric ids"
+    }
+
+
+def test_preview_shows_a_cleared_sale_price(manager, store):
+    store.products[1]["sale_price"] = "8.00"
+    preview = manager.preview_changes(store, "update_prices", [1, 2], {"sale_price": ""})
+
+    assert "error" not in preview, preview
+    assert preview["stats"]["changed"] == 1
+    assert preview["changes_preview"][0]["changes"] == {
+        "sale_price": {"from": "8.00", "to": "price cleared"}
+    }
+
+    result = manager.execute_operation(preview["operation_id"], {"dry_run": False})
+    assert result["status"] == "completed", result
+    assert store.products[1]["sale_price"] == ""
+
+
+def test_preview_rejects_a_price_that_is_not_a_number(manager, store):
+    preview = manager.preview_changes(store, "update_prices", [1], {"sale_price": "cheap"})
+
+    assert preview == {"error": "Invalid sale_price: 'cheap' is not a number"}
+
+
+def test_update_and_rollback(manager, store):
+    preview = manager.preview_changes(store, "update_prices", ["1", "2"], {"regular_price": "12.00"})
+    operation_id = preview["operation_id"]
+
+    result = manager.execute_operation(operation_id, {"dry_run": False})
+    assert result["status"] == "completed", result
+    assert [store.products[n]["regular_price"] for n in (1, 2, 3)] == ["12.00", "12.00", "10.00"]
+
+    assert "error" not in manager.rollback_operation(operation_id)
+    assert [store.products[n]["regular_price"] for n in (1, 2)] == ["10.00", "10.00"]
+
+
+def test_rollback_is_rejected_while_an_operation_is_active(manager, store):
+    preview = manager.preview_changes(store, "update_prices", [1], {"regular_price": "12.00"})
+    operation_id = preview["operation_id"]
+
+    assert "cannot be rolled back: preview" in manager.rollback_operation(operation_id)["error"]
+
+    manager.active_operations.add(operation_id)
+    assert "still running" in manager.rollback_operation(operation_id)["error"]
+
+
+def test_a_job_that_fails_at_once_leaves_no_job_behind(manager, store):
+    def refuse(endpoint, data, **kwargs):
+        raise ConnectionError("connection refused")
+
+    store.post = refuse
+    preview = manager.preview_changes(store, "update_prices", [1], {"regular_price": "12.00"})
+    operation_id = preview["operation_id"]
+
+    config = {"dry_run": False, "backup_before": False, "max_failures": 0}
+    assert manager.submit_operation(operation_id, config)["status"] == "queued"
+
+    deadline = time.monotonic() + 5
+    while operation_id in manager.active_operations and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.store.get(operation_id)["status"] == "failed"
+    assert manager._jobs == {}
+    assert manager.cancel_operation(operation_id) == {"error": "Operation is not running"}
+
+
+def test_percentage_increase_fails_items_without_a_price(manager, store):
+    store.products[3]["regular_price"] = ""
+    preview = manager.preview_changes(store, "update_prices", [1, 3, 99], {"percentage_increase": 10})
+
+    result = manager.execute_operation(preview["operation_id"], {"dry_run": False})["results"]
+
+    assert (result["successful_items"], result["failed_items"]) == (1, 2)
+    assert result["errors"] == ["products 3: No regular price to increase", "products 99: Product not found"]
+    assert [update["id"] for endpoint, body in store.posts for update in body["update"]] == [1]
+    assert store.products[1]["regular_price"] == "11.0"
+
+
+def test_resumed_percentage_increase_does_not_raise_prices_twice(manager, store):
+    post = store.post
+
+    def lossy(endpoint, data, **kwargs):
+        # The second chunk is applied but its response is lost
+        response = post(endpoint, data, **kwargs)
+        if len(store.posts) == 2:
+            raise ConnectionError("connection reset")
+        return response
+
+    store.post = lossy
+    preview = manager.preview_changes(store, "update_prices", [1, 2, 3, 4, 5], {"percentage_increase": 10})
+    config = {"dry_run": False, "batch_size": 2, "max_concurrent_batches": 1, "max_failures": 0,
+              "rollback_on_error": False}
+    assert manager.execute_operation(preview["operation_id"], config)["status"] == "failed"
+
+    resumed = manager.execute_operation(preview["operation_id"], config, resume=True)
+    assert resumed["status"] == "completed"
+    assert [product["regular_price"] for product in store.products.values()] == ["11.0"] * 5
+
+
+class VariableStore(FakeStore):
+    """Every product is variable with two variations"""
+
+    def get(self, endpoint, params=None, **kwargs):
+        if endpoint.endswith("/variations"):
+            with self._lock:
+                self.gets.append((endpoint, dict(params or {})))
+            parent = int(endpoint.split("/")[1])
+            return FakeResponse(200, [{"id": parent * 10 + n, "sku": f"V{parent}-{n}"} for n in (1, 2)],
+                                {"X-WP-TotalPages": "1"})
+        return super().get(endpoint, params, **kwargs)
+
+
+def test_delete_backup_keeps_variations_of_variable_products(manager):
+    products = make_products(150)
+    for product in products:
+        product["type"] = "variable"
+    store = VariableStore(products)
+    preview = manager.preview_changes(store, "bulk_delete", list(range(1, 151)), {"type": "product"})
+    operation_id = preview["operation_id"]
+
+    backup = manager.store.get_backup(manager._create_backup(manager._load(operation_id, with_payload=True)))
+
+    with gzip.open(backup["path"], "rt", encoding="utf-8") as backup_file:
+        items = [json.loads(line) for line in backup_file]
+    assert backup["variations"] == 300
+    assert [item["id"] for item in items] == list(range(1, 151))
+    assert items[41]["variations"] == [{"id": 421, "sku": "V42-1"}, {"id": 422, "sku": "V42-2"}]
+
+
+def fail_second_post(store):
+    post = store.post
+
+    def flaky(endpoint, data, **kwargs):
+        if len(store.posts) == 1:
+            store.posts.append((endpoint, data))
+            raise ConnectionError("connection reset")
+        return post(endpoint, data, **kwargs)
+
+    store.post = flaky
+
+
+def test_rollback_of_an_aborted_delete_recreates_only_deleted_items(manager):
+    store = FakeStore(make_products(6))
+    fail_second_post(store)
+    preview = manager.preview_changes(store, "bulk_delete", list(range(1, 7)), {"type": "product"})
+    config = {"dry_run": False, "batch_size": 2, "max_concurrent_batches": 1, "max_failures": 0}
+
+    result = manager.execute_operation(preview["operation_id"], config)
+
+    assert result["status"] == "failed_and_rolled_back"
+    deleted = manager._load_checkpoint(preview["operation_id"])
+    assert 3 not in deleted and 4 not in deleted
+    assert (result["rollback"]["restored_items"], result["rollback"]["errors"]) == (len(deleted), [])
+    skus = sorted(product["sku"] for product in store.products.values())
+    assert skus == [f"SKU{n}" for n in range(1, 7)]
+
+
+def test_rollback_of_an_aborted_update_rewrites_only_updated_items(manager, store):
+    fail_second_post(store)
+    preview = manager.preview_changes(store, "update_prices", [1, 2, 3, 4, 5], {"regular_price": "12.00"})
+    config = {"dry_run": False, "batch_size": 2, "max_concurrent_batches": 1, "max_failures": 0}
+
+    assert manager.execute_operation(preview["operation_id"], config)["status"] == "failed_and_rolled_back"
+
+    updated = manager._load_checkpoint(preview["operation_id"])
+    endpoint, rollback = store.posts[-1]
+    assert [update["id"] for update in rollback["update"]] == sorted(updated)
+    assert 3 not in updated and 4 not in updated
+    assert [product["regular_price"] for product in store.products.values()] == ["10.00"] * 5
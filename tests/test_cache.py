@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+
+from shared.woocommerce_api.async_client import AsyncWooCommerceClient
+from shared.woocommerce_api.cache import ResponseCache, cache_resource
+
+from conftest import FakeResponse
+
+STORE = "https://cache-test.example"
+
+
+def test_only_read_mostly_resources_are_cached():
+    assert cache_resource("products/categories/12") == "products/categories"
+    assert cache_resource("/settings/general") == "settings"
+    assert cache_resource("products") is None
+    assert cache_resource("products/categories-extra") is None
+
+
+def test_keys_ignore_param_order_and_store_case():
+    assert (ResponseCache.make_key(STORE.upper() + "/", "settings", {"a": 1, "b": 2})
+            == ResponseCache.make_key(STORE, "/settings/", {"b": 2, "a": 1}))
+
+
+def test_fresh_then_stale_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("shared.woocommerce_api.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=60)
+    key = cache.make_key(STORE, "settings", None)
+    response = FakeResponse(200, [], {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2026 00:00:00 GMT"})
+
+    assert cache.lookup(key) == (None, False)
+    cache.store(key, response, "settings")
+    entry, fresh = cache.lookup(key)
+    assert fresh and entry.response is response
+
+    now[0] += 61
+    entry, fresh = cache.lookup(key)
+    # Expired entries are kept for revalidation
+    assert entry is not None and not fresh
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2026 00:00:00 GMT"
+    }
+
+    cache.refresh(key)
+    assert cache.lookup(key)[1]
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    keys = [cache.make_key(STORE, f"settings/{n}", None) for n in range(3)]
+    cache.store(keys[0], FakeResponse(200), "settings")
+    cache.store(keys[1], FakeResponse(200), "settings")
+    cache.lookup(keys[0])
+    cache.store(keys[2], FakeResponse(200), "settings")
+
+    assert cache.lookup(keys[1]) == (None, False)
+    assert cache.lookup(keys[0])[0] is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_writes_invalidate_their_resource_on_their_store_only():
+    cache = ResponseCache()
+    categories = cache.make_key(STORE, "products/categories", {"page": 1})
+    settings = cache.make_key(STORE, "settings", None)
+    other_store = cache.make_key("https://other.example", "products/categories", {"page": 1})
+    for key, resource in ((categories, "products/categories"), (settings, "settings"),
+                          (other_store, "products/categories")):
+        cache.store(key, FakeResponse(200), resource)
+
+    cache.invalidate(STORE, "products/categories/batch")
+
+    assert cache.lookup(categories)[0] is None
+    assert cache.lookup(settings)[0] is not None
+    assert cache.lookup(other_store)[0] is not None
+
+
+def test_async_client_revalidates_with_etag():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+
+    async def scenario():
+        client = AsyncWooCommerceClient(STORE, "ck", "cs", http2=False, cache=ResponseCache(ttl=0))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        first = await client.get("products/categories")
+        second = await client.get("products/categories")
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert [request.headers.get("If-None-Match") for request in requests] == [None, '"v1"']
+    # The 304 is answered from the cached body
+    assert second.json() == first.json() == [{"id": 1}]
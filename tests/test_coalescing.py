@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from shared.woocommerce_api.coalescing import SingleFlight, AsyncSingleFlight
+
+
+def run_concurrently(group, count, fn, key="products"):
+    results, errors = [], []
+    barrier = threading.Barrier(count)
+
+    def caller():
+        barrier.wait()
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    # Every caller has joined the call (leader or waiter)
+    while group.stats()["shared"] + group.stats()["executed"] < count:
+        time.sleep(0.001)
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"id": 1}
+
+    threads, results, errors = run_concurrently(group, 5, fetch)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"id": 1}] * 5 and not errors
+    assert group.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(1)
+        raise RuntimeError("store down")
+
+    threads, results, errors = run_concurrently(group, 3, fail)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3 and not results
+    assert group.do("products", lambda: "fresh") == "fresh"
+
+
+def test_different_keys_do_not_share():
+    group = SingleFlight()
+
+    assert group.do("a", lambda: 1) == 1
+    assert group.do("b", lambda: 2) == 2
+    assert group.stats()["executed"] == 2
+
+
+def test_async_callers_share_and_survive_a_cancelled_caller():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "page"
+
+    async def scenario():
+        impatient = asyncio.ensure_future(group.do("k", fetch))
+        others = [asyncio.ensure_future(group.do("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        results = await asyncio.gather(*others)
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return results
+
+    assert asyncio.run(scenario()) == ["page"] * 3
+    assert len(calls) == 1
+    assert group.stats() == {"executed": 1, "shared": 3, "in_flight": 0}
@@ -0,0 +1,42 @@
+from tools.products_enhanced import import_products
+
+from conftest import FakeStore, make_products
+
+CSV = """name,sku,regular_price
+First,NEW1,5.00
+Existing,SKU1,7.00
+Repeated,NEW1,6.00
+Other,NEW2,8.00
+"""
+
+
+def sku_lookups(store):
+    return [params for endpoint, params in store.gets if "sku" in params]
+
+
+def test_repeated_sku_updates_the_row_created_before_it():
+    store = FakeStore(make_products(2))
+
+    result = import_products(store, CSV, {"update_existing": True})
+
+    assert (result["successful_imports"], result["failed_imports"], result["errors"]) == (4, 0, [])
+    assert [product["action"] for product in result["imported_products"]] == [
+        "created", "updated", "created", "updated"
+    ]
+    by_sku = {product["sku"]: product for product in store.products.values()}
+    assert len(store.products) == 4
+    assert (by_sku["NEW1"]["name"], by_sku["NEW1"]["regular_price"]) == ("Repeated", "6.0")
+    assert by_sku["SKU1"]["regular_price"] == "7.0"
+    # One listing and one batch instead of a GET per row
+    assert sku_lookups(store) == []
+    assert len(store.posts) == 1
+
+
+def test_repeated_sku_is_skipped_without_update_existing():
+    store = FakeStore(make_products(2))
+
+    result = import_products(store, CSV, {})
+
+    assert (result["successful_imports"], result["skipped_rows"], result["errors"]) == (2, 2, [])
+    by_sku = {product["sku"]: product for product in store.products.values()}
+    assert (by_sku["NEW1"]["name"], by_sku["SKU1"]["regular_price"]) == ("First", "10.00")
@@ -0,0 +1,73 @@
+import pytest
+
+from shared.woocommerce_api.index import ResourceIndex
+from shared.woocommerce_api.pagination import PageFetchError
+
+from conftest import FakeStore, make_products
+
+
+def test_build_projects_and_indexes_by_key(store):
+    index = ResourceIndex.build(store, "products", key="sku")
+
+    assert len(index) == 25
+    assert index.id_for("SKU7") == 7
+    assert set(index.get(" SKU7 ")) == {"id", "sku", "date_modified_gmt"}
+    assert store.gets[0][1]["_fields"] == "id,sku,date_modified,date_modified_gmt"
+    assert index.watermark == "2026-01-01T00:00:24"
+
+
+def test_records_follow_key_changes_and_cleared_keys():
+    index = ResourceIndex("sku", [{"id": 1, "sku": "A"}, {"id": 2, "sku": "B"}])
+
+    index.record({"id": 1, "sku": "A2"})
+    assert "A" not in index and index.id_for("A2") == 1
+
+    index.record({"id": 2, "sku": ""})
+    assert "B" not in index and len(index) == 1
+
+    index.discard("A2")
+    assert len(index) == 0
+
+
+def test_write_responses_are_kept_compact():
+    index = ResourceIndex("sku", fields=("id", "sku"))
+
+    index.record({"id": 5, "sku": "X", "name": "full object", "description": "..."})
+
+    assert index.get("X") == {"id": 5, "sku": "X"}
+
+
+def test_refresh_lists_only_records_modified_since_the_watermark(store):
+    index = ResourceIndex.build(store, "products")
+    store.products[3].update({"sku": "SKU3-new", "date_modified_gmt": "2026-02-01T00:00:00"})
+    store.gets.clear()
+
+    # modified_after steps back a second, so the newest known record is listed again
+    assert index.refresh(store) == 2
+    assert store.gets[0][1]["modified_after"] == "2026-01-01T00:00:23"
+    assert index.id_for("SKU3-new") == 3 and "SKU3" not in index
+    assert index.watermark == "2026-02-01T00:00:00"
+
+
+def test_failed_refresh_keeps_the_watermark():
+    store = FakeStore(make_products(150))
+    index = ResourceIndex.build(store, "products")
+    watermark = index.watermark
+    for product in store.products.values():
+        product["date_modified_gmt"] = f"2026-03-01T00:00:{product['id'] % 60:02d}"
+    store.fail_pages = {2}
+
+    # The first page of 100 is recorded before the second one fails
+    with pytest.raises(PageFetchError):
+        index.refresh(store)
+
+    assert index.watermark == watermark
+
+
+def test_round_trip_through_dict(store):
+    index = ResourceIndex.build(store, "products")
+
+    restored = ResourceIndex.from_dict(index.to_dict())
+
+    assert restored.snapshot() == index.snapshot()
+    assert (restored.watermark, restored.endpoint) == (index.watermark, "products")
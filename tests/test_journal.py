@@ -0,0 +1,157 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from shared.woocommerce_api.journal import SyncJournal
+
+from conftest import FakeStore, make_products
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return SyncJournal(str(tmp_path / "journal.db"))
+
+
+def new_products(count):
+    return [{"sku": f"NEW{n}", "name": f"New {n}"} for n in range(count)]
+
+
+def test_plan_records_pending_chunks_before_sending(journal):
+    journal.start_run("run", "test", {}, ["products"])
+
+    assert journal.plan("run", "products", "products", create=new_products(250)) == 3
+    assert journal.progress("run") == {"chunks": 3, "committed": 0, "failed": 0, "pending": 3}
+    assert [len(chunk["body"]["create"]) for chunk in journal.open_chunks("run", "products")] == [100, 100, 50]
+
+
+def test_resume_sends_only_chunks_that_did_not_commit(journal):
+    store = FakeStore()
+    journal.start_run("run", "test", {}, ["products"])
+    journal.plan("run", "products", "products", create=new_products(250))
+
+    store.fail_posts = 1
+    first = journal.execute(store, "run", "products", max_workers=1)
+    assert first["created"] == 150
+    assert first["open_chunks"] == 1
+    assert journal.progress("run")["failed"] == 1
+
+    store.posts.clear()
+    # A fresh journal on the same file, as after a restart
+    resumed = SyncJournal(journal.path).execute(store, "run", "products")
+
+    assert len(store.posts) == 1
+    assert resumed["created"] == 250 and resumed["open_chunks"] == 0
+    assert len(store.products) == 250
+    assert sorted(item["payload"]["sku"] for item in resumed["items"]) == sorted(f"NEW{n}" for n in range(250))
+
+
+def test_resume_turns_creates_that_already_landed_into_updates(journal):
+    store = FakeStore(make_products(2))
+    journal.start_run("run", "test", {}, ["products"])
+    journal.plan("run", "products", "products",
+                 create=[{"sku": "SKU1", "name": "again"}, {"sku": "NEW", "name": "new"}])
+
+    by_sku = {product["sku"]: product["id"] for product in store.products.values()}
+    result = journal.execute(store, "run", "products", existing=lambda payload: by_sku.get(payload["sku"]))
+
+    assert (result["created"], result["updated"], result["failed"]) == (1, 1, 0)
+    assert store.products[1]["name"] == "again"
+
+
+def test_item_errors_are_reported_with_their_payload(journal):
+    store = FakeStore(make_products(1))
+    journal.start_run("run", "test", {}, ["products"])
+    journal.plan("run", "products", "products", update=[{"id": 1}, {"id": 99, "name": "gone"}])
+
+    result = journal.execute(store, "run", "products")
+
+    assert result["updated"] == 1 and result["failed"] == 1
+    assert result["errors"][0]["payload"] == {"id": 99, "name": "gone"}
+
+
+def test_on_commit_sees_every_committed_chunk(journal):
+    store = FakeStore()
+    committed = []
+    journal.start_run("run", "test", {}, ["products"])
+    journal.plan("run", "products", "products", create=new_products(150))
+
+    journal.execute(store, "run", "products",
+                    on_commit=lambda body, result: committed.append(result.succeeded))
+
+    assert sorted(committed) == [50, 100]
+
+
+def test_streamed_step_is_complete_only_after_the_producer_finishes(journal):
+    store = FakeStore()
+    journal.start_run("run", "test", {}, ["products"])
+
+    def items():
+        for payload in new_products(120):
+            yield "create", payload
+        raise RuntimeError("source listing failed")
+
+    with pytest.raises(RuntimeError):
+        journal.stream(store, "run", "products", "products", items())
+    assert journal.step_info("run", "products")["complete"] is False
+    assert len(store.products) == 100
+
+    result = journal.stream(store, "run", "products", "products",
+                            (("create", payload) for payload in new_products(120)[100:]))
+    assert journal.step_info("run", "products")["complete"] is True
+    assert result["created"] == 120 and len(store.products) == 120
+
+
+def test_run_lifecycle(journal):
+    journal.start_run("run", "multi_store", {"source": "a"}, ["products"])
+    journal.update_summary("run", unchanged=3)
+    journal.finish_run("run", "failed", error="boom")
+
+    run = journal.get_run("run")
+    assert (run["status"], run["error"], run["summary"]) == ("failed", "boom", {"unchanged": 3})
+    assert run["params"] == {"source": "a"} and run["steps"] == ["products"]
+
+    journal.reopen_run("run")
+    assert journal.get_run("run")["status"] == "running"
+    assert [listed["sync_id"] for listed in journal.list_runs(kind="multi_store")] == ["run"]
+
+
+def test_completed_runs_keep_only_identifying_fields(journal):
+    for sync_id, status in (("done", "completed"), ("broken", "failed")):
+        journal.start_run(sync_id, "test", {}, ["products"])
+        journal.plan(sync_id, "products", "products", create=new_products(3))
+        journal.execute(FakeStore(), sync_id, "products")
+        journal.finish_run(sync_id, status)
+
+    done = journal.step_result("done", "products")
+    assert [item["payload"] for item in done["items"]] == [{"sku": f"NEW{n}"} for n in range(3)]
+    assert done["created"] == 3
+    # A failed run can be resumed and keeps what it sent
+    assert journal.committed_payloads("broken", "products", "sku")["NEW0"] == {"sku": "NEW0", "name": "New 0"}
+
+
+def test_prune_drops_old_runs_and_completed_runs_beyond_the_limit(tmp_path):
+    journal = SyncJournal(str(tmp_path / "journal.db"), retention_days=30, max_runs=2)
+    for n, status in enumerate(["completed", "completed", "completed", "failed", "failed"]):
+        journal.start_run(f"run{n}", "test", {}, ["products"])
+        journal.plan(f"run{n}", "products", "products", create=new_products(1))
+        journal.finish_run(f"run{n}", status)
+    with sqlite3.connect(journal.path) as conn:
+        old = (datetime.now() - timedelta(days=31)).isoformat()
+        conn.execute("UPDATE sync_runs SET started = ?, updated = ? WHERE sync_id = 'run4'", (old, old))
+        conn.execute("UPDATE sync_runs SET started = ? WHERE sync_id = 'run0'", (old,))
+
+    assert sorted(journal.prune()) == ["run0", "run4"]
+    assert journal.get_run("run0") is None and journal.step_info("run4", "products") is None
+    assert journal.open_chunks("run4", "products") == []
+    assert [run["sync_id"] for run in journal.list_runs()] == ["run3", "run2", "run1"]
+
+
+def test_new_runs_prune_at_most_once_per_interval(journal, monkeypatch):
+    calls = []
+    monkeypatch.setattr(journal, "prune", lambda: calls.append(1) or [])
+
+    journal.start_run("a", "test", {}, [])
+    journal.start_run("b", "test", {}, [])
+
+    assert len(calls) == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from conftest import FakeStore, make_products
+
+CONFIG = {"categories": False, "translations": False, "currencies": False, "max_parallel_targets": 1}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import multi_store
+    return multi_store.MultiStoreManager()
+
+
+@pytest.fixture
+def stores():
+    stores = {"a": {"api": FakeStore(make_products(250), url="https://source.example"), "config": {}}}
+    for name in ("b", "c", "d"):
+        stores[name] = {"api": FakeStore(url=f"https://{name}.example"), "config": {}}
+    return stores
+
+
+def listed_pages(store):
+    return [params.get("page", 1) for endpoint, params in store.gets
+            if endpoint == "products" and "_fields" not in params]
+
+
+def test_source_is_listed_once_across_waves(manager, stores):
+    result = manager.sync_stores(stores, "a", ["b", "c", "d"], CONFIG)
+
+    assert result["status"] == "completed"
+    for name in ("b", "c", "d"):
+        assert len(stores[name]["api"].products) == 250
+    # Later waves replay the first wave's listing
+    pages = listed_pages(stores["a"]["api"])
+    assert len(pages) == len(set(pages))
+
@@ -0,0 +1,56 @@
+import pytest
+
+from conftest import FakeStore, make_products
+
+CONFIG = {"categories": False, "translations": False, "currencies": False, "target_concurrency": 1}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import multi_store
+    return multi_store.MultiStoreManager()
+
+
+@pytest.fixture
+def stores():
+    source = FakeStore(make_products(250), url="https://source.example")
+    target = FakeStore(url="https://target.example")
+    return {"a": {"api": source, "config": {}}, "b": {"api": target, "config": {}}}
+
+
+def sent_skus(store):
+    return [payload["sku"] for endpoint, body in store.posts
+            for action in ("create", "update") for payload in body.get(action, [])]
+
+
+def interrupted_sync(manager, stores):
+    """Sync that commits two chunks before the source listing fails"""
+    stores["a"]["api"].fail_pages = {3}
+    first = manager.sync_stores(stores, "a", ["b"], CONFIG)
+    stores["a"]["api"].fail_pages = set()
+    assert first["status"] == "failed"
+    assert len(stores["b"]["api"].products) == 200
+    stores["b"]["api"].posts.clear()
+    return first["sync_id"]
+
+
+def test_resumed_stream_does_not_resend_committed_products(manager, stores):
+    sync_id = interrupted_sync(manager, stores)
+
+    resumed = manager.resume_sync(stores, sync_id)
+
+    assert resumed["status"] == "completed"
+    assert sent_skus(stores["b"]["api"]) == [f"SKU{n}" for n in range(201, 251)]
+    assert len(stores["b"]["api"].products) == 250
+    assert resumed["results"]["synced_items"]["b_products"]["synced"] == 250
+
+
+def test_resumed_stream_sends_products_edited_since_the_interruption(manager, stores):
+    sync_id = interrupted_sync(manager, stores)
+    stores["a"]["api"].products[5]["name"] = "Edited"
+
+    manager.resume_sync(stores, sync_id)
+
+    assert sorted(sent_skus(stores["b"]["api"])) == sorted(["SKU5"] + [f"SKU{n}" for n in range(201, 251)])
+    assert any(product["name"] == "Edited" for product in stores["b"]["api"].products.values())
@@ -0,0 +1,108 @@
+import pytest
+
+from shared.woocommerce_api import store_key
+
+from conftest import FakeStore, make_products
+
+CONFIG = {"categories": False, "translations": False, "currencies": False}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # The manager keeps its journal and sync state in ./sync_state.db
+    monkeypatch.chdir(tmp_path)
+    import multi_store
+    return multi_store.MultiStoreManager()
+
+
+@pytest.fixture
+def stores():
+    source = FakeStore(make_products(30), url="https://source.example")
+    target = FakeStore(url="https://target.example")
+    return {"a": {"api": source, "config": {}}, "b": {"api": target, "config": {}}}
+
+
+def sync(manager, stores, **config):
+    result = manager.sync_stores(stores, "a", ["b"], {**CONFIG, **config})
+    return result["results"]["synced_items"]["b_products"]
+
+
+def saved_state(manager, stores):
+    return manager.sync_state.get_watermark(
+        store_key(stores["a"]["api"]), store_key(stores["b"]["api"]), "products"
+    )
+
+
+def watermark(manager, stores):
+    saved = saved_state(manager, stores)
+    return saved["watermark"] if saved else None
+
+
+def test_watermark_advances_to_the_newest_pushed_product(manager, stores):
+    first = sync(manager, stores)
+
+    assert first["synced"] == 30
+    assert watermark(manager, stores) == "2026-01-01T00:00:29"
+
+    source, target = stores["a"]["api"], stores["b"]["api"]
+    source.products[5].update({"name": "Renamed", "date_modified_gmt": "2026-02-01T00:00:00"})
+    second = sync(manager, stores)
+
+    # Only the edited product (and the boundary second) is listed again
+    assert second["synced"] <= 2
+    assert any(product["name"] == "Renamed" for product in target.products.values())
+    assert watermark(manager, stores) == "2026-02-01T00:00:00"
+
+
+def test_watermark_holds_at_a_product_that_was_not_pushed(manager, stores):
+    transform = manager._transform_product
+
+    def failing(product, *args):
+        if product["sku"] == "SKU8":
+            raise ValueError("cannot transform")
+        return transform(product, *args)
+
+    manager._transform_product = failing
+    first = sync(manager, stores)
+
+    assert first["failed"] >= 1
+    assert [item["sku"] for item in first["unsynced"]] == ["SKU8"]
+    assert watermark(manager, stores) == "2026-01-01T00:00:07"
+
+    manager._transform_product = transform
+    second = sync(manager, stores)
+
+    assert "SKU8" in {product["sku"] for product in stores["b"]["api"].products.values()}
+    assert second["unsynced"] == []
+    assert watermark(manager, stores) == "2026-01-01T00:00:29"
+
+
+def test_failed_delete_is_retried_by_the_next_scan(manager, stores):
+    source, target = stores["a"]["api"], stores["b"]["api"]
+    sync(manager, stores, sync_deletions=True, deletion_scan_hours=0)
+    del source.products[3]
+
+    target.fail_posts = 1
+    sync(manager, stores, sync_deletions=True, deletion_scan_hours=0)
+    assert "SKU3" in {product["sku"] for product in target.products.values()}
+    # The scan is not recorded while its delete is not applied
+    assert "SKU3" in saved_state(manager, stores)["keys"]
+
+    retried = sync(manager, stores, sync_deletions=True, deletion_scan_hours=0)
+    assert retried["removed_in_source"] == ["SKU3"] and retried["deleted"] == 1
+    assert "SKU3" not in {product["sku"] for product in target.products.values()}
+    assert "SKU3" not in saved_state(manager, stores)["keys"]
+
+
+def test_removals_are_reported_until_they_leave_the_target(manager, stores):
+    source, target = stores["a"]["api"], stores["b"]["api"]
+    sync(manager, stores, deletion_scan_hours=0)
+    del source.products[3]
+
+    assert sync(manager, stores, deletion_scan_hours=0)["removed_in_source"] == ["SKU3"]
+    assert sync(manager, stores, deletion_scan_hours=0)["removed_in_source"] == ["SKU3"]
+
+    # Deleted on the target by hand: reported once more, then forgotten
+    target.products = {key: product for key, product in target.products.items() if product["sku"] != "SKU3"}
+    sync(manager, stores, deletion_scan_hours=0)
+    assert sync(manager, stores, deletion_scan_hours=0)["removed_in_source"] == []
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from operation_store import MAX_STORED_ERRORS, OperationStore
+
+
+@pytest.fixture
+def operations(tmp_path):
+    return OperationStore(str(tmp_path / "operations.db"), retention_days=30, max_operations=3)
+
+
+def operation(operation_id, status="completed", days_ago=0, minutes_ago=0, **fields):
+    started = datetime.now() - timedelta(days=days_ago, minutes=minutes_ago)
+    return {"operation_id": operation_id, "operation": "update", "status": status,
+            "started": started.isoformat(), "total_items": 10, "processed_items": 0,
+            "successful_items": 0, "failed_items": 0, **fields}
+
+
+def backup(operation_id):
+    return {"backup_id": f"{operation_id}-backup", "operation_id": operation_id,
+            "path": f"/backups/{operation_id}.json.gz", "created": datetime.now().isoformat()}
+
+
+def test_errors_are_capped_but_counted(operations):
+    operations.save(operation("op", errors=[f"error {n}" for n in range(250)]))
+
+    saved = operations.get("op")
+    assert len(saved["errors"]) == MAX_STORED_ERRORS
+    assert saved["error_count"] == 250
+
+
+def test_progress_is_kept_when_a_later_save_omits_it(operations):
+    operations.save(operation("op", status="running"), progress={"items_per_second": 12.5})
+    operations.save(operation("op", processed_items=10))
+
+    saved = operations.get("op")
+    assert saved["progress"] == {"items_per_second": 12.5}
+    assert (saved["status"], saved["processed_items"]) == ("completed", 10)
+
+
+def test_list_pages_most_recent_first(operations):
+    for n in range(5):
+        operations.save(operation(f"op{n}", status="failed" if n % 2 else "completed", minutes_ago=n))
+
+    page = operations.list(limit=2, offset=1)
+    assert [listed["operation_id"] for listed in page["operations"]] == ["op1", "op2"]
+    assert page["total"] == 5
+    assert operations.list(status="failed")["total"] == 2
+
+
+def test_payloads_round_trip(operations):
+    payload = {"targets": list(range(1000)), "changes": {"regular_price": "9.99"}}
+
+    operations.save_payload("op", payload)
+
+    assert operations.load_payload("op") == payload
+    assert operations.load_payload("missing") is None
+
+
+def test_mark_interrupted_fails_active_operations(operations):
+    operations.save(operation("running", status="running", phase="updating",
+                              errors=[f"error {n}" for n in range(MAX_STORED_ERRORS)]))
+    operations.save(operation("done"))
+
+    assert operations.mark_interrupted() == 1
+
+    interrupted = operations.get("running")
+    assert (interrupted["status"], interrupted["phase"]) == ("failed", None)
+    assert interrupted["errors"][-1] == "Interrupted by a server restart"
+    assert len(interrupted["errors"]) == MAX_STORED_ERRORS
+    assert interrupted["error_count"] == MAX_STORED_ERRORS + 1
+    assert operations.get("done")["status"] == "completed"
+
+
+def test_prune_applies_retention_and_count_limits(operations):
+    operations.save(operation("old", days_ago=31))
+    operations.save(operation("old-running", status="running", days_ago=31))
+    for n in range(4):
+        operations.save(operation(f"recent{n}", minutes_ago=n))
+    for operation_id in ("old", "recent3"):
+        operations.save_backup(backup(operation_id))
+        operations.save_payload(operation_id, {"targets": [1]})
+
+    pruned = operations.prune()
+
+    assert sorted(pruned["operations"]) == ["old", "recent3"]
+    assert sorted(pruned["backup_paths"]) == ["/backups/old.json.gz", "/backups/recent3.json.gz"]
+    assert operations.get("old-running") is not None
+    assert operations.get_backup("old-backup") is None
+    assert operations.load_payload("recent3") is None
+    assert operations.list()["total"] == 4
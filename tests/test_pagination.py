@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from shared.woocommerce_api.pagination import (
+    PageFetchError, aiter_items, iter_items, iter_pages, stream_items
+)
+
+from conftest import FakeStore, make_products
+
+
+def test_all_pages_in_order(store):
+    pages = list(iter_pages(store, "products", per_page=10, max_workers=3))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [item["id"] for page in pages for item in page] == list(range(1, 26))
+
+
+def test_unordered_yields_every_page(store):
+    ids = [item["id"] for item in iter_items(store, "products", per_page=4, ordered=False)]
+
+    assert sorted(ids) == list(range(1, 26))
+
+
+def test_fields_projection_and_max_items(store):
+    items = list(iter_items(store, "products", per_page=10, fields=["id", "sku"], max_items=12))
+
+    assert len(items) == 12
+    assert set(items[0]) == {"id", "sku"}
+    assert store.gets[0][1]["_fields"] == "id,sku"
+
+
+def test_serial_paging_without_total_pages_header():
+    class Headerless(FakeStore):
+        def get(self, endpoint, params=None, **kwargs):
+            response = super().get(endpoint, params)
+            response.headers = {}
+            return response
+
+    store = Headerless(make_products(25))
+
+    assert len(list(iter_items(store, "products", per_page=10))) == 25
+
+
+def test_failed_page_raises_instead_of_returning_a_partial_listing(store):
+    store.fail_pages = {2}
+
+    with pytest.raises(PageFetchError) as raised:
+        list(iter_items(store, "products", per_page=10))
+    assert raised.value.page == 2
+    assert raised.value.endpoint == "products"
+
+
+def test_failed_first_page_raises(store):
+    store.fail_pages = {1}
+
+    with pytest.raises(PageFetchError):
+        list(iter_pages(store, "products"))
+
+
+def test_request_exceptions_become_page_errors():
+    class Broken:
+        def get(self, endpoint, params=None, **kwargs):
+            raise ConnectionError("reset")
+
+    with pytest.raises(PageFetchError, match="reset"):
+        list(iter_pages(Broken(), "orders"))
+
+
+def test_stream_items_decodes_pages_and_raises_on_failure(store):
+    class Streaming(FakeStore):
+        def get(self, endpoint, params=None, stream=False, **kwargs):
+            return super().get(endpoint, params)
+
+    streaming = Streaming(make_products(25))
+    assert [item["id"] for item in stream_items(streaming, "products", per_page=10)] == list(range(1, 26))
+
+    streaming.fail_pages = {3}
+    with pytest.raises(PageFetchError):
+        list(stream_items(streaming, "products", per_page=10))
+
+
+def test_async_pages_raise_on_failure():
+    class AsyncStore:
+        def __init__(self, store):
+            self.store = store
+
+        async def get(self, endpoint, params=None):
+            return self.store.get(endpoint, params)
+
+    async def collect(store):
+        return [item["id"] async for item in aiter_items(AsyncStore(store), "products", per_page=10)]
+
+    store = FakeStore(make_products(25))
+    assert asyncio.run(collect(store)) == list(range(1, 26))
+
+    store.fail_pages = {3}
+    with pytest.raises(PageFetchError):
+        asyncio.run(collect(store))
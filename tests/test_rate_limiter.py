@@ -0,0 +1,191 @@
+import asyncio
+import threading
+
+import pytest
+
+from shared.woocommerce_api.rate_limiter import (
+    AdaptiveConcurrency, StoreRateLimiter, TokenBucket, get_store_limiter, remove_store_limiter
+)
+
+
+@pytest.fixture
+def store_url():
+    url = "https://limiter-test.example"
+    yield url
+    remove_store_limiter(url)
+
+
+def test_window_halves_on_throttling_and_grows_back_additively():
+    window = AdaptiveConcurrency(8, cooldown=0)
+
+    window.acquire()
+    window.release(429, 0.1)
+    assert window.window == 4
+
+    # One slot per window's worth of healthy responses
+    for _ in range(4):
+        window.acquire()
+        window.release(200, 0.1)
+    assert window.window == 5
+
+
+@pytest.mark.parametrize("status_code, latency", [(503, 0.1), (None, 0.1), (200, 10.0)])
+def test_congestion_signals(status_code, latency):
+    window = AdaptiveConcurrency(8, cooldown=0, slow_threshold=5.0)
+
+    window.acquire()
+    window.release(status_code, latency)
+
+    assert window.window == 4
+
+
+def test_one_burst_of_failures_halves_once():
+    window = AdaptiveConcurrency(8, cooldown=60)
+
+    for _ in range(4):
+        window.acquire()
+    for _ in range(4):
+        window.release(429, 0.1)
+
+    assert window.window == 4
+
+
+def test_window_never_drops_below_min():
+    window = AdaptiveConcurrency(4, min_limit=1, cooldown=0)
+
+    for _ in range(10):
+        window.acquire()
+        window.release(429, 0.1)
+
+    assert window.window == 1
+
+
+def test_acquire_blocks_at_the_window():
+    window = AdaptiveConcurrency(2)
+    window.acquire()
+    window.acquire()
+    assert not window.try_acquire()
+
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (window.acquire(), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    window.release(200, 0.1)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_background_slots_are_capped_and_yield_to_waiting_foreground():
+    window = AdaptiveConcurrency(4, background_share=0.5)
+
+    assert window.try_acquire(background=True)
+    assert window.try_acquire(background=True)
+    assert not window.try_acquire(background=True)
+    assert window.try_acquire()
+
+    window.waiting = 1
+    window.release(200, 0.1, background=True)
+    assert not window.try_acquire(background=True)
+
+
+def test_async_foreground_waiters_hold_back_background_slots():
+    window = AdaptiveConcurrency(2, background_share=1.0)
+    window.acquire()
+    window.acquire()
+
+    async def scenario():
+        foreground = asyncio.ensure_future(window.acquire_async(poll_interval=0.01))
+        await asyncio.sleep(0.03)
+        waiting = window.waiting
+        window.release(200, 0.1)
+        # The freed slot is kept for the waiting foreground caller
+        background_got_it = window.try_acquire(background=True)
+        await foreground
+        return waiting, background_got_it
+
+    waiting, background_got_it = asyncio.run(scenario())
+
+    assert waiting == 1
+    assert background_got_it is False
+    assert window.in_flight == 2 and window.waiting == 0
+
+
+def test_cancelled_async_acquire_gives_its_slot_back():
+    limiter = StoreRateLimiter(rate_limit_per_minute=60, concurrent_requests=2)
+    limiter.bucket.tokens = 0
+
+    async def scenario(background):
+        task = asyncio.ensure_future(limiter.acquire_async(background))
+        await asyncio.sleep(0.05)
+        # Holding a slot while waiting for the rate token
+        held = limiter.concurrency.in_flight
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return held
+
+    assert asyncio.run(scenario(False)) == 1
+    assert asyncio.run(scenario(True)) == 1
+    assert limiter.concurrency.in_flight == 0
+    assert limiter.concurrency.background_in_flight == 0
+    # Cancellation is not congestion
+    assert limiter.concurrency.window == 2
+
+
+def test_token_bucket_bursts_then_paces():
+    bucket = TokenBucket(60, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+    assert not bucket.try_take()
+
+
+def test_same_store_shares_one_limiter(store_url):
+    limiter = get_store_limiter(store_url, rate_limit_per_minute=60, concurrent_requests=5)
+
+    assert get_store_limiter(store_url.upper() + "/") is limiter
+    assert get_store_limiter("https://other.example") is not limiter
+    remove_store_limiter("https://other.example")
+
+
+def test_new_settings_are_applied_to_an_existing_limiter(store_url, caplog):
+    limiter = get_store_limiter(store_url, rate_limit_per_minute=60, concurrent_requests=5)
+    limiter.acquire()
+
+    with caplog.at_level("INFO"):
+        again = get_store_limiter(store_url, rate_limit_per_minute=120, concurrent_requests=2)
+
+    assert again is limiter
+    assert limiter.stats()["rate_limit_per_minute"] == 120
+    assert limiter.stats()["max_concurrency"] == 2
+    assert limiter.concurrency.window == 2
+    assert limiter.bucket.rate == pytest.approx(2.0)
+    # In-flight accounting survives the change
+    assert limiter.concurrency.in_flight == 1
+    assert "concurrent_requests 5 -> 2" in caplog.text
+
+
+def test_settings_objects_reconfigure_too(store_url):
+    class Settings:
+        rate_limit_per_minute = 30
+        concurrent_requests = 3
+
+    limiter = get_store_limiter(store_url)
+    get_store_limiter(store_url, settings=Settings())
+
+    assert (limiter.rate_limit_per_minute, limiter.concurrent_requests) == (30, 3)
+
+
+def test_release_counts_throttled_responses(store_url):
+    limiter = get_store_limiter(store_url, rate_limit_per_minute=6000, concurrent_requests=5)
+
+    limiter.acquire()
+    limiter.release(429, 0.01)
+    limiter.acquire(background=True)
+    limiter.release(200, 0.01, background=True)
+
+    stats = limiter.stats()
+    assert (stats["total_requests"], stats["background_requests"], stats["throttled_responses"]) == (2, 1, 1)
+    assert stats["in_flight"] == 0
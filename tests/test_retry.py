@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from shared.woocommerce_api.retry import RetryPolicy, is_connect_error
+
+from conftest import FakeResponse
+
+
+def policy(**kwargs):
+    return RetryPolicy(**{"max_retries": 3, "base_delay": 0, "max_delay": 0, **kwargs})
+
+
+def sender(*outcomes):
+    """send() replaying outcomes: status codes become responses, exceptions are raised"""
+    remaining = list(outcomes)
+    calls = []
+
+    def send():
+        calls.append(1)
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome, {})
+
+    return send, calls
+
+
+def refused():
+    return requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/", NewConnectionError(None, "Connection refused"))
+    )
+
+
+def test_reads_are_retried_until_they_succeed():
+    retry = policy()
+    send, calls = sender(503, requests.exceptions.ReadTimeout("slow"), 200)
+
+    assert retry.call(send, "get", "products").status_code == 200
+    assert len(calls) == 3
+    assert retry.stats()["recovered"] == 1
+    assert retry.stats()["retries_by_status"] == {"503": 1, "ReadTimeout": 1}
+
+
+def test_retries_are_capped():
+    retry = policy(max_retries=2)
+    send, calls = sender(500, 500, 500, 200)
+
+    assert retry.call(send, "get", "products").status_code == 500
+    assert len(calls) == 3
+    assert retry.stats()["exhausted"] == 1
+
+
+def test_plain_writes_are_sent_once():
+    send, calls = sender(503, 200)
+
+    assert policy().call(send, "post", "products", {"name": "x"}).status_code == 503
+    assert len(calls) == 1
+
+
+def test_batch_updates_are_retried():
+    send, calls = sender(504, 200)
+
+    response = policy().call(send, "post", "products/batch", {"update": [{"id": 1}]})
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("failure", [504, requests.exceptions.ReadTimeout("slow")])
+def test_batch_creates_are_not_replayed_after_the_store_may_have_acted(failure):
+    send, calls = sender(failure, 200)
+    body = {"create": [{"name": "no sku"}], "update": [{"id": 1}]}
+
+    if isinstance(failure, Exception):
+        with pytest.raises(type(failure)):
+            policy().call(send, "post", "products/batch", body)
+    else:
+        assert policy().call(send, "post", "products/batch", body).status_code == failure
+    assert len(calls) == 1
+
+
+def test_batch_creates_are_retried_when_the_connection_never_opened():
+    send, calls = sender(refused(), requests.exceptions.ConnectTimeout("connect"), 200)
+
+    response = policy().call(send, "post", "products/batch", {"create": [{"name": "x"}]})
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_connect_errors():
+    assert is_connect_error(refused())
+    assert is_connect_error(requests.exceptions.ConnectTimeout("connect"))
+    assert is_connect_error(ConnectionRefusedError())
+    assert not is_connect_error(requests.exceptions.ConnectionError("Connection aborted"))
+    assert not is_connect_error(requests.exceptions.ReadTimeout("slow"))
+    assert not is_connect_error(None)
+
+
+def test_retry_after_is_honored_within_the_budget(monkeypatch):
+    slept = []
+    monkeypatch.setattr("shared.woocommerce_api.retry.time.sleep", slept.append)
+    throttled = FakeResponse(429, {}, {"Retry-After": "7"})
+    responses = [throttled, FakeResponse(200, {})]
+
+    response = policy(retry_budget=10).call(lambda: responses.pop(0), "get", "products")
+
+    assert response.status_code == 200
+    assert slept == [7.0]
+
+
+def test_retry_after_beyond_the_budget_ends_the_retries(monkeypatch):
+    monkeypatch.setattr("shared.woocommerce_api.retry.time.sleep", lambda delay: None)
+    retry = policy(retry_budget=5)
+    throttled = FakeResponse(429, {}, {"Retry-After": "60"})
+
+    assert retry.call(lambda: throttled, "get", "products") is throttled
+    assert retry.stats()["exhausted"] == 1
+
+
+def test_backoff_stays_between_base_and_max():
+    retry = RetryPolicy(base_delay=1, max_delay=8)
+    delay = retry.base_delay
+    for _ in range(50):
+        delay = retry.next_delay(delay)
+        assert 1 <= delay <= 8
+
+
+def test_async_call_uses_the_same_rules():
+    retry = policy()
+    outcomes = [refused(), FakeResponse(504, {}), FakeResponse(200, {})]
+    calls = []
+
+    async def send():
+        calls.append(1)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    response = asyncio.run(retry.acall(send, "POST", "products/batch", {"create": [{"name": "x"}]}))
+
+    # Refused connection retried, the 504 after the body was sent is not
+    assert response.status_code == 504
+    assert len(calls) == 2
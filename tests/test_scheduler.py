@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from scheduler import JobScheduler
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    scheduler = JobScheduler(str(tmp_path / "jobs.db"))
+    yield scheduler
+    scheduler.stop()
+
+
+def make_due(scheduler, job_id):
+    with sqlite3.connect(scheduler.path) as conn:
+        conn.execute("UPDATE scheduled_jobs SET next_run = ? WHERE job_id = ?",
+                     ((datetime.now() - timedelta(seconds=1)).isoformat(), job_id))
+    scheduler._notify()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_first_run_is_one_interval_away(scheduler):
+    job = scheduler.add_job("job", "sync", {"store": "a"}, timedelta(hours=1))
+
+    next_run = datetime.fromisoformat(job["next_run"])
+    assert timedelta(hours=1) <= next_run - datetime.now() <= timedelta(hours=1, minutes=6)
+    assert job["params"] == {"store": "a"} and job["runs"] == 0
+
+
+def test_due_job_runs_and_is_rescheduled(scheduler):
+    seen = []
+    scheduler.register_runner("sync", seen.append)
+    scheduler.add_job("job", "sync", {"store": "a"}, timedelta(hours=1))
+    scheduler.start()
+
+    make_due(scheduler, "job")
+
+    assert wait_for(lambda: scheduler.get_job("job")["runs"] == 1)
+    job = scheduler.get_job("job")
+    assert seen == [{"store": "a"}]
+    assert job["last_status"] == "completed" and not job["running"]
+    assert datetime.fromisoformat(job["next_run"]) > datetime.now() + timedelta(minutes=59)
+
+
+def test_failed_runs_are_recorded(scheduler):
+    def raises(params):
+        raise RuntimeError("store unreachable")
+
+    scheduler.register_runner("raises", raises)
+    scheduler.register_runner("reports", lambda params: {"status": "failed", "error": "bad"})
+    scheduler.add_job("raising", "raises", {}, timedelta(hours=1))
+    scheduler.add_job("reporting", "reports", {}, timedelta(hours=1))
+    scheduler.start()
+
+    make_due(scheduler, "raising")
+    make_due(scheduler, "reporting")
+
+    assert wait_for(lambda: all(job["runs"] == 1 for job in scheduler.list_jobs()))
+    assert scheduler.get_job("raising")["last_error"] == "store unreachable"
+    assert scheduler.get_job("reporting")["last_error"] == "bad"
+    assert {job["last_status"] for job in scheduler.list_jobs()} == {"failed"}
+
+
+def test_job_still_running_is_skipped(scheduler):
+    release = threading.Event()
+    calls = []
+    scheduler.register_runner("slow", lambda params: calls.append(params) or release.wait(5))
+    scheduler.add_job("job", "slow", {}, timedelta(hours=1))
+    scheduler.start()
+
+    make_due(scheduler, "job")
+    assert wait_for(lambda: scheduler.get_job("job")["running"])
+    make_due(scheduler, "job")
+    assert wait_for(lambda: scheduler.get_job("job")["skipped"] == 1)
+
+    release.set()
+    assert wait_for(lambda: scheduler.get_job("job")["runs"] == 1)
+    assert len(calls) == 1
+
+
+def test_paused_jobs_do_not_run(scheduler):
+    scheduler.register_runner("sync", lambda params: None)
+    scheduler.add_job("job", "sync", {}, timedelta(hours=1))
+    scheduler.pause("job")
+    scheduler.start()
+
+    make_due(scheduler, "job")
+    time.sleep(0.2)
+
+    assert scheduler.get_job("job")["runs"] == 0
+    # Missed runs happen within the jitter window after resuming
+    next_run = datetime.fromisoformat(scheduler.resume("job")["next_run"])
+    assert next_run - datetime.now() <= timedelta(minutes=5)
+
+
+def test_jobs_survive_a_restart(scheduler):
+    scheduler.add_job("job", "sync", {"store": "a"}, timedelta(days=1))
+    scheduler.add_job("job", "sync", {"store": "b"}, timedelta(days=1))
+
+    reopened = JobScheduler(scheduler.path)
+
+    assert [job["params"] for job in reopened.list_jobs()] == [{"store": "b"}]
+    assert reopened.remove_job("job") and reopened.list_jobs() == []
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from shared.woocommerce_api.streaming import iter_json_array
+
+
+RECORDS = [
+    {"id": 1, "name": "Café ☕", "price": 12.5, "tags": ["a", "b"]},
+    {"id": 22, "name": "Plain", "price": 1234567, "meta": {"nested": [1, 2, {"x": None}]}},
+    17,
+    "text, with ] and , inside",
+    [],
+    True
+]
+
+
+def split(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_decodes_bytes_split_at_every_chunk_size(size):
+    body = json.dumps(RECORDS, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_array(split(body, size))) == RECORDS
+
+
+def test_number_cut_at_chunk_edge_is_not_truncated():
+    # "1234567" split after "123" would decode as 123 without the delimiter check
+    chunks = [b"[12", b"34", b"567", b", 8", b"9]"]
+    assert list(iter_json_array(chunks)) == [1234567, 89]
+
+
+def test_multibyte_character_split_between_chunks():
+    body = json.dumps(["éé"], ensure_ascii=False).encode("utf-8")
+    # Cut inside the two-byte sequence of the first character
+    assert list(iter_json_array([body[:3], body[3:]])) == ["éé"]
+
+
+def test_text_chunks_and_whitespace():
+    assert list(iter_json_array(["﻿  [ ", "1 ,\n", " {\"a\" : 1} ", " ]"])) == [1, {"a": 1}]
+
+
+def test_empty_array():
+    assert list(iter_json_array([b"[", b"]"])) == []
+
+
+def test_elements_arrive_before_the_body_is_complete():
+    def chunks():
+        yield b'[{"id": 1}, '
+        raise AssertionError("second chunk requested before the first element was yielded")
+
+    assert next(iter_json_array(chunks())) == {"id": 1}
+
+
+@pytest.mark.parametrize("body", [b'{"id": 1}', b'[{"id": 1}', b'[1 2]', b''])
+def test_malformed_bodies_raise(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array(split(body, 3)))
@@ -0,0 +1,99 @@
+import pytest
+
+from shared.woocommerce_api.index import ResourceIndex
+from shared.woocommerce_api.sync_state import SyncStateStore, payload_hash, store_key
+
+STORE = "https://store.example"
+
+
+@pytest.fixture
+def state(tmp_path):
+    return SyncStateStore(str(tmp_path / "state.db"))
+
+
+def pushed(sku, payload, product_id=1, modified="2026-01-01T00:00:00"):
+    return {"sku": sku, "payload_hash": payload_hash(payload),
+            "product_id": product_id, "remote_modified": modified}
+
+
+def test_payload_hash_ignores_key_order():
+    assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+    assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+
+def test_store_key_normalizes_the_url():
+    class Api:
+        url = "https://Store.Example/"
+
+    assert store_key(Api()) == STORE
+
+
+def test_classify():
+    payload = {"sku": "A", "regular_price": "10"}
+    state = pushed("A", payload, product_id=7, modified="t1")
+    remote = {"id": 7, "date_modified": "t1"}
+    digest = payload_hash(payload)
+
+    assert SyncStateStore.classify(None, remote, digest) == "new"
+    assert SyncStateStore.classify(state, None, digest) == "missing"
+    assert SyncStateStore.classify(state, remote, payload_hash({**payload, "regular_price": "11"})) == "changed"
+    assert SyncStateStore.classify(state, {"id": 7, "date_modified": "t2"}, digest) == "drifted"
+    assert SyncStateStore.classify(state, {"id": 8, "date_modified": "t1"}, digest) == "drifted"
+    assert SyncStateStore.classify(state, remote, digest) == "unchanged"
+
+
+def test_record_load_and_forget_per_store(state):
+    state.record(STORE, [pushed("A", {"n": 1}), pushed("B", {"n": 2}, product_id=2)])
+    state.record("https://other.example", [pushed("A", {"n": 3})])
+    state.record(STORE, [pushed("A", {"n": 4}, product_id=9)])
+
+    loaded = state.load(STORE)
+    assert set(loaded) == {"A", "B"}
+    assert loaded["A"]["product_id"] == 9
+    assert loaded["A"]["payload_hash"] == payload_hash({"n": 4})
+
+    state.forget(STORE, ["A"])
+    assert set(state.load(STORE)) == {"B"}
+    state.forget(STORE)
+    assert state.load(STORE) == {}
+    assert set(state.load("https://other.example")) == {"A"}
+
+
+def test_drift_reports_store_side_edits_and_deletions(state):
+    state.record(STORE, [
+        pushed("A", {"n": 1}, product_id=1, modified="t1"),
+        pushed("B", {"n": 2}, product_id=2, modified="t1"),
+        pushed("C", {"n": 3}, product_id=3, modified="t1")
+    ])
+    index = ResourceIndex("sku", [
+        {"id": 1, "sku": "A", "date_modified": "t1"},
+        {"id": 2, "sku": "B", "date_modified": "t2"}
+    ])
+
+    assert state.drift(STORE, index) == {"drifted": ["B"], "missing": ["C"]}
+
+
+def test_watermarks_and_scans_are_kept_per_pair(state):
+    assert state.get_watermark("src", "dst", "products") is None
+
+    state.set_watermark("src", "dst", "products", "2026-01-01T00:00:00")
+    state.record_scan("src", "dst", "products", ["B", "A"])
+    state.set_watermark("src", "dst", "products", "2026-01-02T00:00:00")
+    state.set_watermark("src", "other", "products", "2025-01-01T00:00:00")
+
+    saved = state.get_watermark("src", "dst", "products")
+    assert saved["watermark"] == "2026-01-02T00:00:00"
+    assert saved["keys"] == {"A", "B"}
+    assert saved["scanned_at"] is not None
+    assert state.get_watermark("src", "other", "products")["keys"] is None
+
+
+def test_saved_indexes_round_trip(state, store):
+    index = ResourceIndex.build(store, "products")
+
+    state.save_index(STORE, index)
+    loaded = state.load_index(STORE, "products", "sku")
+
+    assert loaded.snapshot() == index.snapshot()
+    assert loaded.watermark == index.watermark
+    assert state.load_index(STORE, "products/categories", "slug") is None
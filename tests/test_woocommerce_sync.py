@@ -0,0 +1,78 @@
+import pytest
+
+from conftest import FakeStore, make_products
+
+
+class FakeConsolidator:
+    """Database products: every SKU consolidates to a 12.00 product"""
+
+    def consolidate_product_data(self, sku, sources=None):
+        return {"consolidated_data": {"name": f"Product {sku}", "price": "12.00"}}
+
+
+class TrashStore(FakeStore):
+    """Trashed products are not listed but still hold their SKU"""
+
+    def __init__(self, products=(), trashed=()):
+        super().__init__(products)
+        self.trashed = set(trashed)
+
+    def get(self, endpoint, params=None, **kwargs):
+        with self._lock:
+            hidden = {product_id: self.products.pop(product_id) for product_id in self.trashed}
+            try:
+                return super().get(endpoint, params, **kwargs)
+            finally:
+                self.products.update(hidden)
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("STORE_URL", raising=False)
+    import core
+    monkeypatch.setattr(core, "data_consolidator", FakeConsolidator())
+    server = core.EnhancedMCPServer()
+    yield server
+    server.scheduler.stop()
+    server.bulk_manager.shutdown()
+
+
+def batch_posts(store):
+    return [body for endpoint, body in store.posts if endpoint == "products/batch"]
+
+
+def test_more_than_100_skus_are_sent_in_batch_chunks(server):
+    store = FakeStore()
+    skus = [f"NEW{n}" for n in range(250)]
+
+    result = server._sync_to_woocommerce_internal(store, skus)["sync_results"]
+
+    assert (result["requested_skus"], result["created"], result["errors"]) == (250, 250, [])
+    # Chunks are sent concurrently, in no fixed order
+    assert sorted(len(body["create"]) for body in batch_posts(store)) == [50, 100, 100]
+    assert sorted(product["sku"] for product in store.products.values()) == sorted(skus)
+
+
+def test_existing_skus_are_updated_and_new_ones_created(server):
+    store = FakeStore(make_products(3))
+
+    result = server._sync_to_woocommerce_internal(store, ["SKU1", "NEW1", "SKU3", "NEW2"])["sync_results"]
+
+    assert (result["updated"], result["created"]) == (2, 2)
+    [body] = batch_posts(store)
+    assert [update["id"] for update in body["update"]] == [1, 3]
+    assert [create["sku"] for create in body["create"]] == ["NEW1", "NEW2"]
+    assert store.products[1]["regular_price"] == "12.00"
+    assert store.products[2]["regular_price"] == "10.00"
+    assert len(store.products) == 5
+
+
+def test_duplicate_sku_error_is_reported_under_its_sku(server):
+    store = TrashStore(make_products(1), trashed={1})
+
+    result = server._sync_to_woocommerce_internal(store, ["NEW1", "SKU1", "NEW2"])["sync_results"]
+
+    assert (result["created"], result["updated"]) == (2, 0)
+    assert result["errors"] == ["SKU1: Creation failed - Duplicate SKU"]
+    assert sorted(product["sku"] for product in store.products.values()) == ["NEW1", "NEW2", "SKU1"]